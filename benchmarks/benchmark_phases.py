@@ -0,0 +1,370 @@
+# /!usr/bin/env python3
+
+import argparse
+import json
+import os
+import platform
+import tempfile
+import time
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from generate_concordance import ConcordanceUtils
+from generate_concordance.concordance_generator import ConcordanceGenerator
+from generate_concordance.language_processor import PipelineMode
+from generate_concordance.profiler import get_peak_memory
+from generate_concordance.spacy_backend import SpacyBackend
+from generate_concordance.tokenizer_backend import SentenceToken, TokenArrays, TokenizerBackend
+
+"""Phase Benchmarks
+
+This script builds synthetic corpora by repeating a source text -- test_files/LargeTextFile.txt by default -- then
+times every phase of generating a concordance for each corpus separately: loading the model, reading the file,
+normalizing whitespace, parsing with spaCy, aggregating words, sorting and formatting the concordance lines, and
+writing the output. Each corpus is benchmarked in a fresh process, so the peak memory recorded after each phase
+belongs to that corpus alone.
+
+Results are written as JSON. When a baseline -- the results of an earlier run -- is given, any phase that got slower,
+or any corpus that used more memory, by more than the tolerance is reported and the script exits with 1. Timings are
+only comparable on the same machine, so no baseline is kept in the repository: record one with --output on the machine
+that runs the checks, from the commit to compare against.
+
+Usage: python3 -m benchmarks.benchmark_phases --scales 1 10 100 --output baseline.json
+       python3 -m benchmarks.benchmark_phases --scales 1 10 100 --output results.json --baseline baseline.json
+"""
+
+DEFAULT_SOURCE_FILE: str = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "test_files",
+                                        "LargeTextFile.txt")
+DEFAULT_SCALES: List[int] = [1, 10, 100, 1000]
+
+# Phases in the order they run.
+PHASES: List[str] = ["model_load", "file_read", "whitespace_normalization", "nlp_parse", "aggregation",
+                     "sort_and_format", "output_write"]
+
+# A phase is only a regression if it is slower by more than the tolerance and by more than this many seconds, so
+#   phases that take a few milliseconds don't fail on timer noise.
+DEFAULT_TOLERANCE: float = 0.2
+DEFAULT_MINIMUM_REGRESSION: float = 0.05
+
+
+class _ParsedBackend(TokenizerBackend):
+    """
+    A backend that hands back the tokens of texts that have already been parsed, so the ConcordanceGenerator's
+    aggregation can be timed on its own.
+
+    Attributes
+    ----------
+    __token_arrays : Dict[str, TokenArrays]
+        Token arrays of every parsed text, by text.
+    """
+
+    def __init__(self, texts: List[str], texts_token_arrays: List[TokenArrays]):
+        """
+        Parameters
+        ----------
+        texts : List[str]
+            Every parsed text.
+        texts_token_arrays : List[TokenArrays]
+            Token arrays of every parsed text, in the order of texts.
+        """
+        self.__token_arrays: Dict[str, TokenArrays] = dict(zip(texts, texts_token_arrays))
+
+    def get_description(self) -> str:
+        return "parsed"
+
+    def tokenize(self, text: str) -> Iterator[SentenceToken]:
+        word_keys, sentences, get_word = self.__token_arrays[text]
+        for word_key, sentence in zip(word_keys.tolist(), sentences.tolist()):
+            yield sentence, get_word(word_key)
+
+    def tokenize_arrays(self, texts: Iterable[str], batch_size: int = 1,
+                        processes: int = 1) -> Optional[Iterator[TokenArrays]]:
+        return (self.__token_arrays[text] for text in texts)
+
+
+def build_corpus(source_text: str, scale: int, corpus_file: str) -> None:
+    """Writes a synthetic corpus made of a source text repeated scale times, one paragraph break between copies.
+
+    Parameters
+    ----------
+    source_text : str
+        Text to repeat.
+    scale : int
+        Number of copies of source_text in the corpus.
+    corpus_file : str
+        Location to write the corpus to.
+    """
+
+    with open(corpus_file, "w") as file:
+        for _ in range(scale):
+            file.write(source_text.strip())
+            file.write("\n\n")
+
+
+def benchmark_corpus(corpus_file: str, pipeline_mode: PipelineMode, chunk_size: int) -> Dict[str, Any]:
+    """Times every phase of generating a concordance for a corpus. Should run in a process of its own.
+
+    Parameters
+    ----------
+    corpus_file : str
+        Corpus to generate a concordance for.
+    pipeline_mode : PipelineMode
+        How much of the spaCy pipeline to run.
+    chunk_size : int
+        Number of characters per chunk the corpus is read in. spaCy refuses texts over a million characters.
+
+    Returns
+    -------
+    Dict[str, Any]
+        Seconds taken and peak memory after every phase, and the size of the corpus.
+    """
+
+    phases: Dict[str, Dict[str, float]] = dict()
+    phase_start: float = time.perf_counter()
+
+    def end_phase(phase: str) -> None:
+        nonlocal phase_start
+        phase_end: float = time.perf_counter()
+        phases[phase] = dict({"seconds": phase_end - phase_start, "peak_memory_bytes": get_peak_memory()})
+        phase_start = time.perf_counter()
+
+    backend: SpacyBackend = SpacyBackend(pipeline_mode=pipeline_mode)
+    backend.get_language_processor()
+    end_phase("model_load")
+
+    chunks: List[str] = list(ConcordanceUtils.get_input_file_chunks(corpus_file, chunk_size=chunk_size))
+    end_phase("file_read")
+
+    chunks = [ConcordanceUtils.normalize_whitespace(chunk) for chunk in chunks]
+    end_phase("whitespace_normalization")
+
+    # Normalizing already normalized text again inside the backend costs little next to parsing.
+    texts_token_arrays: List[TokenArrays] = list(backend.tokenize_arrays(chunks))
+    end_phase("nlp_parse")
+
+    parsed_backend: _ParsedBackend = _ParsedBackend(texts=chunks, texts_token_arrays=texts_token_arrays)
+    generator: ConcordanceGenerator = ConcordanceGenerator(backend=parsed_backend)
+    generator.generate_concordance_from_chunks(chunks)
+    end_phase("aggregation")
+
+    lines: List[str] = generator.get_concordance_lines()
+    end_phase("sort_and_format")
+
+    with tempfile.TemporaryDirectory() as output_directory:
+        ConcordanceUtils.write_lines_to_file(lines=lines, output_file=os.path.join(output_directory, "output.txt"))
+        end_phase("output_write")
+
+    return dict({"characters": sum(len(chunk) for chunk in chunks),
+                 "tokens": generator.get_token_count(),
+                 "sentences": generator.get_sentence_count(),
+                 "words": len(lines),
+                 "phases": phases,
+                 "peak_memory_bytes": get_peak_memory()})
+
+
+def run_benchmarks(source_file: str, scales: List[int], pipeline_mode: PipelineMode,
+                   chunk_size: int) -> Dict[str, Any]:
+    """Builds a corpus for every scale and benchmarks each in a fresh process.
+
+    Parameters
+    ----------
+    source_file : str
+        Text the corpora are built from.
+    scales : List[int]
+        Number of copies of the source text in each corpus.
+    pipeline_mode : PipelineMode
+        How much of the spaCy pipeline to run.
+    chunk_size : int
+        Number of characters per chunk the corpora are read in.
+
+    Returns
+    -------
+    Dict[str, Any]
+        Results for every scale, and a description of where they were measured.
+    """
+
+    source_text: str = ConcordanceUtils.get_input_file_text(source_file)
+    results: Dict[str, Any] = dict({"environment": dict({"python": platform.python_version(),
+                                                         "platform": platform.platform(),
+                                                         "pipeline_mode": pipeline_mode.value,
+                                                         "source_file": os.path.basename(source_file)}),
+                                    "scales": dict()})
+
+    with tempfile.TemporaryDirectory() as corpus_directory:
+        for scale in scales:
+            corpus_file: str = os.path.join(corpus_directory, f"corpus_{scale}x.txt")
+            build_corpus(source_text=source_text, scale=scale, corpus_file=corpus_file)
+
+            # A fresh process loads the model from scratch and starts with no memory used by earlier corpora.
+            with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as executor:
+                results["scales"][str(scale)] = executor.submit(benchmark_corpus, corpus_file, pipeline_mode,
+                                                                chunk_size).result()
+            os.remove(corpus_file)
+
+    return results
+
+
+def find_regressions(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float = DEFAULT_TOLERANCE,
+                     minimum_regression: float = DEFAULT_MINIMUM_REGRESSION) -> List[str]:
+    """Compares benchmark results with a baseline.
+
+    Only scales and phases found in both are compared.
+
+    Parameters
+    ----------
+    results : Dict[str, Any]
+        Results of this run. See run_benchmarks().
+    baseline : Dict[str, Any]
+        Results of an earlier run to compare with.
+    tolerance : float
+        Fraction a phase may get slower, or a corpus may use more memory, before it is a regression.
+    minimum_regression : float
+        Seconds a phase must get slower by before it is a regression.
+
+    Returns
+    -------
+    List[str]
+        A description of every regression. Empty if there are none.
+    """
+
+    regressions: List[str] = list()
+    for scale, scale_results in results["scales"].items():
+        baseline_scale_results: Optional[Dict[str, Any]] = baseline["scales"].get(scale)
+        if baseline_scale_results is None:
+            continue
+
+        for phase in PHASES:
+            if phase not in scale_results["phases"] or phase not in baseline_scale_results["phases"]:
+                continue
+
+            seconds: float = scale_results["phases"][phase]["seconds"]
+            baseline_seconds: float = baseline_scale_results["phases"][phase]["seconds"]
+            if seconds > baseline_seconds * (1 + tolerance) and seconds - baseline_seconds > minimum_regression:
+                regressions.append(f"{scale}x {phase}: {seconds:.3f}s, baseline {baseline_seconds:.3f}s")
+
+        # Platforms that can't report peak memory record None.
+        peak_memory: Optional[int] = scale_results["peak_memory_bytes"]
+        baseline_peak_memory: Optional[int] = baseline_scale_results["peak_memory_bytes"]
+        if peak_memory is not None and baseline_peak_memory is not None and \
+                peak_memory > baseline_peak_memory * (1 + tolerance):
+            regressions.append(f"{scale}x peak memory: {peak_memory / (1 << 20):.1f} MiB, "
+                               f"baseline {baseline_peak_memory / (1 << 20):.1f} MiB")
+
+    return regressions
+
+
+def _print_results(results: Dict[str, Any]) -> None:
+    """Prints a table of the seconds taken by every phase at every scale.
+
+    Parameters
+    ----------
+    results : Dict[str, Any]
+        Results to print. See run_benchmarks().
+    """
+
+    phase_column_length: int = max(len(phase) for phase in PHASES)
+    scales: List[str] = list(results["scales"].keys())
+    print(f"{'phase':<{phase_column_length}} " + " ".join(f"{scale + 'x':>10}" for scale in scales))
+    for phase in PHASES:
+        print(f"{phase:<{phase_column_length}} " + " ".join(
+            f"{results['scales'][scale]['phases'][phase]['seconds']:>10.3f}" for scale in scales))
+    peak_memories: List[Optional[int]] = [results["scales"][scale]["peak_memory_bytes"] for scale in scales]
+    print(f"{'peak MiB':<{phase_column_length}} " + " ".join(
+        f"{peak_memory / (1 << 20):>10.1f}" if peak_memory is not None else f"{'-':>10}"
+        for peak_memory in peak_memories))
+
+
+def _build_argument_parser() -> ArgumentParser:
+    """Builds the parser for the command line options.
+
+    Returns
+    -------
+    ArgumentParser
+        The parser for the script's command line options.
+    """
+
+    arg_parser: ArgumentParser = ArgumentParser(description="Times every phase of generating a concordance for "
+                                                            "synthetic corpora of increasing size.")
+    arg_parser.add_argument("--sourceFile",
+                            default=DEFAULT_SOURCE_FILE,
+                            dest="source_file",
+                            help="Text the corpora are built from.")
+    arg_parser.add_argument("--scales",
+                            default=DEFAULT_SCALES,
+                            dest="scales",
+                            help="Number of copies of the source text in each corpus.",
+                            nargs="+",
+                            type=int)
+    arg_parser.add_argument("-p",
+                            "--pipelineMode",
+                            choices=[mode.value for mode in PipelineMode],
+                            default=PipelineMode.ACCURATE.value,
+                            dest="pipeline_mode",
+                            help="How much of the spaCy pipeline to run.")
+    arg_parser.add_argument("--chunkSize",
+                            default=ConcordanceUtils.DEFAULT_CHUNK_SIZE,
+                            dest="chunk_size",
+                            help="Number of characters per chunk the corpora are read in.",
+                            type=int)
+    arg_parser.add_argument("-o",
+                            "--output",
+                            default=None,
+                            dest="output_file",
+                            help="Location the results will be written to as JSON.")
+    arg_parser.add_argument("--baseline",
+                            default=None,
+                            dest="baseline_file",
+                            help="Results of an earlier run to check this run against.")
+    arg_parser.add_argument("--tolerance",
+                            default=DEFAULT_TOLERANCE,
+                            dest="tolerance",
+                            help="Fraction a phase may get slower, or a corpus may use more memory, before it fails "
+                                 "the run.",
+                            type=float)
+    arg_parser.add_argument("--minimumRegression",
+                            default=DEFAULT_MINIMUM_REGRESSION,
+                            dest="minimum_regression",
+                            help="Seconds a phase must get slower by before it fails the run.",
+                            type=float)
+
+    return arg_parser
+
+
+def main() -> int:
+    arg_parser: ArgumentParser = _build_argument_parser()
+    options: argparse.Namespace = arg_parser.parse_args()
+
+    baseline: Optional[Dict[str, Any]] = None
+    if options.baseline_file:
+        baseline_text: Optional[str] = ConcordanceUtils.get_input_file_text(options.baseline_file)
+        if baseline_text is None:
+            return 1
+        baseline = json.loads(baseline_text)
+
+    results: Dict[str, Any] = run_benchmarks(source_file=options.source_file, scales=options.scales,
+                                             pipeline_mode=PipelineMode(options.pipeline_mode),
+                                             chunk_size=options.chunk_size)
+    _print_results(results)
+
+    if options.output_file:
+        with open(options.output_file, "w") as file:
+            json.dump(results, file, indent=2)
+
+    if baseline:
+        if baseline.get("environment") != results["environment"]:
+            print(f"The baseline was measured in a different environment -- {baseline.get('environment')} -- so "
+                  f"its timings may not be comparable.")
+        regressions: List[str] = find_regressions(results=results, baseline=baseline, tolerance=options.tolerance,
+                                                  minimum_regression=options.minimum_regression)
+        for regression in regressions:
+            print(f"Regression -- {regression}")
+        if regressions:
+            return 1
+
+    return 0
+
+
+if "__main__" == __name__:
+    exit(main())
@@ -0,0 +1,315 @@
+# /!usr/bin/env python3
+
+import argparse
+import asyncio
+import math
+import time
+from argparse import ArgumentParser
+from typing import Any, Dict, List, Optional, Tuple
+
+from generate_concordance import ConcordanceUtils
+from generate_concordance.concordance_server import DEFAULT_HOST, DEFAULT_PORT
+
+"""Load Generator
+
+This script sends many requests to a running concordance server -- see generate_concordance.concordance_server --
+from several connections at once, then reports throughput and latency percentiles. Requests turned away with 503 are
+counted separately, so the effect of --maxQueue can be seen.
+
+Usage: python3 -m benchmarks.load_generator --inputFile test_files/ProvidedExample.txt --requests 500 --concurrency 16
+"""
+
+DEFAULT_REQUESTS: int = 200
+DEFAULT_CONCURRENCY: int = 8
+PERCENTILES: List[int] = [50, 90, 99]
+
+
+def get_percentile(sorted_values: List[float], percentile: float) -> float:
+    """Gets a percentile of some values by the nearest rank method.
+
+    Parameters
+    ----------
+    sorted_values : List[float]
+        Values in ascending order.
+    percentile : float
+        Percentile between 0 and 100.
+
+    Returns
+    -------
+    float
+        The smallest value at least percentile percent of the values are less than or equal to, or 0.0 if there are
+        no values.
+    """
+
+    if not sorted_values:
+        return 0.0
+
+    rank: int = max(math.ceil(percentile / 100 * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+async def _open_connection(host: str, port: int,
+                           socket_path: Optional[str]) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+    """Opens a connection to the server.
+
+    Parameters
+    ----------
+    host : str
+        Host of the server.
+    port : int
+        Port of the server.
+    socket_path : Optional[str]
+        Unix socket of the server, used instead of host and port.
+
+    Returns
+    -------
+    Tuple[asyncio.StreamReader, asyncio.StreamWriter]
+        The connection.
+    """
+
+    if socket_path:
+        return await asyncio.open_unix_connection(path=socket_path)
+
+    return await asyncio.open_connection(host=host, port=port)
+
+
+async def _send_request(reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                        request: bytes) -> Optional[Tuple[int, bool]]:
+    """Sends a request over an open connection and reads the whole response.
+
+    Parameters
+    ----------
+    reader : asyncio.StreamReader
+        Connection to read the response from.
+    writer : asyncio.StreamWriter
+        Connection to send the request on.
+    request : bytes
+        The complete HTTP request.
+
+    Returns
+    -------
+    Optional[Tuple[int, bool]]
+        HTTP status of the response, and whether the server keeps the connection open for another request. None if
+        the server closed the connection without responding.
+    """
+
+    try:
+        writer.write(request)
+        await writer.drain()
+
+        status_line: bytes = await reader.readline()
+        if not status_line:
+            return None
+        status: int = int(status_line.split()[1])
+
+        content_length: int = 0
+        keep_alive: bool = True
+        while True:
+            header_line: bytes = (await reader.readline()).strip()
+            if not header_line:
+                break
+            name, value = header_line.split(b":", 1)
+            if b"content-length" == name.strip().lower():
+                content_length = int(value)
+            elif b"connection" == name.strip().lower():
+                keep_alive = b"close" != value.strip().lower()
+        await reader.readexactly(content_length)
+    except (ConnectionError, asyncio.IncompleteReadError):
+        return None
+
+    return status, keep_alive
+
+
+async def _run_connection(text: bytes, target: str, host: str, port: int, socket_path: Optional[str],
+                          remaining_requests: List[int], latencies: List[float], statuses: Dict[int, int],
+                          connection_errors: List[int]) -> None:
+    """Sends requests one after another on a single kept alive connection until none are left. The connection is
+    opened again whenever the server closes it.
+
+    Parameters
+    ----------
+    text : bytes
+        Body of every request.
+    target : str
+        Path and query string requested.
+    host : str
+        Host of the server.
+    port : int
+        Port of the server.
+    socket_path : Optional[str]
+        Unix socket of the server, used instead of host and port.
+    remaining_requests : List[int]
+        Number of requests still to send, shared with every other connection.
+    latencies : List[float]
+        Seconds taken by each successful request. Appended to.
+    statuses : Dict[int, int]
+        Number of responses with each HTTP status. Added to.
+    connection_errors : List[int]
+        Number of requests the server closed the connection on without responding, shared with every other
+        connection.
+    """
+
+    request: bytes = f"POST {target} HTTP/1.1\r\nHost: {host}\r\nContent-Type: text/plain; charset=utf-8\r\n" \
+                     f"Content-Length: {len(text)}\r\n\r\n".encode("latin-1") + text
+    writer: Optional[asyncio.StreamWriter] = None
+    try:
+        while remaining_requests[0] > 0:
+            if writer is None:
+                reader, writer = await _open_connection(host=host, port=port, socket_path=socket_path)
+
+            remaining_requests[0] -= 1
+            start: float = time.perf_counter()
+            response: Optional[Tuple[int, bool]] = await _send_request(reader=reader, writer=writer, request=request)
+            if response is None:
+                connection_errors[0] += 1
+            else:
+                status, keep_alive = response
+                if 200 == status:
+                    latencies.append(time.perf_counter() - start)
+                statuses[status] = statuses.get(status, 0) + 1
+
+            if response is None or not response[1]:
+                writer.close()
+                writer = None
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+async def run_load(text: str, requests: int = DEFAULT_REQUESTS, concurrency: int = DEFAULT_CONCURRENCY,
+                   host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, socket_path: Optional[str] = None,
+                   output_format: str = "text") -> Dict[str, Any]:
+    """Sends requests to a concordance server from several connections at once.
+
+    Parameters
+    ----------
+    text : str
+        Text sent in every request.
+    requests : int
+        Total number of requests sent.
+    concurrency : int
+        Number of connections sending requests at the same time.
+    host : str
+        Host of the server.
+    port : int
+        Port of the server.
+    socket_path : Optional[str]
+        Unix socket of the server, used instead of host and port.
+    output_format : str
+        Format the concordances are requested in.
+
+    Returns
+    -------
+    Dict[str, Any]
+        Number of requests, seconds taken, requests per second, the number of responses with each HTTP status, the
+        number of requests the server closed the connection on without responding, and the latency percentiles of
+        successful requests in milliseconds.
+    """
+
+    latencies: List[float] = list()
+    statuses: Dict[int, int] = dict()
+    remaining_requests: List[int] = list([requests])
+    connection_errors: List[int] = list([0])
+    start: float = time.perf_counter()
+    await asyncio.gather(*(_run_connection(text=text.encode("utf-8"), target=f"/concordance?format={output_format}",
+                                           host=host, port=port, socket_path=socket_path,
+                                           remaining_requests=remaining_requests, latencies=latencies,
+                                           statuses=statuses, connection_errors=connection_errors)
+                           for _ in range(concurrency)))
+    seconds: float = time.perf_counter() - start
+
+    latencies.sort()
+    latency_percentiles: Dict[str, float] = dict((f"p{percentile}", get_percentile(latencies, percentile) * 1000)
+                                                 for percentile in PERCENTILES)
+    latency_percentiles["max"] = latencies[-1] * 1000 if latencies else 0.0
+
+    return dict({"requests": requests,
+                 "seconds": seconds,
+                 "requests_per_second": requests / seconds if seconds else 0.0,
+                 "statuses": statuses,
+                 "connection_errors": connection_errors[0],
+                 "latency_milliseconds": latency_percentiles})
+
+
+def _build_argument_parser() -> ArgumentParser:
+    """Builds the parser for the command line options.
+
+    Returns
+    -------
+    ArgumentParser
+        The parser for the script's command line options.
+    """
+
+    arg_parser: ArgumentParser = argparse.ArgumentParser(description="Measures the throughput and latency of a running "
+                                                                     "concordance server.")
+    arg_parser.add_argument("-i",
+                            "--inputFile",
+                            dest="input_file",
+                            help="Location of a .txt file sent as the body of every request.",
+                            required=True)
+    arg_parser.add_argument("-n",
+                            "--requests",
+                            default=DEFAULT_REQUESTS,
+                            dest="requests",
+                            help="Total number of requests sent.",
+                            type=int)
+    arg_parser.add_argument("-c",
+                            "--concurrency",
+                            default=DEFAULT_CONCURRENCY,
+                            dest="concurrency",
+                            help="Number of connections sending requests at the same time.",
+                            type=int)
+    arg_parser.add_argument("--host",
+                            default=DEFAULT_HOST,
+                            dest="host",
+                            help="Host of the server.")
+    arg_parser.add_argument("--port",
+                            default=DEFAULT_PORT,
+                            dest="port",
+                            help="Port of the server.",
+                            type=int)
+    arg_parser.add_argument("--socket",
+                            default=None,
+                            dest="socket_path",
+                            help="Unix socket of the server, used instead of --host and --port.")
+    arg_parser.add_argument("--format",
+                            choices=["text", "json"],
+                            default="text",
+                            dest="output_format",
+                            help="Format the concordances are requested in.")
+
+    return arg_parser
+
+
+def main() -> int:
+    arg_parser: ArgumentParser = _build_argument_parser()
+    options: argparse.Namespace = arg_parser.parse_args()
+
+    input_text: Optional[str] = ConcordanceUtils.get_input_file_text(options.input_file)
+    if input_text is None:
+        return 1
+
+    try:
+        results: Dict[str, Any] = asyncio.run(run_load(text=input_text, requests=options.requests,
+                                                       concurrency=options.concurrency, host=options.host,
+                                                       port=options.port, socket_path=options.socket_path,
+                                                       output_format=options.output_format))
+    except OSError as os_error:
+        print(f"The concordance server could not be reached -- {os_error}.")
+        return 1
+
+    print(f"{results['requests']} requests in {results['seconds']:.2f} seconds: "
+          f"{results['requests_per_second']:.1f} requests/sec")
+    for status, count in sorted(results["statuses"].items()):
+        print(f"  {status}: {count}")
+    if results["connection_errors"]:
+        print(f"  connection closed without a response: {results['connection_errors']}")
+    latency: Tuple[str, ...] = tuple(f"{name} {milliseconds:.1f}ms"
+                                     for name, milliseconds in results["latency_milliseconds"].items())
+    print(f"  latency: {', '.join(latency)}")
+
+    return 0
+
+
+if "__main__" == __name__:
+    exit(main())
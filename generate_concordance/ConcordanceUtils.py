@@ -1,5 +1,46 @@
 import errno
-from typing import List, Optional
+import glob
+import os
+import re
+import sys
+from typing import Dict, Iterable, Iterator, List, Optional, Set, TextIO, Tuple
+
+# spaCy refuses texts longer than 1,000,000 characters, so keep streamed chunks well below that.
+DEFAULT_CHUNK_SIZE: int = 100000
+
+# Replaces the extension of an input file to name its concordance in an output directory.
+CONCORDANCE_FILE_SUFFIX: str = ".concordance.txt"
+
+# Separates an input file from the spaCy pipeline package used for it on a line of a file list.
+FILE_LIST_SEPARATOR: str = "\t"
+
+# Number of characters gathered into one write. Large enough that a write costs far less than formatting the lines
+#   in it.
+WRITE_BLOCK_SIZE: int = 1 << 20
+
+# The end of a sentence -- terminal punctuation, optionally followed by closing quotes or brackets -- then whitespace
+#   and the start of the next word. Punctuation after the whitespace could still belong to the sentence, so don't
+#   split there.
+SENTENCE_BOUNDARY: re.Pattern = re.compile(r"[.!?][\"'\)\]\u2019\u201d]*\s+(?=\w)")
+
+
+def _report_input_file_error(input_file: str, io_error: IOError):
+    """Tells the user why the input file could not be read.
+
+    Parameters
+    ----------
+    input_file : str
+        File that could not be read.
+    io_error : IOError
+        Error raised while reading input_file.
+    """
+
+    if errno.ENOENT == io_error.errno:
+        print(f"The provided input file -- {input_file} -- does not exist.")
+    elif errno.EACCES == io_error.errno:
+        print(f"The provided input file -- {input_file} -- cannot be read.")
+    else:
+        print(f"An unknown IO error occurred while attempting to read the provided input file -- {input_file}.")
 
 
 def get_input_file_text(input_file: str) -> Optional[str]:
@@ -19,48 +60,321 @@ def get_input_file_text(input_file: str) -> Optional[str]:
     file_text: Optional[str] = None
     try:
         with open(input_file, "r") as file:
-            input_file_lines = list()
-            for line in file:
-                input_file_lines.append(line)
-        file_text = "".join(input_file_lines)
+            file_text = file.read()
     except IOError as io_error:
-        if errno.ENOENT == io_error.errno:
-            print(f"The provided input file -- {input_file} -- does not exist.")
-        elif errno.EACCES == io_error.errno:
-            print(f"The provided input file -- {input_file} -- cannot be read.")
+        _report_input_file_error(input_file=input_file, io_error=io_error)
+
+    return file_text
+
+
+def get_stopwords(stopwords_file: str) -> Optional[Set[str]]:
+    """Reads stopwords from a file.
+
+    Parameters
+    ----------
+    stopwords_file : str
+        File listing stopwords separated by whitespace -- EX: one per line.
+
+    Returns
+    -------
+    Optional[Set[str]]
+        Every stopword in lowercase if the file could be read, otherwise None is returned.
+    """
+
+    file_text: Optional[str] = get_input_file_text(stopwords_file)
+    if file_text is None:
+        return None
+
+    return set(stopword.lower() for stopword in file_text.split())
+
+
+def get_input_file_paths(input_files: Iterable[str], file_list: Optional[str] = None) -> Optional[List[str]]:
+    """Gets every input file given on the command line.
+
+    Parameters
+    ----------
+    input_files : Iterable[str]
+        Input files or glob patterns matching input files -- EX: texts/*.txt. Patterns are expanded in sorted order.
+    file_list : Optional[str]
+        File listing more input files, one per line. Blank lines are skipped. See get_input_file_models().
+
+    Returns
+    -------
+    Optional[List[str]]
+        Every input file in the order given, if every pattern matched a file and the file list could be read,
+        otherwise None is returned.
+    """
+
+    input_file_models: Optional[List[Tuple[str, Optional[str]]]] = get_input_file_models(input_files=input_files,
+                                                                                         file_list=file_list)
+    if input_file_models is None:
+        return None
+
+    return [input_file for input_file, _ in input_file_models]
+
+
+def get_input_file_models(input_files: Iterable[str],
+                          file_list: Optional[str] = None) -> Optional[List[Tuple[str, Optional[str]]]]:
+    """Gets every input file given on the command line, with the spaCy pipeline the file list gives for it.
+
+    A line of the file list can name the spaCy pipeline package for its file after a tab, so files in several
+    languages can be processed together -- EX: buch.txt<TAB>de_core_news_sm.
+
+    Parameters
+    ----------
+    input_files : Iterable[str]
+        Input files or glob patterns matching input files -- EX: texts/*.txt. Patterns are expanded in sorted order.
+    file_list : Optional[str]
+        File listing more input files, one per line. Blank lines are skipped.
+
+    Returns
+    -------
+    Optional[List[Tuple[str, Optional[str]]]]
+        Every input file in the order given with its spaCy pipeline package, or None if the file list doesn't name
+        one, if every pattern matched a file and the file list could be read, otherwise None is returned.
+    """
+
+    input_file_models: List[Tuple[str, Optional[str]]] = list()
+    for input_file in input_files:
+        if glob.escape(input_file) != input_file:
+            matching_files: List[str] = sorted(glob.glob(input_file, recursive=True))
+            if not matching_files:
+                print(f"The provided input file pattern -- {input_file} -- does not match any files.")
+                return None
+            input_file_models.extend((matching_file, None) for matching_file in matching_files)
         else:
-            print(f"An unknown IO error occurred while attempting to read the provided input file -- {input_file}.")
-        return file_text
+            input_file_models.append((input_file, None))
+
+    if file_list:
+        file_list_text: Optional[str] = get_input_file_text(file_list)
+        if file_list_text is None:
+            return None
+        for line in file_list_text.splitlines():
+            input_file, _, model_name = line.strip().partition(FILE_LIST_SEPARATOR)
+            if input_file.strip():
+                input_file_models.append((input_file.strip(), model_name.strip() or None))
+
+    return input_file_models
+
+
+def get_output_file_paths(input_files: List[str], output_directory: str) -> Optional[List[str]]:
+    """Names the concordance of each input file in an output directory.
+
+    Each concordance is named after its input file -- EX: book.txt -> book.concordance.txt. Input files in different
+    directories keep their paths relative to the directory they all share, so files with the same name don't overwrite
+    each other -- EX: a/book.txt b/book.txt -> a/book.concordance.txt b/book.concordance.txt.
+
+    Parameters
+    ----------
+    input_files : List[str]
+        Every input file.
+    output_directory : str
+        Directory the concordances are written to.
+
+    Returns
+    -------
+    Optional[List[str]]
+        The concordance of every input file, in the order of input_files, if no two input files would be written to the
+        same concordance, otherwise None is returned.
+    """
+
+    input_directories: List[str] = [os.path.dirname(os.path.abspath(input_file)) for input_file in input_files]
+    shared_directory: str = os.path.commonpath(input_directories) if input_directories else ""
+
+    output_file_paths: List[str] = list()
+    input_file_by_output_file: Dict[str, str] = dict()
+    for input_file, input_directory in zip(input_files, input_directories):
+        output_file: str = os.path.normpath(os.path.join(
+            output_directory, os.path.relpath(input_directory, shared_directory),
+            f"{os.path.splitext(os.path.basename(input_file))[0]}{CONCORDANCE_FILE_SUFFIX}"))
+
+        # The same file given twice is written twice with the same concordance, which is harmless.
+        other_input_file: str = input_file_by_output_file.setdefault(output_file, input_file)
+        if os.path.realpath(other_input_file) != os.path.realpath(input_file):
+            print(f"The provided input files -- {other_input_file} and {input_file} -- would both be written to "
+                  f"-- {output_file}.")
+            return None
+        output_file_paths.append(output_file)
 
-    return "".join(input_file_lines)
+    return output_file_paths
 
 
-def print_lines(lines: List[str]):
+def normalize_whitespace(text: str) -> str:
+    """Replaces every run of white space in text with a single space.
+
+    The spacy natural language processor doesn't consider newlines to be word separators, so words at the end
+    of a line get appended to the front of the first word in the next line. Remove all white space that could
+    cause issues and replace them with a space for the best results.
+
+    Parameters
+    ----------
+    text : str
+        Text to normalize.
+
+    Returns
+    -------
+    str
+        text with single spaces between words.
+    """
+    return " ".join(text.split())
+
+
+def _split_at_sentence_boundary(text: str) -> int:
+    """Finds the last place text can be split without splitting a sentence, or failing that, a word.
+
+    Parameters
+    ----------
+    text : str
+        Text to split.
+
+    Returns
+    -------
+    int
+        Index text should be split at. Equal to len(text) if there is nowhere to split it.
+    """
+
+    split_index: int = 0
+    for sentence_boundary in SENTENCE_BOUNDARY.finditer(text):
+        split_index = sentence_boundary.end()
+
+    if 0 == split_index:
+        split_index = max(text.rfind(" "), text.rfind("\n")) + 1
+
+    return split_index if split_index > 0 else len(text)
+
+
+def _read_chunks(file: TextIO, chunk_size: int) -> Iterator[str]:
+    """Reads an open file in chunks of roughly chunk_size characters, then closes it.
+
+    Chunks end at the first paragraph break -- a blank line -- after chunk_size characters have been read. Text that
+    goes on for twice chunk_size without a suitable paragraph break is cut after its last complete sentence instead,
+    so at most a few chunks worth of text is held in memory no matter how big the file is.
+
+    Parameters
+    ----------
+    file : TextIO
+        File to read chunks from.
+    chunk_size : int
+        Number of characters a chunk should contain before it is cut.
+
+    Returns
+    -------
+    Iterator[str]
+        Chunks of the file. Joining the chunks gives back the file's text.
+    """
+
+    with file:
+        chunk_lines: List[str] = list()
+        chunk_length: int = 0
+        after_paragraph_break: bool = False
+
+        # Limit the size of a read so a file without newlines is still read a chunk at a time.
+        for line in iter(lambda: file.readline(chunk_size), ""):
+            # Only cut before a paragraph that starts with a word. Sentence segmenters can attach leading punctuation,
+            #   like an opening quote, to the end of the previous sentence.
+            if chunk_length >= chunk_size and after_paragraph_break and line[:1].isalnum():
+                yield "".join(chunk_lines)
+                chunk_lines = list()
+                chunk_length = 0
+
+            chunk_lines.append(line)
+            chunk_length += len(line)
+            after_paragraph_break = not line.strip()
+
+            if chunk_length >= 2 * chunk_size:
+                chunk: str = "".join(chunk_lines)
+                split_index: int = _split_at_sentence_boundary(chunk)
+                yield chunk[:split_index]
+                chunk_lines = list([chunk[split_index:]])
+                chunk_length = len(chunk_lines[0])
+
+        if chunk_length:
+            yield "".join(chunk_lines)
+
+
+def get_input_file_chunks(input_file: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Optional[Iterator[str]]:
+    """Lazily reads text from a file in chunks that end on paragraph or sentence boundaries.
+
+    Parameters
+    ----------
+    input_file : str
+        File to read text from.
+    chunk_size : int
+        Number of characters a chunk should contain before it is cut at the next paragraph break.
+
+    Returns
+    -------
+    Optional[Iterator[str]]
+        Returns an iterator over chunks of the file's text if the file could be opened, otherwise None is returned.
+    """
+
+    try:
+        file: TextIO = open(input_file, "r")
+    except IOError as io_error:
+        _report_input_file_error(input_file=input_file, io_error=io_error)
+        return None
+
+    return _read_chunks(file=file, chunk_size=chunk_size)
+
+
+def _write_lines(lines: Iterable[str], stream: TextIO, block_size: int) -> None:
+    """Writes lines to a stream in large blocks, adding a newline to the end of each line.
+
+    Parameters
+    ----------
+    lines : Iterable[str]
+        Lines to write. Consumed lazily, so only one block of lines is held in memory at a time.
+    stream : TextIO
+        Stream to write lines to.
+    block_size : int
+        Number of characters to gather before writing them to the stream.
+    """
+
+    block: List[str] = list()
+    block_length: int = 0
+    for line in lines:
+        block.append(line)
+        block_length += len(line) + 1
+        if block_length >= block_size:
+            block.append("")
+            stream.write("\n".join(block))
+            block = list()
+            block_length = 0
+
+    if block:
+        block.append("")
+        stream.write("\n".join(block))
+
+
+def print_lines(lines: Iterable[str], block_size: int = WRITE_BLOCK_SIZE):
     """Prints lines to stdout.
 
     Lines should not end with a newline character, otherwise two newlines will be printed for every line.
 
     Parameters
     ----------
-    lines : str
+    lines : Iterable[str]
         Lines to write to stdout.
+    block_size : int
+        Number of characters gathered into one write.
     """
 
-    for line in lines:
-        print(line)
+    _write_lines(lines=lines, stream=sys.stdout, block_size=block_size)
 
 
-def write_lines_to_file(lines: List[str], output_file: str) -> bool:
+def write_lines_to_file(lines: Iterable[str], output_file: str, block_size: int = WRITE_BLOCK_SIZE) -> bool:
     """Writes lines to output file.
 
     Each line printed has a newline added to the end.
 
     Parameters
     ----------
-    lines : str
+    lines : Iterable[str]
         Lines to be written to output_file.
     output_file : str
         File to write lines to.
+    block_size : int
+        Number of characters gathered into one write.
 
     Returns
     -------
@@ -71,8 +385,7 @@ def write_lines_to_file(lines: List[str], output_file: str) -> bool:
     success: bool = False
     try:
         with open(output_file, "w") as file:
-            for line in lines:
-                file.write(f"{line}\n")
+            _write_lines(lines=lines, stream=file, block_size=block_size)
         success = True
     except IOError as io_error:
         if errno.EACCES == io_error.errno:
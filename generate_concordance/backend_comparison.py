@@ -0,0 +1,210 @@
+# /!usr/bin/env python3
+
+import argparse
+import difflib
+import time
+from argparse import ArgumentParser
+from itertools import groupby
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from generate_concordance import ConcordanceUtils
+from generate_concordance.concordance_generator import ConcordanceGenerator
+from generate_concordance.regex_backend import RegexBackend
+from generate_concordance.spacy_backend import SpacyBackend
+from generate_concordance.tokenizer_backend import SentenceToken, TokenizerBackend
+from generate_concordance.word_info import WordInfo
+
+"""Backend Comparison
+
+This script reports where two tokenizer backends disagree on user provided .txt files, and how fast each of them is.
+By default the spaCy backend is compared against the regex backend.
+
+Usage: python3 -m generate_concordance.backend_comparison --inputFiles [your input file] [your input file] ...
+"""
+
+# A run of sentences one backend found where the other backend found different sentences.
+SentenceDisagreement = Tuple[List[str], List[str]]
+
+
+def _get_word_frequencies(text: str, backend: TokenizerBackend) -> Dict[str, int]:
+    """Gets how many times each word of a text appears, as found by a backend.
+
+    Parameters
+    ----------
+    text : str
+        Text to count the words of.
+    backend : TokenizerBackend
+        Backend used to find the words.
+
+    Returns
+    -------
+    Dict[str, int]
+        Every word in the concordance of the text and its frequency.
+    """
+
+    generator: ConcordanceGenerator = ConcordanceGenerator(backend=backend)
+    generator.generate_concordance(text=text)
+    word_to_info: Dict[str, WordInfo] = generator.get_word_to_info()
+
+    return {word: word_info.word_frequency for word, word_info in word_to_info.items()}
+
+
+def _get_sentences(tokens: Iterable[SentenceToken]) -> List[str]:
+    """Joins tokens back into sentences.
+
+    Parameters
+    ----------
+    tokens : Iterable[SentenceToken]
+        Tokens produced by a backend.
+
+    Returns
+    -------
+    List[str]
+        Every sentence in order, with its tokens separated by single spaces.
+    """
+    return [" ".join(token for _, token in sentence_tokens)
+            for _, sentence_tokens in groupby(tokens, key=lambda sentence_token: sentence_token[0])]
+
+
+def find_word_disagreements(text: str, first_backend: TokenizerBackend,
+                            second_backend: TokenizerBackend) -> Dict[str, Tuple[int, int]]:
+    """Finds the words two backends count a different number of times in a text.
+
+    Parameters
+    ----------
+    text : str
+        Text to compare the backends on.
+    first_backend : TokenizerBackend
+        First backend to compare.
+    second_backend : TokenizerBackend
+        Second backend to compare.
+
+    Returns
+    -------
+    Dict[str, Tuple[int, int]]
+        Every word the backends disagree on, with the frequency found by the first backend and by the second backend.
+        A word a backend did not find at all has a frequency of 0.
+    """
+
+    first_frequencies: Dict[str, int] = _get_word_frequencies(text=text, backend=first_backend)
+    second_frequencies: Dict[str, int] = _get_word_frequencies(text=text, backend=second_backend)
+
+    return {word: (first_frequencies.get(word, 0), second_frequencies.get(word, 0))
+            for word in sorted(first_frequencies.keys() | second_frequencies.keys())
+            if first_frequencies.get(word, 0) != second_frequencies.get(word, 0)}
+
+
+def find_sentence_disagreements(text: str, first_backend: TokenizerBackend,
+                                second_backend: TokenizerBackend) -> List[SentenceDisagreement]:
+    """Finds the places two backends split a text into sentences or tokens differently.
+
+    Parameters
+    ----------
+    text : str
+        Text to compare the backends on.
+    first_backend : TokenizerBackend
+        First backend to compare.
+    second_backend : TokenizerBackend
+        Second backend to compare.
+
+    Returns
+    -------
+    List[SentenceDisagreement]
+        Every run of sentences the backends disagree on, in the order they appear in the text, as the sentences found
+        by the first backend and the sentences found by the second backend.
+    """
+
+    first_sentences: List[str] = _get_sentences(first_backend.tokenize(text))
+    second_sentences: List[str] = _get_sentences(second_backend.tokenize(text))
+    sentence_matcher = difflib.SequenceMatcher(a=first_sentences, b=second_sentences, autojunk=False)
+
+    return [(first_sentences[first_start:first_end], second_sentences[second_start:second_end])
+            for operation, first_start, first_end, second_start, second_end in sentence_matcher.get_opcodes()
+            if operation != "equal"]
+
+
+def measure_throughput(text: str, backend: TokenizerBackend, repeat: int = 3) -> float:
+    """Measures how quickly a backend tokenizes a text.
+
+    Parameters
+    ----------
+    text : str
+        Text to tokenize.
+    backend : TokenizerBackend
+        Backend to measure.
+    repeat : int
+        Number of times to tokenize the text. The fastest run is used, so anything loaded on the first run -- like a
+        spaCy pipeline -- isn't counted when repeat is more than 1.
+
+    Returns
+    -------
+    float
+        Characters of text tokenized per second.
+    """
+
+    fastest_run: float = float("inf")
+    for _ in range(repeat):
+        start: float = time.perf_counter()
+        for _ in backend.tokenize(text):
+            pass
+        fastest_run = min(fastest_run, time.perf_counter() - start)
+
+    return len(text) / fastest_run if fastest_run else float("inf")
+
+
+def _build_argument_parser() -> ArgumentParser:
+    """Builds the parser for the command line options.
+
+    Returns
+    -------
+    ArgumentParser
+        The parser for the script's command line options.
+    """
+
+    arg_parser: ArgumentParser = argparse.ArgumentParser(description="Reports where the spaCy and regex tokenizer "
+                                                                     "backends disagree, and how fast each of them is.")
+    arg_parser.add_argument("-i",
+                            "--inputFiles",
+                            dest="input_files",
+                            help="Location of .txt files to compare the backends on.",
+                            nargs="+",
+                            required=True)
+    arg_parser.add_argument("-r",
+                            "--repeat",
+                            default=3,
+                            dest="repeat",
+                            help="Number of times each file is tokenized when measuring throughput.",
+                            type=int)
+
+    return arg_parser
+
+
+def main() -> int:
+    arg_parser: ArgumentParser = _build_argument_parser()
+    options: argparse.Namespace = arg_parser.parse_args()
+
+    first_backend: TokenizerBackend = SpacyBackend()
+    second_backend: TokenizerBackend = RegexBackend()
+
+    for input_file in options.input_files:
+        input_text: Optional[str] = ConcordanceUtils.get_input_file_text(input_file)
+        if not input_text:
+            return 1
+
+        print(f"{input_file}:")
+        for word, (first_frequency, second_frequency) in find_word_disagreements(input_text, first_backend,
+                                                                                 second_backend).items():
+            print(f"  word {word!r}: spacy {first_frequency}, regex {second_frequency}")
+        for first_sentences, second_sentences in find_sentence_disagreements(input_text, first_backend,
+                                                                             second_backend):
+            print(f"  sentences:\n    spacy {first_sentences}\n    regex {second_sentences}")
+
+        for backend_name, backend in (("spacy", first_backend), ("regex", second_backend)):
+            throughput: float = measure_throughput(text=input_text, backend=backend, repeat=options.repeat)
+            print(f"  {backend_name} throughput: {throughput / 1e6:.2f} million characters per second")
+
+    return 0
+
+
+if "__main__" == __name__:
+    exit(main())
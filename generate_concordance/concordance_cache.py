@@ -0,0 +1,194 @@
+import contextlib
+import hashlib
+import os
+import time
+from typing import Iterable, List, Optional, Tuple
+
+from generate_concordance.concordance_index import INDEX_VERSION, TEMPORARY_INDEX_SUFFIX, ConcordanceIndex, \
+    write_concordance_index
+from generate_concordance.word_info import WordInfo
+
+DEFAULT_CACHE_DIRECTORY: str = os.path.join(os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache")),
+                                            "concordance_generator")
+DEFAULT_CACHE_SIZE: int = 1 << 30
+
+CACHE_FILE_EXTENSION: str = ".idx"
+
+# Seconds after which a temporary file in the cache directory is taken to have been left behind by a process that
+#   crashed while writing an entry, rather than being written right now.
+STALE_TEMPORARY_FILE_AGE: float = 60 * 60
+
+# Number of characters hashed at a time, so the text is never encoded as a whole.
+HASH_BLOCK_SIZE: int = 1 << 20
+
+
+class ConcordanceCache:
+    """
+    An on-disk cache of finished concordances, keyed by a hash of the text and the pipeline that processed it.
+
+    Every entry is a concordance index file. Reading a hit only costs reading the index, so repeat runs over unchanged
+    text skip natural language processing entirely. When the cache grows past its size limit, the least recently used
+    entries are deleted. Temporary files left behind by processes that crashed while writing an entry are deleted once
+    they are an hour old.
+
+    The cache is an optimization only: if it cannot be read or written, the concordance is generated as if there were
+    no cache.
+
+    Attributes
+    ----------
+    __cache_directory : str
+        Directory the cache entries are stored in.
+    __max_size : int
+        Number of bytes the cache entries may take up before the least recently used are deleted.
+
+    Methods
+    -------
+    get_key(text: str, pipeline_description: str)
+        Gets the key of the cache entry for a text processed by a pipeline.
+    get(key: str)
+        Opens a cache entry.
+    put(key: str, words: Iterable[Tuple[str, WordInfo]], longest_word: int, sentence_count: int)
+        Adds a concordance to the cache.
+    """
+
+    def __init__(self, cache_directory: str = DEFAULT_CACHE_DIRECTORY, max_size: int = DEFAULT_CACHE_SIZE):
+        """
+        Parameters
+        ----------
+        cache_directory : str
+            Directory to store cache entries in. Created if it does not exist.
+        max_size : int
+            Number of bytes the cache entries may take up before the least recently used are deleted.
+        """
+
+        self.__cache_directory: str = cache_directory
+        self.__max_size: int = max_size
+
+    @staticmethod
+    def get_key(text: str, pipeline_description: str) -> str:
+        """Gets the key of the cache entry for a text processed by a pipeline.
+
+        Parameters
+        ----------
+        text : str
+            Text a concordance was generated for.
+        pipeline_description : str
+            Everything about how the text was processed that changes the concordance, such as the model name, its
+            version, and the components that were run.
+
+        Returns
+        -------
+        str
+            SHA-256 hex digest identifying the cache entry.
+        """
+
+        text_hash = hashlib.sha256()
+        text_hash.update(f"{INDEX_VERSION}:{pipeline_description}:".encode("utf-8"))
+        for block_start in range(0, len(text), HASH_BLOCK_SIZE):
+            text_hash.update(text[block_start:block_start + HASH_BLOCK_SIZE].encode("utf-8", "surrogatepass"))
+
+        return text_hash.hexdigest()
+
+    def __get_path(self, key: str) -> str:
+        """Gets the file a cache entry is stored in.
+
+        Parameters
+        ----------
+        key : str
+            Key of the cache entry.
+
+        Returns
+        -------
+        str
+            Path of the cache entry.
+        """
+        return os.path.join(self.__cache_directory, f"{key}{CACHE_FILE_EXTENSION}")
+
+    def get(self, key: str) -> Optional[ConcordanceIndex]:
+        """Opens a cache entry, marking it as recently used.
+
+        Parameters
+        ----------
+        key : str
+            Key of the cache entry. See get_key().
+
+        Returns
+        -------
+        Optional[ConcordanceIndex]
+            The cached concordance if there is one, otherwise None is returned. The caller must close it.
+        """
+
+        path: str = self.__get_path(key)
+        try:
+            concordance_index: ConcordanceIndex = ConcordanceIndex(index_file=path)
+        except (OSError, ValueError):
+            return None
+
+        try:
+            os.utime(path)
+        except OSError:
+            concordance_index.close()
+            return None
+
+        return concordance_index
+
+    def put(self, key: str, words: Iterable[Tuple[str, WordInfo]], longest_word: int, sentence_count: int) -> None:
+        """Adds a concordance to the cache, then deletes the least recently used entries if the cache is too large.
+
+        Parameters
+        ----------
+        key : str
+            Key of the cache entry. See get_key().
+        words : Iterable[Tuple[str, WordInfo]]
+            Every word in the concordance with its frequency and appearances, in sorted order.
+        longest_word : int
+            The longest word in the concordance.
+        sentence_count : int
+            Number of sentences in the text the concordance was generated for.
+        """
+
+        try:
+            os.makedirs(self.__cache_directory, exist_ok=True)
+        except OSError:
+            return
+
+        # write_concordance_index() writes to a temporary file and renames it, so other processes never see a partly
+        #   written entry. It reports errors to the user, but a cache that can't be written isn't the user's problem,
+        #   so write quietly.
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            write_concordance_index(index_file=self.__get_path(key), words=words, longest_word=longest_word,
+                                    sentence_count=sentence_count)
+
+        self.__evict()
+
+    def __evict(self) -> None:
+        """Deletes stale temporary files, then the least recently used cache entries until the cache fits in its size
+        limit."""
+
+        entries: List[Tuple[float, int, str]] = list()
+        total_size: int = 0
+        stale_time: float = time.time() - STALE_TEMPORARY_FILE_AGE
+        try:
+            with os.scandir(self.__cache_directory) as directory_entries:
+                for directory_entry in directory_entries:
+                    if directory_entry.name.endswith(CACHE_FILE_EXTENSION):
+                        entry_stat: os.stat_result = directory_entry.stat()
+                        entries.append((entry_stat.st_mtime, entry_stat.st_size, directory_entry.path))
+                        total_size += entry_stat.st_size
+                    elif directory_entry.name.endswith(TEMPORARY_INDEX_SUFFIX) and \
+                            directory_entry.stat().st_mtime < stale_time:
+                        with contextlib.suppress(OSError):
+                            os.remove(directory_entry.path)
+        except OSError:
+            return
+
+        entries.sort()
+        for _, entry_size, entry_path in entries:
+            if total_size <= self.__max_size:
+                break
+
+            try:
+                os.remove(entry_path)
+            except OSError:
+                pass
+            total_size -= entry_size
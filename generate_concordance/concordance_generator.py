@@ -1,13 +1,87 @@
-import math
+import contextlib
+import os
 import string
-import spacy
-from typing import List, Dict, Optional
+import sys
+import tempfile
+from array import array
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import AbstractSet, Callable, Deque, Iterable, Iterator, List, Dict, Optional, Tuple, TypeVar
 
+from generate_concordance.concordance_cache import ConcordanceCache
 from generate_concordance.concordance_empty import ConcordanceEmpty
-from generate_concordance.word_info import WordInfo
+from generate_concordance.concordance_index import ConcordanceIndex, write_concordance_index
+from generate_concordance.concordance_merge import get_merged_longest_word, get_merged_sentence_count, \
+    iter_merged_concordance_lines, iter_merged_word_frequencies, iter_merged_words
+from generate_concordance.kwic import DEFAULT_CONTEXT_SIZE, KwicSource, iter_byte_offset_tokens
+from generate_concordance.language_processor import PipelineMode
+from generate_concordance.line_label import LineLabelScheme, format_concordance_line, iter_line_labels
+from generate_concordance.profiler import Profiler
+from generate_concordance.spacy_backend import SpacyBackend
+from generate_concordance.tokenizer_backend import OffsetToken, SentenceToken, TokenArrays, TokenizerBackend
+from generate_concordance.word_filter import WordFilter
+from generate_concordance.word_info import OFFSET_TYPECODE, WordInfo
 
-ASCII_TABLE_OFFSET: int = ord('a')
-CHARS_IN_ALPHABET: int = 26
+# Number of texts processed together when generating a concordance for each of several texts. Documents in a batch
+#   are held in memory at once, so keep it modest.
+DEFAULT_BATCH_SIZE: int = 32
+
+# Once this much text has been processed since the concordance was last spilled to a run, its memory use is measured
+#   again after a further 1 / MEMORY_CHECK_FRACTION of it. Measuring goes through every word, so it is only done often
+#   enough to keep the overshoot of the memory limit to a fraction of it.
+MEMORY_CHECK_FRACTION: int = 4
+
+# Most runs open at once. Every run is opened to merge the runs, so once this many runs of the same level are on disk
+#   they are merged into one run of the next level. Each part of the text is then only rewritten a few times, and the
+#   number of open files stays bounded however many times the concordance is spilled.
+RUN_FAN_IN: int = 64
+
+MergedItem = TypeVar("MergedItem")
+
+# The word to info dictionary, longest word, and sentence count of a concordance generated for one shard of a text.
+PartialConcordance = Tuple[Dict[str, WordInfo], int, int]
+
+
+def _iter_then_close(items: Iterator[MergedItem], exit_stack: contextlib.ExitStack) -> Iterator[MergedItem]:
+    """Iterates through items, then closes what they are read from.
+
+    Parameters
+    ----------
+    items : Iterator[MergedItem]
+        Items to iterate through.
+    exit_stack : contextlib.ExitStack
+        Holds what the items are read from.
+
+    Returns
+    -------
+    Iterator[MergedItem]
+        The same items.
+    """
+
+    with exit_stack:
+        yield from items
+
+
+def _generate_partial_concordance(shard: str, backend: TokenizerBackend) -> PartialConcordance:
+    """Generate the concordance for one shard of a text in a worker process.
+
+    Parameters
+    ----------
+    shard : str
+        Shard of the text to generate a concordance for. Must start and end on sentence boundaries.
+    backend : TokenizerBackend
+        Backend used to find tokens and sentences.
+
+    Returns
+    -------
+    PartialConcordance
+        The shard's concordance, with sentences numbered from the start of the shard.
+    """
+
+    generator: ConcordanceGenerator = ConcordanceGenerator(backend=backend)
+    generator.generate_concordance(text=shard)
+
+    return generator.get_word_to_info(), generator.get_longest_word(), generator.get_sentence_count()
 
 
 class ConcordanceGenerator:
@@ -16,104 +90,205 @@ class ConcordanceGenerator:
 
     Attributes
     ----------
-    __language_processor : spacy.Language
-        An instance of a natural language processor used to find tokens and sentences in user provided text.
+    __backend : TokenizerBackend
+        Backend used to find tokens and sentences in user provided text.
     __word_to_info : Dict[WordInfo]
         A unique word mapped to a class containing how many times a word has appeared in a text string
          and in which sentences it appeared in.
     __longest_word : int
         The longest word in the user provided text. Used to dynamically generate the size of the word column in
         a line of the concordance.
+    __sentence_count : int
+        The number of sentences processed since the concordance was last spilled to a run.
+    __cache : Optional[ConcordanceCache]
+        Cache of concordances for previously processed text. None if caching is disabled.
+    __profiler : Profiler
+        Records how long each stage of generating the concordance takes. Disabled unless one was given.
+    __word_filter : WordFilter
+        Stopwords left out of the concordance, and which words of it are written.
+    __sentence_offsets : Optional[array]
+        The start and end byte offset of every sentence, one after the other. None unless the concordance was
+        generated by generate_concordance_with_offsets().
+    __memory_limit : Optional[int]
+        Bytes __word_to_info may take up before it is spilled to a run on disk. None to keep it all in memory.
+    __runs : List[Tuple[str, int]]
+        Sorted runs the concordance has been spilled to, in the order of the text, each with its level: the number of
+        times the runs it holds have been merged. Each is a concordance index file of the text processed between
+        spills, with its sentences numbered from the start of that text. Runs are only open while they are merged.
+    __run_directory : Optional[tempfile.TemporaryDirectory]
+        Temporary directory holding the runs. Deleted along with the runs.
+    __run_file_count : int
+        Number of run files created in the run directory, to name the next one.
+    __spill_count : int
+        Number of times the concordance has been spilled to a run.
+    __run_sentence_count : int
+        The number of sentences in the runs.
+    __run_token_count : int
+        The number of words -- not counting punctuation -- in the runs.
+    __characters_since_spill : int
+        Characters of text processed since the concordance was last spilled to a run.
+    __characters_since_check : int
+        Characters of text processed since the memory used by the concordance was last measured.
 
     Methods
     -------
-    __get_concordance_line_prefix(words_processed: int)
-        Based off of how many lines of the concordance have already been processed, generate the prefix -- EX: bbbbb. --
-        of a line in a concordance.
-    __get_concordance_line(word: str, words_processed, prefix_column_length: int):
-        Generate one line in the concordance for the given word.
-    get_concordance_lines()
+    iter_concordance_lines(label_scheme: LineLabelScheme)
+        Returns an iterator that formats the lines of a concordance as they are requested.
+    get_concordance_lines(label_scheme: LineLabelScheme)
         Returns a list of formatted lines in a concordance.
+    iter_words()
+        Iterates through the words of the concordance in alphabetical order.
     get_longest_word():
         Gets the longest word in the concordance
+    get_token_count():
+        Gets the number of words in the text the concordance was generated for.
+    get_memory_usage():
+        Gets the approximate number of bytes used to store the concordance.
+    get_sentence_count():
+        Gets the number of sentences in the text the concordance was generated for.
     get_word_to_info():
         Gets the dictionary used to build the concordance.
+    get_word_count():
+        Gets the number of unique words in the concordance.
+    get_run_count():
+        Gets the number of runs the concordance has been spilled to.
     generate_concordance(text: str)
         Track how many times a word has appeared in text and in what sentences it appeared in using the
         __word_to_info dictionary.
+    generate_concordance_with_offsets(text: str)
+        Generate a concordance for the given text, recording where every appearance of a word and every sentence is.
+    iter_kwic_lines(word: str, kwic_source: KwicSource, context_size: int)
+        Iterates through every appearance of a word with the text around it.
+    generate_concordance_from_chunks(chunks: Iterable[str], workers: int)
+        Generate a concordance for text split into chunks, keeping only a few chunks in memory at once. Chunks can be
+        processed in parallel by a pool of worker processes.
+    update(text: str)
+        Add text following the text the concordance was generated for, carrying on from the existing concordance.
+    update_from_chunks(chunks: Iterable[str], workers: int, batch_size: int, processes: int)
+        Add text split into chunks following the text the concordance was generated for.
+    iter_concordances(texts: Iterable[str], batch_size: int, processes: int)
+        Generate a separate concordance for each of several texts.
+    restore(words: Iterable[Tuple[str, WordInfo]], longest_word: int, sentence_count: int)
+        Replace the concordance with a previously saved one.
+    set_backend(backend: TokenizerBackend)
+        Change the backend used for text processed from now on.
     """
 
-    def __init__(self):
-        self.__language_processor: spacy.Language = spacy.load('en_core_web_sm')
+    def __init__(self, pipeline_mode: PipelineMode = PipelineMode.ACCURATE,
+                 cache: Optional[ConcordanceCache] = None, backend: Optional[TokenizerBackend] = None,
+                 profiler: Optional[Profiler] = None, word_filter: Optional[WordFilter] = None,
+                 memory_limit: Optional[int] = None):
+        """
+        Parameters
+        ----------
+        pipeline_mode : PipelineMode
+            How much of the spaCy pipeline to run when finding sentences. PipelineMode.ACCURATE runs the full
+            pipeline, the other modes only run the tokenizer and a sentence segmenter. Ignored if backend is given.
+        cache : Optional[ConcordanceCache]
+            Cache of concordances for previously processed text. When given, text passed to generate_concordance() or
+            update() that has been processed before is not processed again.
+        backend : Optional[TokenizerBackend]
+            Backend used to find tokens and sentences. Defaults to a SpacyBackend running the given pipeline mode.
+        profiler : Optional[Profiler]
+            Records how long parsing, aggregation and cache access take. Nothing is recorded if not given.
+        word_filter : Optional[WordFilter]
+            Stopwords left out of the concordance, and which words of it are written. Every word is kept and written
+            if not given.
+        memory_limit : Optional[int]
+            Bytes the concordance may take up in memory. Past it, the concordance is written to a sorted run in a
+            temporary directory and started again, and the runs are merged when the concordance is written, so the
+            text processed is only limited by disk space. The limit is checked between texts or chunks, and may be
+            overshot by around a quarter. Does not apply to generate_concordance_with_offsets() or
+            iter_concordances(). Everything is kept in memory if not given.
+        """
+
+        self.__backend: TokenizerBackend = backend if backend else SpacyBackend(pipeline_mode=pipeline_mode)
+        self.__profiler: Profiler = profiler if profiler else Profiler(enabled=False)
+        self.__word_filter: WordFilter = word_filter if word_filter else WordFilter()
 
         # Set class variables to None to be able to check if generate_concordance has been run before trying to
         #   print a concordance
         self.__word_to_info: Optional[Dict[str, WordInfo]] = None
         self.__longest_word: Optional[int] = None
+        self.__sentence_count: Optional[int] = None
+        self.__sentence_offsets: Optional[array] = None
+        self.__cache: Optional[ConcordanceCache] = cache
+
+        self.__memory_limit: Optional[int] = memory_limit
+        self.__runs: List[Tuple[str, int]] = list()
+        self.__run_directory: Optional[tempfile.TemporaryDirectory] = None
+        self.__run_file_count: int = 0
+        self.__spill_count: int = 0
+        self.__run_sentence_count: int = 0
+        self.__run_token_count: int = 0
+        self.__characters_since_spill: int = 0
+        self.__characters_since_check: int = 0
 
-    def __get_concordance_line_prefix(self, words_processed: int) -> str:
-        """Gets the prefix of a concordance line.
+    def __generate_concordance_lines(self, label_scheme: LineLabelScheme) -> Iterator[str]:
+        """Lazily generate the lines of the concordance in alphabetical order, for the words picked by the word filter.
 
         Parameters
         ----------
-        words_processed : int
-            Number of words in the concordance for which lines have already been generated. Used to determine which
-            letter the prefix of a concordance line should be.
+        label_scheme : LineLabelScheme
+            How lines are labeled.
 
         Returns
         -------
-        str
-            prefix of a concordance line plus whitespace padding.
+        Iterator[str]
+            lines of the concordance, formatted one at a time as they are requested.
         """
 
-        prefix_column_length: int = math.ceil(len(self.__word_to_info) / CHARS_IN_ALPHABET)
-        prefix_length: int = (words_processed // CHARS_IN_ALPHABET) + 1
-        char_offset: int = words_processed % CHARS_IN_ALPHABET
+        # Only the words picked by the filter are sorted, so asking for a few words of a large vocabulary stays cheap
+        words: List[str] = self.__word_filter.select_words(self.__word_to_info)
 
-        line_prefix_components: List[str] = [chr(ASCII_TABLE_OFFSET + char_offset) for _ in range(prefix_length)]
-        line_prefix_components.append(".")
+        # Fit the word column to the words written rather than the whole vocabulary.
+        word_column_length: int = max(map(len, words), default=0) if self.__word_filter.is_selective() \
+            else self.__longest_word
+        for prefix, word in zip(iter_line_labels(label_count=len(words), label_scheme=label_scheme), words):
+            yield format_concordance_line(prefix=prefix, word=word, word_info=self.__word_to_info[word],
+                                          word_column_length=word_column_length)
 
-        # Pad the prefix to keep a consistent prefix column length when left aligning the word in the concordance line
-        prefix_padding: List[str] = [" " for _ in range(prefix_column_length - prefix_length)]
+    def iter_concordance_lines(self, label_scheme: LineLabelScheme = LineLabelScheme.REPEATED) -> Iterator[str]:
+        """Lazily get the lines of a concordance for previously supplied text.
 
-        line_prefix_components.extend(prefix_padding)
-
-        return "".join(line_prefix_components)
-
-    def __get_concordance_line(self, word: str, words_processed, prefix_column_length: int):
-        """Generate a line for a word in the concordance.
-
-        Each row is separated into columns of prefix, word, and word info. Each row component is left aligned
-        and the column size is based off the largest string in the column.
+        Lines are formatted as they are requested, so writing can start right away and the rendered concordance is
+        never held in memory in full. Each line does not end with a newline character.
 
         Parameters
         ----------
-        word : str
-            Word to generate the concordance line for
-        words_processed : int
-            Number of words in the concordance for which lines have already been generated.
-        prefix_column_length :
-            Length of the prefix column. Used to a consistent length for the prefix column despite varying prefix size.
+        label_scheme : LineLabelScheme
+            How lines are labeled. See LineLabelScheme.
 
         Returns
         -------
-        str
-            line for a word in the concordance.
-        """
-
-        word_info: WordInfo = self.__word_to_info[word]
-        appearance_list: str = ",".join(word_info.word_appearances)
-        prefix: str = self.__get_concordance_line_prefix(words_processed=words_processed)
-        line: str = f"{prefix:<{prefix_column_length}} {word:<{self.__longest_word}} {{{word_info.word_frequency}:{appearance_list}}}"
+        Iterator[str]
+            lines of the concordance.
 
-        return line
+        Raises
+        ------
+        ConcordanceEmpty
+            If the object was initialized but generate_concordance() was never called to create the concordance.
+        """
+        if self.__runs:
+            return self.__iter_merged_runs(lambda indexes: iter_merged_concordance_lines(
+                indexes=indexes, label_scheme=label_scheme, word_filter=self.__word_filter))
+        elif self.__word_to_info and self.__longest_word:
+            return self.__generate_concordance_lines(label_scheme=label_scheme)
+        else:
+            raise ConcordanceEmpty("generate_concordance(<input file>) must be run before attempting to output a "
+                                   "concordance.")
 
-    def get_concordance_lines(self) -> List[str]:
+    def get_concordance_lines(self, label_scheme: LineLabelScheme = LineLabelScheme.REPEATED) -> List[str]:
         """Get the lines of a concordance for previously supplied text.
 
         Each line is composed of the concordance prefix, word, and word occurrences to sentences appeared in.
         Each line does not end with a newline character.
 
+        Parameters
+        ----------
+        label_scheme : LineLabelScheme
+            How lines are labeled. See LineLabelScheme.
+
         Returns
         -------
         List[str]
@@ -125,24 +300,32 @@ class ConcordanceGenerator:
             If the object was initialized but generate_concordance() was never called to create the concordance.
 
         """
-        if self.__word_to_info and self.__longest_word:
-            concordance_lines: List[str] = list()
+        return list(self.iter_concordance_lines(label_scheme=label_scheme))
 
-            words_processed: int = 0
-            prefix_column_length: int = math.ceil(len(self.__word_to_info) / 26)
+    def iter_words(self) -> Iterator[Tuple[str, WordInfo]]:
+        """Iterates through the words of the concordance in alphabetical order.
 
-            # Sort the __wordToInfo dictionary's keys and iterate through the sorted list to print words alphabetically
-            for word in sorted(self.__word_to_info.keys()):
-                concordance_lines.append(self.__get_concordance_line(word=word,
-                                                                     words_processed=words_processed,
-                                                                     prefix_column_length=prefix_column_length))
-                words_processed += 1
+        If the concordance has been spilled to runs, the runs are merged as the words are iterated.
 
-            return concordance_lines
-        else:
+        Returns
+        -------
+        Iterator[Tuple[str, WordInfo]]
+            Each word with its frequency and the sentences it appeared in.
+
+        Raises
+        ------
+        ConcordanceEmpty
+            If the object was initialized but generate_concordance() was never called to create the concordance.
+        """
+        if self.__word_to_info is None:
             raise ConcordanceEmpty("generate_concordance(<input file>) must be run before attempting to output a "
                                    "concordance.")
 
+        if self.__runs:
+            return self.__iter_merged_runs(iter_merged_words)
+
+        return ((word, self.__word_to_info[word]) for word in sorted(self.__word_to_info.keys()))
+
     # Currently, only used to check the state of the GenerateConcordance object in Unit Tests.
     def get_longest_word(self) -> Optional[int]:
         """ Gets the longest word in the concordance
@@ -156,12 +339,64 @@ class ConcordanceGenerator:
         """
         return self.__longest_word
 
+    def get_token_count(self) -> Optional[int]:
+        """ Gets the number of words -- not counting punctuation -- in the text the concordance was generated for.
+
+        If generate_concordance() is never run, None will be returned.
+
+        Returns
+        -------
+        int
+            Number of words processed.
+        """
+        if self.__word_to_info is None:
+            return None
+
+        return sum(word_info.word_frequency for word_info in self.__word_to_info.values()) + self.__run_token_count
+
+    def get_memory_usage(self) -> Optional[int]:
+        """ Gets the approximate number of bytes used to store the concordance.
+
+        Includes the dictionary, the words, and every word's appearances. Divide by get_token_count() to get the memory
+        used per token when sizing jobs. Runs the concordance has been spilled to are on disk, so are not included.
+
+        If generate_concordance() is never run, None will be returned.
+
+        Returns
+        -------
+        int
+            Bytes used by the concordance.
+        """
+        if self.__word_to_info is None:
+            return None
+
+        sentence_offsets_size: int = sys.getsizeof(self.__sentence_offsets) if self.__sentence_offsets else 0
+        return sys.getsizeof(self.__word_to_info) + sentence_offsets_size + \
+            sum(sys.getsizeof(word) + sys.getsizeof(word_info) for word, word_info in self.__word_to_info.items())
+
+    def get_sentence_count(self) -> Optional[int]:
+        """ Gets the number of sentences in the text the concordance was generated for.
+
+        If generate_concordance() is never run, None will be returned.
+
+        Returns
+        -------
+        int
+            Number of sentences processed.
+        """
+        if self.__sentence_count is None:
+            return None
+
+        return self.__run_sentence_count + self.__sentence_count
+
     # Currently, only used to check the state of the GenerateConcordance object in Unit Tests.
     def get_word_to_info(self) -> Optional[Dict[str, WordInfo]]:
         """ Gets the dictionary used to build the concordance.
 
         If generate_concordance() is never run, None will be returned.
 
+        If the concordance has been spilled to runs, only holds the words of the text processed since the last spill.
+
         Returns
         -------
         Dict[str, WordInfo]
@@ -170,6 +405,513 @@ class ConcordanceGenerator:
         """
         return self.__word_to_info
 
+    def get_word_count(self) -> Optional[int]:
+        """ Gets the number of unique words in the concordance.
+
+        If generate_concordance() is never run, None will be returned.
+
+        Returns
+        -------
+        int
+            Number of words in the concordance.
+        """
+        if self.__word_to_info is None:
+            return None
+
+        if self.__runs:
+            return sum(1 for _ in self.__iter_merged_runs(iter_merged_word_frequencies))
+
+        return len(self.__word_to_info)
+
+    def get_run_count(self) -> int:
+        """ Gets the number of runs the concordance has been spilled to.
+
+        Runs merged together to keep the number of open files down are still counted separately.
+
+        Returns
+        -------
+        int
+            Number of runs. 0 if the whole concordance is in memory.
+        """
+        return self.__spill_count
+
+    def __reset(self) -> None:
+        """Reset class variables so the same instance of ConcordanceGenerator can be reused."""
+        self.__word_to_info = dict()
+        self.__longest_word = 0
+        self.__sentence_count = 0
+        self.__sentence_offsets = None
+        self.__discard_runs()
+
+    def __discard_runs(self) -> None:
+        """Deletes the runs the concordance has been spilled to."""
+        if self.__run_directory is not None:
+            self.__run_directory.cleanup()
+
+        self.__runs = list()
+        self.__run_directory = None
+        self.__run_file_count = 0
+        self.__spill_count = 0
+        self.__run_sentence_count = 0
+        self.__run_token_count = 0
+        self.__characters_since_spill = 0
+        self.__characters_since_check = 0
+
+    def __spill(self) -> None:
+        """Writes the concordance in memory to a sorted run on disk, then starts the concordance in memory again.
+
+        The words of each run are sorted, so the runs are combined with a k-way merge when the concordance is written.
+        See concordance_merge.
+
+        Raises
+        ------
+        IOError
+            If the run could not be written.
+        """
+
+        if not self.__word_to_info and not self.__sentence_count:
+            return
+
+        run_file: str = self.__get_new_run_file()
+        with self.__profiler.stage("spill"):
+            words: Iterator[Tuple[str, WordInfo]] = ((word, self.__word_to_info[word])
+                                                     for word in sorted(self.__word_to_info.keys()))
+            if not write_concordance_index(index_file=run_file, words=words, longest_word=self.__longest_word,
+                                           sentence_count=self.__sentence_count):
+                raise IOError(f"The concordance could not be spilled to {run_file}.")
+        self.__add_run(run_file=run_file, sentence_count=self.__sentence_count,
+                       token_count=sum(word_info.word_frequency for word_info in self.__word_to_info.values()))
+
+        # The longest word is kept, since it is the longest word of every run as well.
+        self.__word_to_info = dict()
+        self.__sentence_count = 0
+        self.__characters_since_spill = 0
+        self.__characters_since_check = 0
+
+    def __spill_words(self, iter_words: Callable[[], Iterator[Tuple[str, WordInfo]]], longest_word: int,
+                      sentence_count: int) -> None:
+        """Writes the concordance of the text following the text processed so far straight to a run, without holding
+        it in memory.
+
+        Parameters
+        ----------
+        iter_words : Callable[[], Iterator[Tuple[str, WordInfo]]]
+            Iterates through every word of the following text's concordance in sorted order -- EX:
+            ConcordanceIndex.iter_words. Called a second time to find the longest word if stopwords are left out.
+        longest_word : int
+            The longest word in the following text's concordance, stopwords included.
+        sentence_count : int
+            Number of sentences in the following text, which its concordance numbers from 1.
+
+        Raises
+        ------
+        IOError
+            If the run could not be written.
+        """
+
+        self.__spill()
+
+        # Concordances generated elsewhere -- EX: cached -- still hold the stopwords.
+        stopwords: AbstractSet[str] = self.__word_filter.get_stopwords()
+        if stopwords:
+            longest_word = max((len(word) for word, _ in iter_words() if word not in stopwords), default=0)
+
+        token_count: int = 0
+
+        def iter_run_words() -> Iterator[Tuple[str, WordInfo]]:
+            nonlocal token_count
+            for word, word_info in iter_words():
+                if word not in stopwords:
+                    token_count += word_info.word_frequency
+                    yield word, word_info
+
+        run_file: str = self.__get_new_run_file()
+        with self.__profiler.stage("spill"):
+            if not write_concordance_index(index_file=run_file, words=iter_run_words(), longest_word=longest_word,
+                                           sentence_count=sentence_count):
+                raise IOError(f"The concordance could not be spilled to {run_file}.")
+        self.__add_run(run_file=run_file, sentence_count=sentence_count, token_count=token_count)
+        self.__longest_word = max(self.__longest_word, longest_word)
+
+    def __add_run(self, run_file: str, sentence_count: int, token_count: int) -> None:
+        """Adds a run following the runs so far, merging runs if RUN_FAN_IN of the same level have built up.
+
+        Parameters
+        ----------
+        run_file : str
+            Location of the run.
+        sentence_count : int
+            Number of sentences in the text of the run.
+        token_count : int
+            Number of words -- not counting punctuation -- in the text of the run.
+        """
+
+        self.__runs.append((run_file, 0))
+        self.__spill_count += 1
+        self.__run_sentence_count += sentence_count
+        self.__run_token_count += token_count
+
+        while len(self.__runs) >= RUN_FAN_IN and \
+                1 == len(set(level for _, level in self.__runs[-RUN_FAN_IN:])):
+            self.__merge_runs(run_count=RUN_FAN_IN)
+
+    def __get_new_run_file(self) -> str:
+        """Names a new run file in the run directory, creating the directory if needed.
+
+        Returns
+        -------
+        str
+            Location of the run file.
+        """
+
+        if self.__run_directory is None:
+            self.__run_directory = tempfile.TemporaryDirectory(prefix="concordance-runs-")
+        self.__run_file_count += 1
+
+        return os.path.join(self.__run_directory.name, f"run{self.__run_file_count}.idx")
+
+    def __merge_runs(self, run_count: int) -> None:
+        """Merges the newest runs into one run.
+
+        Runs hold consecutive parts of the text, so merging consecutive runs keeps the runs in the order of the text.
+
+        Parameters
+        ----------
+        run_count : int
+            Number of runs to merge. At most RUN_FAN_IN, since every one of them is open at once.
+
+        Raises
+        ------
+        IOError
+            If the merged run could not be written.
+        """
+
+        merged_runs: List[Tuple[str, int]] = self.__runs[-run_count:]
+        run_file: str = self.__get_new_run_file()
+        with self.__profiler.stage("merge_runs"), contextlib.ExitStack() as exit_stack:
+            indexes: List[ConcordanceIndex] = [exit_stack.enter_context(ConcordanceIndex(index_file=merged_run_file))
+                                               for merged_run_file, _ in merged_runs]
+            if not write_concordance_index(index_file=run_file, words=iter_merged_words(indexes=indexes),
+                                           longest_word=get_merged_longest_word(indexes=indexes),
+                                           sentence_count=get_merged_sentence_count(indexes=indexes)):
+                raise IOError(f"The runs of the concordance could not be merged into {run_file}.")
+
+        for merged_run_file, _ in merged_runs:
+            os.remove(merged_run_file)
+        self.__runs[-run_count:] = [(run_file, max(level for _, level in merged_runs) + 1)]
+
+    def __iter_merged_runs(self, merge: Callable[[List[ConcordanceIndex]], Iterator[MergedItem]]) \
+            -> Iterator[MergedItem]:
+        """Spills the concordance in memory, then merges every run, keeping the runs open until the merged items have
+        been iterated through.
+
+        Parameters
+        ----------
+        merge : Callable[[List[ConcordanceIndex]], Iterator[MergedItem]]
+            Merges the runs. Called right away, so errors it raises right away -- EX: ConcordanceEmpty -- are too.
+
+        Returns
+        -------
+        Iterator[MergedItem]
+            The merged items.
+
+        Raises
+        ------
+        IOError
+            If the runs could not be written or merged.
+        """
+
+        self.__spill()
+
+        # Merge the newest runs, which are the smallest, until few enough are left to open them all.
+        while len(self.__runs) > RUN_FAN_IN:
+            self.__merge_runs(run_count=min(RUN_FAN_IN, len(self.__runs) - RUN_FAN_IN + 1))
+
+        exit_stack: contextlib.ExitStack = contextlib.ExitStack()
+        try:
+            merged_items: Iterator[MergedItem] = merge([exit_stack.enter_context(ConcordanceIndex(index_file=run_file))
+                                                        for run_file, _ in self.__runs])
+        except BaseException:
+            exit_stack.close()
+            raise
+
+        return _iter_then_close(items=merged_items, exit_stack=exit_stack)
+
+    def __iter_measured_texts(self, texts: Iterable[str]) -> Iterator[str]:
+        """Counts the characters of texts as they are processed, to know when to check the memory limit.
+
+        Parameters
+        ----------
+        texts : Iterable[str]
+            Texts to process.
+
+        Returns
+        -------
+        Iterator[str]
+            The same texts.
+        """
+
+        for text in texts:
+            self.__characters_since_spill += len(text)
+            self.__characters_since_check += len(text)
+            yield text
+
+    def __check_memory_limit(self) -> None:
+        """Spills the concordance to a run if it takes up more memory than the memory limit."""
+
+        if self.__memory_limit is None or \
+                self.__characters_since_check * MEMORY_CHECK_FRACTION < self.__characters_since_spill:
+            return
+
+        self.__characters_since_check = 0
+        if self.get_memory_usage() > self.__memory_limit:
+            self.__spill()
+
+    def __drop_offsets(self) -> None:
+        """Forgets where words and sentences are, once text that wasn't located has been added."""
+        if self.__sentence_offsets is not None:
+            self.__sentence_offsets = None
+            for word_info in self.__word_to_info.values():
+                word_info.drop_offsets()
+
+    def __add_tokens(self, tokens: Iterable[SentenceToken]) -> None:
+        """Adds the words of a text to the concordance.
+
+        Sentence numbering carries on from the text added before this one.
+
+        Parameters
+        ----------
+        tokens : Iterable[SentenceToken]
+            Tokens of the text produced by the backend, with sentences numbered from 1 at the start of the text.
+        """
+
+        stopwords: AbstractSet[str] = self.__word_filter.get_stopwords()
+        sentence_offset: int = self.__sentence_count
+        sentence_number: int = 0
+        for sentence_number, token in tokens:
+            lowercase_token: str = token.lower()
+            if lowercase_token not in string.punctuation and lowercase_token not in stopwords:
+                word_info: Optional[WordInfo] = self.__word_to_info.get(lowercase_token)
+                if word_info is not None:
+                    word_info.add_appearance(sentence_offset + sentence_number)
+                else:
+                    self.__word_to_info[lowercase_token] = WordInfo(
+                        word_first_appearance=sentence_offset + sentence_number)
+
+                    # Calculate the longest word present in the set to avoid iterating through the dictionary again
+                    #   when the longest word is required to properly format the printed concordance
+                    if len(lowercase_token) > self.__longest_word:
+                        self.__longest_word = len(lowercase_token)
+
+        self.__sentence_count = sentence_offset + sentence_number
+
+    def __add_offset_tokens(self, tokens: Iterable[OffsetToken]) -> None:
+        """Adds the words of a text to a new concordance, recording where every word and sentence is.
+
+        Parameters
+        ----------
+        tokens : Iterable[OffsetToken]
+            Tokens of the text produced by the backend, with sentences numbered from 1 and byte offsets.
+        """
+
+        stopwords: AbstractSet[str] = self.__word_filter.get_stopwords()
+        sentence_offsets: array = array(OFFSET_TYPECODE)
+        sentence_number: int = 0
+        for token_sentence_number, token, start, end in tokens:
+            # A sentence spans from the start of its first token to the end of its last, punctuation included.
+            if token_sentence_number != sentence_number:
+                sentence_offsets.append(start)
+                sentence_offsets.append(end)
+                sentence_number = token_sentence_number
+            else:
+                sentence_offsets[-1] = end
+
+            lowercase_token: str = token.lower()
+            if lowercase_token not in string.punctuation and lowercase_token not in stopwords:
+                word_info: Optional[WordInfo] = self.__word_to_info.get(lowercase_token)
+                if word_info is not None:
+                    word_info.add_appearance(sentence_number)
+                else:
+                    word_info = self.__word_to_info[lowercase_token] = WordInfo(word_first_appearance=sentence_number)
+                    if len(lowercase_token) > self.__longest_word:
+                        self.__longest_word = len(lowercase_token)
+                word_info.add_offsets(start=start, end=end)
+
+        self.__sentence_count = sentence_number
+        self.__sentence_offsets = sentence_offsets
+
+    def __add_token_arrays(self, texts_token_arrays: List[TokenArrays]) -> None:
+        """Adds the words of consecutive texts to the concordance, grouping their tokens with numpy instead of one at
+        a time.
+
+        Gives the same concordance as __add_tokens(). Sentence numbering carries on from the text added before these.
+
+        Parameters
+        ----------
+        texts_token_arrays : List[TokenArrays]
+            Tokens of each text produced by the backend, with sentences numbered from 1 at the start of each text.
+        """
+
+        # Only backends producing arrays need numpy, and they have imported it already.
+        from generate_concordance.token_arrays import aggregate_token_arrays
+
+        self.__merge_partial_concordance(aggregate_token_arrays(texts_token_arrays,
+                                                                sentence_offset=self.__sentence_count,
+                                                                stopwords=self.__word_filter.get_stopwords()),
+                                         shifted=True)
+
+    def __add_texts(self, texts: Iterable[str], batch_size: int = 1, processes: int = 1) -> None:
+        """Adds the words of consecutive texts to the concordance.
+
+        Uses the backend's token arrays when it can produce them, since grouping arrays is several times faster than
+        adding tokens one at a time. Arrays of consecutive texts are grouped together, up to TOKEN_ARRAY_BATCH_SIZE
+        tokens at a time.
+
+        Parameters
+        ----------
+        texts : Iterable[str]
+            Texts to add, in order.
+        batch_size : int
+            Number of texts the backend processes together.
+        processes : int
+            Number of processes the backend splits the texts in.
+        """
+
+        if self.__memory_limit is not None:
+            texts = self.__iter_measured_texts(texts)
+
+        texts_token_arrays: Optional[Iterator[TokenArrays]] = self.__backend.tokenize_arrays(
+            texts, batch_size=batch_size, processes=processes)
+        if texts_token_arrays is None:
+            for tokens in self.__profiler.iter_stage("nlp_parse", self.__backend.tokenize_texts(
+                    texts, batch_size=batch_size, processes=processes)):
+                # Backends that tokenize lazily -- EX: RegexBackend -- tokenize during aggregation.
+                with self.__profiler.stage("aggregation"):
+                    self.__add_tokens(tokens)
+                self.__check_memory_limit()
+            return
+
+        from generate_concordance.token_arrays import TOKEN_ARRAY_BATCH_SIZE
+
+        pending_token_arrays: List[TokenArrays] = list()
+        pending_token_count: int = 0
+        for token_arrays in self.__profiler.iter_stage("nlp_parse", texts_token_arrays):
+            pending_token_arrays.append(token_arrays)
+            pending_token_count += len(token_arrays[0])
+            if pending_token_count >= TOKEN_ARRAY_BATCH_SIZE:
+                with self.__profiler.stage("aggregation"):
+                    self.__add_token_arrays(pending_token_arrays)
+                pending_token_arrays = list()
+                pending_token_count = 0
+                self.__check_memory_limit()
+
+        if pending_token_arrays:
+            with self.__profiler.stage("aggregation"):
+                self.__add_token_arrays(pending_token_arrays)
+            self.__check_memory_limit()
+
+    def __merge_partial_concordance(self, partial_concordance: PartialConcordance, shifted: bool = False) -> None:
+        """Adds the concordance of the text following the text processed so far.
+
+        Parameters
+        ----------
+        partial_concordance : PartialConcordance
+            Concordance for the following text, with sentences numbered from the start of that text.
+        shifted : bool
+            Whether the sentences of partial_concordance have already been renumbered to continue on from the text
+            processed so far.
+        """
+
+        word_to_info, longest_word, sentence_count = partial_concordance
+
+        # Concordances generated elsewhere -- EX: cached, or by a worker process -- still hold the stopwords.
+        stopwords: AbstractSet[str] = self.__word_filter.get_stopwords()
+        if stopwords and not stopwords.isdisjoint(word_to_info.keys()):
+            word_to_info = dict((word, word_info) for word, word_info in word_to_info.items() if word not in stopwords)
+            longest_word = max(map(len, word_to_info.keys()), default=0)
+
+        for word, word_info in word_to_info.items():
+            if not shifted:
+                word_info.shift_appearances(sentence_offset=self.__sentence_count)
+            if word in self.__word_to_info:
+                self.__word_to_info[word].extend(word_info)
+            else:
+                self.__word_to_info[word] = word_info
+
+        self.__longest_word = max(self.__longest_word, longest_word)
+        self.__sentence_count += sentence_count
+
+    def __get_cached_partial_concordance(self, text: str) -> PartialConcordance:
+        """Gets the concordance for text on its own from the cache, generating and caching it if it isn't cached.
+
+        Parameters
+        ----------
+        text : str
+            Text to get the concordance for.
+
+        Returns
+        -------
+        PartialConcordance
+            The text's concordance, with sentences numbered from the start of the text.
+        """
+
+        key: str = self.__cache.get_key(text=text, pipeline_description=self.__backend.get_description())
+        with self.__profiler.stage("cache_read"):
+            cached_index: Optional[ConcordanceIndex] = self.__cache.get(key=key)
+            if cached_index:
+                with cached_index:
+                    return dict(cached_index.iter_words()), cached_index.get_longest_word(), \
+                           cached_index.get_sentence_count()
+
+        # Cache the whole concordance, so it can be reused with different stopwords.
+        generator: ConcordanceGenerator = ConcordanceGenerator(backend=self.__backend, profiler=self.__profiler)
+        generator.generate_concordance(text=text)
+        with self.__profiler.stage("cache_write"):
+            self.__cache.put(key=key,
+                             words=generator.iter_words(),
+                             longest_word=generator.get_longest_word(),
+                             sentence_count=generator.get_sentence_count())
+
+        return generator.get_word_to_info(), generator.get_longest_word(), generator.get_sentence_count()
+
+    def __spill_cached_concordance(self, text: str) -> None:
+        """Writes the concordance for text on its own from the cache straight to a run, generating and caching it if
+        it isn't cached, so the cached concordance is never held in memory as a whole.
+
+        Parameters
+        ----------
+        text : str
+            Text following the text processed so far.
+
+        Raises
+        ------
+        IOError
+            If the run could not be written.
+        """
+
+        key: str = self.__cache.get_key(text=text, pipeline_description=self.__backend.get_description())
+        with self.__profiler.stage("cache_read"):
+            cached_index: Optional[ConcordanceIndex] = self.__cache.get(key=key)
+        if cached_index:
+            with cached_index:
+                self.__spill_words(iter_words=cached_index.iter_words, longest_word=cached_index.get_longest_word(),
+                                   sentence_count=cached_index.get_sentence_count())
+            return
+
+        # Cache the whole concordance, so it can be reused with different stopwords.
+        generator: ConcordanceGenerator = ConcordanceGenerator(backend=self.__backend, profiler=self.__profiler,
+                                                               memory_limit=self.__memory_limit)
+        generator.generate_concordance(text=text)
+        with self.__profiler.stage("cache_write"):
+            self.__cache.put(key=key,
+                             words=generator.iter_words(),
+                             longest_word=generator.get_longest_word(),
+                             sentence_count=generator.get_sentence_count())
+
+        self.__spill_words(iter_words=generator.iter_words, longest_word=generator.get_longest_word(),
+                           sentence_count=generator.get_sentence_count())
+        generator.__discard_runs()
+
     def generate_concordance(self, text: str) -> None:
         """Generate a concordance for the given text.
 
@@ -178,34 +920,279 @@ class ConcordanceGenerator:
         text : str
             Text to generate a concordance for.
         """
-        # Reset class variables so the same instance of ConcordanceGenerator can be reused.
-        self.__word_to_info = dict()
-        self.__longest_word = 0
-        self.__language_processor = spacy.load('en_core_web_sm')
-
-        # The spacy natural language processor doesn't consider newlines to be word separators, so words at the end
-        #   of a line get appended to the front of the first word in the next line. Remove all white space that could
-        #   cause issues and replace them with a space for the best results.
-        text_no_newlines: str = " ".join(text.split())
-
-        text_document = self.__language_processor(text_no_newlines)
-
-        sentence_count = 1
-        for sentence in text_document.sents:
-            for token in sentence:
-                lowercase_token: str = token.text.lower()
-                if lowercase_token not in string.punctuation:
-                    if lowercase_token in self.__word_to_info:
-                        word_info: WordInfo = self.__word_to_info.get(lowercase_token)
-                        word_info.word_frequency += 1
-                        word_info.word_appearances.append(str(sentence_count))
-                    else:
-                        self.__word_to_info[lowercase_token] = WordInfo(word_frequency=1,
-                                                                        word_first_appearance=str(sentence_count))
-
-                        # Calculate the longest word present in the set to avoid iterating through the dictionary again
-                        #   when the longest word is required to properly format the printed concordance
-                        if len(lowercase_token) > self.__longest_word:
-                            self.__longest_word = len(lowercase_token)
-
-            sentence_count += 1
+        self.__reset()
+        self.update(text=text)
+
+    def generate_concordance_with_offsets(self, text: str) -> None:
+        """Generate a concordance for the given text, recording where every appearance of a word and every sentence
+        is, so appearances can be shown in context with iter_kwic_lines().
+
+        Offsets take two integers per appearance and per sentence, and the cache is not used. The text itself is not
+        kept. Adding text to the concordance afterwards drops the offsets.
+
+        Parameters
+        ----------
+        text : str
+            Text to generate a concordance for. Offsets are byte offsets into its UTF-8 encoding -- EX: into the file
+            the text was read from, see KwicSource.get_text().
+
+        Raises
+        ------
+        ValueError
+            If the backend can't locate tokens in the text.
+        """
+
+        tokens: Optional[Iterator[OffsetToken]] = self.__backend.tokenize_offsets(text)
+        if tokens is None:
+            raise ValueError(f"{type(self.__backend).__name__} can't locate tokens in text, so offsets can't be "
+                             f"recorded.")
+
+        self.__reset()
+        with self.__profiler.stage("nlp_parse"):
+            self.__add_offset_tokens(iter_byte_offset_tokens(text=text, tokens=tokens))
+
+    def iter_kwic_lines(self, word: str, kwic_source: KwicSource,
+                        context_size: int = DEFAULT_CONTEXT_SIZE) -> Iterator[str]:
+        """Iterates through every appearance of a word with the text around it, sliced out of the source text.
+
+        Parameters
+        ----------
+        word : str
+            Word to show the appearances of, in any case.
+        kwic_source : KwicSource
+            The text the concordance was generated for.
+        context_size : int
+            Most characters of context shown on each side of an appearance. Context does not reach past the
+            appearance's sentence.
+
+        Returns
+        -------
+        Iterator[str]
+            A line for every appearance, in order, labeled with its sentence number. Empty if the word does not
+            appear.
+
+        Raises
+        ------
+        ConcordanceEmpty
+            If the object was initialized but no concordance was ever generated.
+        ValueError
+            If the concordance was not generated by generate_concordance_with_offsets().
+        """
+
+        if self.__word_to_info is None:
+            raise ConcordanceEmpty("generate_concordance_with_offsets(<input file>) must be run before attempting to "
+                                   "output keywords in context.")
+        if self.__sentence_offsets is None:
+            raise ValueError("Offsets were not recorded. Use generate_concordance_with_offsets().")
+
+        word_info: Optional[WordInfo] = self.__word_to_info.get(word.lower())
+        if word_info is None:
+            return iter(())
+
+        return self.__iter_kwic_lines(word_info=word_info, kwic_source=kwic_source, context_size=context_size)
+
+    def __iter_kwic_lines(self, word_info: WordInfo, kwic_source: KwicSource, context_size: int) -> Iterator[str]:
+        """Slices every appearance of a word out of the source text along with its context.
+
+        Parameters
+        ----------
+        word_info : WordInfo
+            The word's appearances, with offsets recorded by generate_concordance_with_offsets().
+        kwic_source : KwicSource
+            The text the concordance was generated for.
+        context_size : int
+            Most characters of context shown on each side of an appearance.
+
+        Returns
+        -------
+        Iterator[str]
+            A line for every appearance, in order, labeled with its sentence number right-aligned to the widest
+            sentence number.
+        """
+
+        sentence_column_length: int = len(str(self.__sentence_count))
+        for sentence, (start, end) in zip(word_info.iter_appearances(), word_info.iter_offsets()):
+            context: str = kwic_source.get_context(start=start, end=end,
+                                                   sentence_start=self.__sentence_offsets[2 * sentence - 2],
+                                                   sentence_end=self.__sentence_offsets[2 * sentence - 1],
+                                                   context_size=context_size)
+            yield f"{sentence:>{sentence_column_length}} {context}"
+
+    def generate_concordance_from_chunks(self, chunks: Iterable[str], workers: int = 1) -> None:
+        """Generate a concordance for text that has been split into chunks.
+
+        Chunks are streamed through the backend, so only a few chunks are held in memory at once.
+        Sentence numbering continues across chunks, so as long as no chunk ends part way through a sentence the
+        concordance is identical to the one generate_concordance() produces for the joined text.
+
+        Parameters
+        ----------
+        chunks : Iterable[str]
+            Consecutive pieces of the text to generate a concordance for. See ConcordanceUtils.get_input_file_chunks().
+        workers : int
+            Number of processes to generate the concordance with. When more than one, each chunk is processed as a
+            shard in a pool of worker processes and the shards' concordances are merged in order. The result is
+            identical to processing the chunks in this process.
+        """
+        self.__reset()
+        self.update_from_chunks(chunks=chunks, workers=workers)
+
+    def update(self, text: str) -> None:
+        """Add text following the text the concordance was generated for.
+
+        Sentence numbering, the words of the concordance, and the longest word all carry on from the existing
+        concordance, so only the new text is processed. If no concordance has been generated yet, one is started.
+        If the generator has a cache and the text has been processed before, its cached concordance is used instead.
+
+        Parameters
+        ----------
+        text : str
+            Text to add to the concordance.
+        """
+        if self.__word_to_info is None:
+            self.__reset()
+        self.__drop_offsets()
+
+        if self.__cache is None:
+            self.__add_texts([text])
+        elif self.__memory_limit is not None:
+            self.__spill_cached_concordance(text=text)
+        else:
+            self.__merge_partial_concordance(self.__get_cached_partial_concordance(text=text))
+
+    def update_from_chunks(self, chunks: Iterable[str], workers: int = 1, batch_size: int = 1,
+                           processes: int = 1) -> None:
+        """Add text that has been split into chunks following the text the concordance was generated for.
+
+        See update() and generate_concordance_from_chunks().
+
+        Parameters
+        ----------
+        chunks : Iterable[str]
+            Consecutive pieces of the text to add to the concordance.
+        workers : int
+            Number of processes to process the chunks with.
+        batch_size : int
+            Number of chunks the backend processes together. Chunks of a large file are already large, so batching
+            them only raises peak memory, but many small texts -- like a directory of short documents -- are
+            processed faster in batches. Ignored when workers is more than 1.
+        processes : int
+            Number of processes the backend splits the chunks in. Ignored when workers is more than 1.
+        """
+        if self.__word_to_info is None:
+            self.__reset()
+        self.__drop_offsets()
+
+        if workers > 1:
+            self.__generate_concordance_in_parallel(chunks=chunks, workers=workers)
+            return
+
+        self.__add_texts(chunks, batch_size=batch_size, processes=processes)
+
+    def iter_concordances(self, texts: Iterable[str], batch_size: int = DEFAULT_BATCH_SIZE,
+                          processes: int = 1) -> Iterator["ConcordanceGenerator"]:
+        """Generate a separate concordance for each of several texts.
+
+        The texts are streamed through the backend together, so the backend is only loaded once and short texts are
+        processed in batches. The concordance of this generator is not changed.
+
+        Parameters
+        ----------
+        texts : Iterable[str]
+            Texts to generate concordances for. Consumed lazily.
+        batch_size : int
+            Number of texts the backend processes together.
+        processes : int
+            Number of processes the backend splits the texts in.
+
+        Returns
+        -------
+        Iterator[ConcordanceGenerator]
+            A generator holding the concordance of each text, in the order of texts. Texts without any words get a
+            generator with an empty concordance.
+        """
+
+        texts_token_arrays: Optional[Iterator[TokenArrays]] = self.__backend.tokenize_arrays(
+            texts, batch_size=batch_size, processes=processes)
+        if texts_token_arrays is not None:
+            for token_arrays in self.__profiler.iter_stage("nlp_parse", texts_token_arrays):
+                generator: ConcordanceGenerator = ConcordanceGenerator(backend=self.__backend, profiler=self.__profiler,
+                                                                       word_filter=self.__word_filter)
+                generator.__reset()
+                with self.__profiler.stage("aggregation"):
+                    generator.__add_token_arrays([token_arrays])
+                yield generator
+            return
+
+        for tokens in self.__profiler.iter_stage("nlp_parse", self.__backend.tokenize_texts(
+                texts, batch_size=batch_size, processes=processes)):
+            generator = ConcordanceGenerator(backend=self.__backend, profiler=self.__profiler,
+                                             word_filter=self.__word_filter)
+            generator.__reset()
+            with self.__profiler.stage("aggregation"):
+                generator.__add_tokens(tokens)
+            yield generator
+
+    def restore(self, words: Iterable[Tuple[str, WordInfo]], longest_word: int, sentence_count: int) -> None:
+        """Replace the concordance with a previously saved one, so it can be added to with update().
+
+        Parameters
+        ----------
+        words : Iterable[Tuple[str, WordInfo]]
+            Every word of the saved concordance with its frequency and appearances. See ConcordanceIndex.iter_words().
+        longest_word : int
+            The longest word in the saved concordance.
+        sentence_count : int
+            Number of sentences in the text the saved concordance was generated for.
+        """
+        self.__discard_runs()
+        self.__word_to_info = dict(words)
+        self.__longest_word = longest_word
+        self.__sentence_count = sentence_count
+        self.__sentence_offsets = None
+
+        stopwords: AbstractSet[str] = self.__word_filter.get_stopwords()
+        if stopwords and not stopwords.isdisjoint(self.__word_to_info.keys()):
+            for stopword in stopwords & self.__word_to_info.keys():
+                del self.__word_to_info[stopword]
+            self.__longest_word = max(map(len, self.__word_to_info.keys()), default=0)
+
+    def set_backend(self, backend: TokenizerBackend) -> None:
+        """Change the backend used for text processed from now on, keeping the concordance generated so far.
+
+        Lets texts in several languages be added to one concordance, each with the pipeline for its language.
+
+        Parameters
+        ----------
+        backend : TokenizerBackend
+            Backend used to find tokens and sentences in text processed from now on.
+        """
+        self.__backend = backend
+
+    def __generate_concordance_in_parallel(self, chunks: Iterable[str], workers: int) -> None:
+        """Generate a concordance for each chunk in a pool of worker processes and merge them.
+
+        Parameters
+        ----------
+        chunks : Iterable[str]
+            Consecutive shards of the text to generate a concordance for.
+        workers : int
+            Number of worker processes.
+        """
+
+        # Only keep a couple of shards per worker in flight so the whole text is never read into memory, and merge
+        #   the shards in order so their sentences can be renumbered.
+        max_pending_shards: int = 2 * workers
+        pending_shards: Deque[Future] = deque()
+        if self.__memory_limit is not None:
+            chunks = self.__iter_measured_texts(chunks)
+        with self.__profiler.stage("parallel_generation"), ProcessPoolExecutor(max_workers=workers) as executor:
+            for chunk in chunks:
+                pending_shards.append(executor.submit(_generate_partial_concordance, chunk, self.__backend))
+                if len(pending_shards) >= max_pending_shards:
+                    self.__merge_partial_concordance(pending_shards.popleft().result())
+                    self.__check_memory_limit()
+
+            while pending_shards:
+                self.__merge_partial_concordance(pending_shards.popleft().result())
+                self.__check_memory_limit()
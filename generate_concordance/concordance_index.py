@@ -0,0 +1,413 @@
+import contextlib
+import errno
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from typing import Iterable, Iterator, Optional, Tuple
+
+from generate_concordance.word_info import SENTENCE_TYPECODE, WordInfo
+
+"""Concordance Index
+
+A concordance index is a binary file holding a finished concordance, laid out so single words can be looked up through
+mmap without reading the rest of the file:
+
+    header   magic, format version, longest word, word count, sentence count, offset of the record table
+    records  one per word in sorted order, back to back: word length in bytes, frequency, UTF-8 word, then the sentence
+             of every appearance as unsigned 32 bit ints
+    table    the offset of every record as an unsigned 64 bit int, used to binary search the sorted words
+
+All numbers are little-endian.
+"""
+
+INDEX_MAGIC: bytes = b"CGIX"
+INDEX_VERSION: int = 1
+
+INDEX_HEADER: struct.Struct = struct.Struct("<4sIIIQQ")
+RECORD_HEADER: struct.Struct = struct.Struct("<II")
+RECORD_OFFSET: struct.Struct = struct.Struct("<Q")
+SENTENCE_SIZE: int = array(SENTENCE_TYPECODE).itemsize
+
+# Sentence numbers are stored little-endian, so arrays need their bytes swapped on big-endian machines.
+SWAP_BYTES: bool = "big" == sys.byteorder
+
+# Indexes are written to a temporary file with this suffix, next to the index, then renamed over it.
+TEMPORARY_INDEX_SUFFIX: str = ".tmp"
+
+
+def _get_file_mode() -> int:
+    # mkstemp creates files only their owner can read, so give indexes the permissions open() would have.
+    umask: int = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+INDEX_FILE_MODE: int = _get_file_mode()
+
+
+class ConcordanceIndex:
+    """
+    A read-only, memory-mapped concordance index.
+
+    Attributes
+    ----------
+    __index_file : str
+        Location of the index file.
+    __file : BinaryIO
+        The open index file.
+    __map : mmap.mmap
+        The index file mapped into memory.
+    __longest_word : int
+        The longest word in the concordance.
+    __word_count : int
+        Number of unique words in the concordance.
+    __sentence_count : int
+        Number of sentences in the text the concordance was generated for.
+    __table_offset : int
+        Where the table of record offsets starts.
+
+    Methods
+    -------
+    lookup(word: str)
+        Finds a word's frequency and the sentences it appeared in.
+    iter_words()
+        Iterates through every word in the index in sorted order.
+    iter_word_frequencies()
+        Iterates through every word in the index and its frequency in sorted order.
+    get_longest_word()
+        Gets the longest word in the concordance.
+    get_word_count()
+        Gets the number of unique words in the concordance.
+    get_sentence_count()
+        Gets the number of sentences in the text the concordance was generated for.
+    close()
+        Unmaps and closes the index file.
+    """
+
+    def __init__(self, index_file: str):
+        """
+        Parameters
+        ----------
+        index_file : str
+            Index file to open.
+
+        Raises
+        ------
+        IOError
+            If the index file cannot be opened.
+        ValueError
+            If the file is not a concordance index, or is truncated.
+        """
+
+        self.__index_file: str = index_file
+        self.__file = open(index_file, "rb")
+        try:
+            self.__map: mmap.mmap = mmap.mmap(self.__file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self.__file.close()
+            raise ValueError(f"{index_file} is empty.")
+
+        if len(self.__map) < INDEX_HEADER.size:
+            self.close()
+            raise ValueError(f"{index_file} is not a concordance index.")
+
+        magic, version, longest_word, word_count, sentence_count, table_offset = INDEX_HEADER.unpack_from(self.__map)
+        if INDEX_MAGIC != magic or INDEX_VERSION != version:
+            self.close()
+            raise ValueError(f"{index_file} is not a concordance index.")
+
+        # The record table ends the file, so a truncated file is caught here rather than part way through reading it.
+        if table_offset < INDEX_HEADER.size or table_offset + word_count * RECORD_OFFSET.size != len(self.__map):
+            self.close()
+            raise ValueError(f"{index_file} is truncated or corrupt.")
+
+        self.__longest_word: int = longest_word
+        self.__word_count: int = word_count
+        self.__sentence_count: int = sentence_count
+        self.__table_offset: int = table_offset
+
+    def __enter__(self) -> "ConcordanceIndex":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def __read_record(self, record_offset: int) -> Tuple[bytes, int, int]:
+        """Reads the header and word of a record.
+
+        Parameters
+        ----------
+        record_offset : int
+            Where the record starts.
+
+        Returns
+        -------
+        Tuple[bytes, int, int]
+            The UTF-8 word, the word's frequency, and where its sentence numbers start.
+
+        Raises
+        ------
+        ValueError
+            If the record runs past the records into the record table.
+        """
+
+        if record_offset < INDEX_HEADER.size or record_offset + RECORD_HEADER.size > self.__table_offset:
+            raise ValueError(f"{self.__index_file} is corrupt.")
+        word_length, frequency = RECORD_HEADER.unpack_from(self.__map, record_offset)
+        word_offset: int = record_offset + RECORD_HEADER.size
+        if word_offset + word_length + frequency * SENTENCE_SIZE > self.__table_offset:
+            raise ValueError(f"{self.__index_file} is corrupt.")
+
+        return self.__map[word_offset:word_offset + word_length], frequency, word_offset + word_length
+
+    def __read_word_info(self, frequency: int, postings_offset: int) -> WordInfo:
+        """Reads the sentence numbers of a record.
+
+        Parameters
+        ----------
+        frequency : int
+            Number of sentence numbers in the record.
+        postings_offset : int
+            Where the record's sentence numbers start.
+
+        Returns
+        -------
+        WordInfo
+            The word's frequency and appearances.
+        """
+
+        appearances: array = array(SENTENCE_TYPECODE)
+        appearances.frombytes(self.__map[postings_offset:postings_offset + frequency * SENTENCE_SIZE])
+        if SWAP_BYTES:
+            appearances.byteswap()
+
+        return WordInfo.from_appearances(appearances)
+
+    def lookup(self, word: str) -> Optional[WordInfo]:
+        """Finds a word's frequency and the sentences it appeared in.
+
+        The sorted words are binary searched in place, so only a handful of pages of the index are ever touched.
+
+        Parameters
+        ----------
+        word : str
+            Word to look up. Words are stored in lowercase.
+
+        Returns
+        -------
+        Optional[WordInfo]
+            The word's frequency and appearances, or None if the word is not in the index.
+
+        Raises
+        ------
+        ValueError
+            If the index is corrupt.
+        """
+
+        key: bytes = word.encode("utf-8")
+        low: int = 0
+        high: int = self.__word_count
+        while low < high:
+            middle: int = (low + high) // 2
+            record_offset: int = RECORD_OFFSET.unpack_from(self.__map,
+                                                           self.__table_offset + middle * RECORD_OFFSET.size)[0]
+            record_word, frequency, postings_offset = self.__read_record(record_offset)
+
+            # UTF-8 bytes sort in the same order as the code points Python sorts str by.
+            if record_word < key:
+                low = middle + 1
+            elif record_word > key:
+                high = middle
+            else:
+                return self.__read_word_info(frequency=frequency, postings_offset=postings_offset)
+
+        return None
+
+    def iter_words(self) -> Iterator[Tuple[str, WordInfo]]:
+        """Iterates through every word in the index in sorted order.
+
+        Returns
+        -------
+        Iterator[Tuple[str, WordInfo]]
+            Each word with its frequency and appearances.
+
+        Raises
+        ------
+        ValueError
+            If the index is corrupt.
+        """
+
+        record_offset: int = INDEX_HEADER.size
+        for _ in range(self.__word_count):
+            record_word, frequency, postings_offset = self.__read_record(record_offset)
+            yield record_word.decode("utf-8"), self.__read_word_info(frequency=frequency,
+                                                                     postings_offset=postings_offset)
+            record_offset = postings_offset + frequency * SENTENCE_SIZE
+
+    def iter_word_frequencies(self) -> Iterator[Tuple[str, int]]:
+        """Iterates through every word in the index and its frequency in sorted order.
+
+        Only the record headers are read, the sentences of each record are skipped over.
+
+        Returns
+        -------
+        Iterator[Tuple[str, int]]
+            Each word with its frequency.
+
+        Raises
+        ------
+        ValueError
+            If the index is corrupt.
+        """
+
+        record_offset: int = INDEX_HEADER.size
+        for _ in range(self.__word_count):
+            record_word, frequency, postings_offset = self.__read_record(record_offset)
+            yield record_word.decode("utf-8"), frequency
+            record_offset = postings_offset + frequency * SENTENCE_SIZE
+
+    def get_longest_word(self) -> int:
+        """ Gets the longest word in the concordance.
+
+        Returns
+        -------
+        int
+            Length of the longest word.
+        """
+        return self.__longest_word
+
+    def get_word_count(self) -> int:
+        """ Gets the number of unique words in the concordance.
+
+        Returns
+        -------
+        int
+            Number of words in the index.
+        """
+        return self.__word_count
+
+    def get_sentence_count(self) -> int:
+        """ Gets the number of sentences in the text the concordance was generated for.
+
+        Returns
+        -------
+        int
+            Number of sentences.
+        """
+        return self.__sentence_count
+
+    def close(self) -> None:
+        """Unmaps and closes the index file."""
+        self.__map.close()
+        self.__file.close()
+
+
+def open_concordance_index(index_file: str) -> Optional[ConcordanceIndex]:
+    """Opens a concordance index, reporting to the user why it could not be opened.
+
+    Parameters
+    ----------
+    index_file : str
+        Index file to open.
+
+    Returns
+    -------
+    Optional[ConcordanceIndex]
+        The opened index if it could be opened, otherwise None is returned.
+    """
+
+    concordance_index: Optional[ConcordanceIndex] = None
+    try:
+        concordance_index = ConcordanceIndex(index_file=index_file)
+    except IOError as io_error:
+        if errno.ENOENT == io_error.errno:
+            print(f"The provided index file -- {index_file} -- does not exist.")
+        elif errno.EACCES == io_error.errno:
+            print(f"The provided index file -- {index_file} -- cannot be read.")
+        else:
+            print(f"An unknown IO error occurred while attempting to read the provided index file -- {index_file}.")
+    except ValueError:
+        print(f"The provided index file -- {index_file} -- is not a concordance index.")
+
+    return concordance_index
+
+
+def write_concordance_index(index_file: str, words: Iterable[Tuple[str, WordInfo]], longest_word: int,
+                            sentence_count: int) -> bool:
+    """Writes a concordance to an index file.
+
+    Records are written as the words are iterated, so the concordance does not have to be copied before writing it.
+    They are written to a temporary file next to index_file that is renamed over it once complete, so a failed write
+    leaves an existing index -- EX: the one --append is updating -- as it was.
+
+    Parameters
+    ----------
+    index_file : str
+        File to write the index to.
+    words : Iterable[Tuple[str, WordInfo]]
+        Every word in the concordance with its frequency and appearances, in sorted order.
+    longest_word : int
+        The longest word in the concordance.
+    sentence_count : int
+        Number of sentences in the text the concordance was generated for.
+
+    Returns
+    -------
+    bool
+        Returns True if the index was written to file.
+    """
+
+    success: bool = False
+    temporary_path: Optional[str] = None
+    try:
+        file_descriptor, temporary_path = tempfile.mkstemp(dir=os.path.dirname(index_file) or os.curdir,
+                                                           prefix=f"{os.path.basename(index_file)}.",
+                                                           suffix=TEMPORARY_INDEX_SUFFIX)
+        with os.fdopen(file_descriptor, "wb") as file:
+            # Reserve room for the header, which can only be filled in once the records have been written.
+            file.write(bytes(INDEX_HEADER.size))
+
+            record_offsets: array = array("Q")
+            record_offset: int = INDEX_HEADER.size
+            for word, word_info in words:
+                encoded_word: bytes = word.encode("utf-8")
+                appearances: array = array(SENTENCE_TYPECODE, word_info.iter_appearances())
+                if SWAP_BYTES:
+                    appearances.byteswap()
+
+                file.write(RECORD_HEADER.pack(len(encoded_word), len(appearances)))
+                file.write(encoded_word)
+                file.write(appearances.tobytes())
+
+                record_offsets.append(record_offset)
+                record_offset += RECORD_HEADER.size + len(encoded_word) + len(appearances) * SENTENCE_SIZE
+
+            if SWAP_BYTES:
+                record_offsets.byteswap()
+            file.write(record_offsets.tobytes())
+
+            file.seek(0)
+            file.write(INDEX_HEADER.pack(INDEX_MAGIC, INDEX_VERSION, longest_word, len(record_offsets), sentence_count,
+                                         record_offset))
+
+        os.chmod(temporary_path, INDEX_FILE_MODE)
+        os.replace(temporary_path, index_file)
+        temporary_path = None
+        success = True
+    except IOError as io_error:
+        if errno.EACCES == io_error.errno:
+            print(f"The provided index file -- {index_file} -- cannot be opened for writing.")
+        elif errno.EISDIR == io_error.errno:
+            print(f"The provided index file -- {index_file} -- is a directory.")
+        else:
+            print(f"An unknown IO error occurred while attempting to open the provided index "
+                  f"file -- {index_file} -- for writing.")
+    finally:
+        if temporary_path is not None:
+            with contextlib.suppress(OSError):
+                os.remove(temporary_path)
+
+    return success
@@ -0,0 +1,221 @@
+import heapq
+import itertools
+from operator import itemgetter
+from typing import AbstractSet, Iterable, Iterator, List, Optional, Tuple
+
+from generate_concordance.concordance_empty import ConcordanceEmpty
+from generate_concordance.concordance_index import ConcordanceIndex
+from generate_concordance.line_label import LineLabelScheme, format_concordance_line, iter_line_labels
+from generate_concordance.word_filter import WordFilter
+from generate_concordance.word_info import WordInfo
+
+"""Concordance Merge
+
+Combines the concordance indexes of consecutive shards of a text -- EX: parts of an archive processed on different
+machines with --buildIndex -- into the concordance of the whole text. The words of every index are already sorted, so
+they are combined with a k-way merge as they are read, holding one word per index in memory whatever the size of the
+vocabulary. Sentences of each shard are renumbered to follow the sentences of the shards before it.
+"""
+
+
+def get_merged_sentence_count(indexes: List[ConcordanceIndex]) -> int:
+    """Gets the number of sentences in the text of every shard.
+
+    Parameters
+    ----------
+    indexes : List[ConcordanceIndex]
+        The index of each shard, in the order of the shards.
+
+    Returns
+    -------
+    int
+        Number of sentences.
+    """
+    return sum(concordance_index.get_sentence_count() for concordance_index in indexes)
+
+
+def _iter_shifted_words(concordance_index: ConcordanceIndex, sentence_offset: int) -> Iterator[Tuple[str, WordInfo]]:
+    """Iterates through the words of a shard's index, numbering its sentences after the sentences of the shards before
+    it.
+
+    Parameters
+    ----------
+    concordance_index : ConcordanceIndex
+        The shard's index.
+    sentence_offset : int
+        Number of sentences in the shards before it.
+
+    Returns
+    -------
+    Iterator[Tuple[str, WordInfo]]
+        Each word with its frequency and renumbered appearances, in sorted order.
+    """
+
+    for word, word_info in concordance_index.iter_words():
+        word_info.shift_appearances(sentence_offset=sentence_offset)
+        yield word, word_info
+
+
+def iter_merged_words(indexes: List[ConcordanceIndex],
+                      stopwords: AbstractSet[str] = frozenset()) -> Iterator[Tuple[str, WordInfo]]:
+    """Iterates through the words of the concordance of every shard together.
+
+    Parameters
+    ----------
+    indexes : List[ConcordanceIndex]
+        The index of each shard, in the order of the shards.
+    stopwords : AbstractSet[str]
+        Lowercase words left out of the merged concordance.
+
+    Returns
+    -------
+    Iterator[Tuple[str, WordInfo]]
+        Each word with its frequency and the sentences it appeared in across every shard, in sorted order.
+    """
+
+    sentence_offsets: Iterator[int] = itertools.accumulate(
+        (concordance_index.get_sentence_count() for concordance_index in indexes[:-1]), initial=0)
+    shard_words: List[Iterator[Tuple[str, WordInfo]]] = [
+        _iter_shifted_words(concordance_index=concordance_index, sentence_offset=sentence_offset)
+        for concordance_index, sentence_offset in zip(indexes, sentence_offsets)]
+
+    # Equal words come out of the merge in the order of the shards, so appearances stay in ascending order.
+    for word, word_group in itertools.groupby(heapq.merge(*shard_words, key=itemgetter(0)), key=itemgetter(0)):
+        if word in stopwords:
+            continue
+
+        _, word_info = next(word_group)
+        for _, shard_word_info in word_group:
+            word_info.extend(shard_word_info)
+        yield word, word_info
+
+
+def iter_merged_word_frequencies(indexes: List[ConcordanceIndex],
+                                 stopwords: AbstractSet[str] = frozenset()) -> Iterator[Tuple[str, int]]:
+    """Iterates through the words of the concordance of every shard together with their total frequency, without
+    reading the sentences they appeared in.
+
+    Parameters
+    ----------
+    indexes : List[ConcordanceIndex]
+        The index of each shard, in the order of the shards.
+    stopwords : AbstractSet[str]
+        Lowercase words left out of the merged concordance.
+
+    Returns
+    -------
+    Iterator[Tuple[str, int]]
+        Each word with its frequency across every shard, in sorted order.
+    """
+
+    shard_words: List[Iterator[Tuple[str, int]]] = [concordance_index.iter_word_frequencies()
+                                                    for concordance_index in indexes]
+    for word, word_group in itertools.groupby(heapq.merge(*shard_words, key=itemgetter(0)), key=itemgetter(0)):
+        if word not in stopwords:
+            yield word, sum(frequency for _, frequency in word_group)
+
+
+def get_merged_longest_word(indexes: List[ConcordanceIndex], stopwords: AbstractSet[str] = frozenset()) -> int:
+    """Gets the longest word in the concordance of every shard together.
+
+    Parameters
+    ----------
+    indexes : List[ConcordanceIndex]
+        The index of each shard, in the order of the shards.
+    stopwords : AbstractSet[str]
+        Lowercase words left out of the merged concordance.
+
+    Returns
+    -------
+    int
+        Length of the longest word.
+    """
+
+    # The longest word of a shard might be a stopword, so only then do the words have to be read.
+    if not stopwords:
+        return max((concordance_index.get_longest_word() for concordance_index in indexes), default=0)
+
+    return max((len(word) for word, _ in iter_merged_word_frequencies(indexes=indexes, stopwords=stopwords)),
+               default=0)
+
+
+def _iter_merged_concordance_lines(indexes: List[ConcordanceIndex], label_scheme: LineLabelScheme,
+                                   word_filter: WordFilter, label_count: int,
+                                   word_column_length: int) -> Iterator[str]:
+    """Lazily formats the lines of the merged concordance for the words picked by the word filter.
+
+    Parameters
+    ----------
+    indexes : List[ConcordanceIndex]
+        The index of each shard, in the order of the shards.
+    label_scheme : LineLabelScheme
+        How lines are labeled.
+    word_filter : WordFilter
+        Which words are written.
+    label_count : int
+        Number of words written.
+    word_column_length : int
+        Length of the longest word written.
+
+    Returns
+    -------
+    Iterator[str]
+        lines of the concordance.
+    """
+
+    # The picked words are a subsequence of the merged words, so the two are walked through side by side.
+    picked_words: Iterator[str] = (word for word, _ in word_filter.select_word_frequencies(
+        iter_merged_word_frequencies(indexes=indexes, stopwords=word_filter.get_stopwords())))
+    labels: Iterator[str] = iter_line_labels(label_count=label_count, label_scheme=label_scheme)
+    picked_word: Optional[str] = next(picked_words, None)
+    for word, word_info in iter_merged_words(indexes=indexes, stopwords=word_filter.get_stopwords()):
+        if picked_word is None:
+            break
+        if word == picked_word:
+            yield format_concordance_line(prefix=next(labels), word=word, word_info=word_info,
+                                          word_column_length=word_column_length)
+            picked_word = next(picked_words, None)
+
+
+def iter_merged_concordance_lines(indexes: List[ConcordanceIndex],
+                                  label_scheme: LineLabelScheme = LineLabelScheme.REPEATED,
+                                  word_filter: Optional[WordFilter] = None) -> Iterator[str]:
+    """Lazily gets the lines of the concordance of every shard together, as generateConcordance writes them.
+
+    The indexes are read twice: once for the frequencies of the words, to pick the words written and size the label
+    and word columns, then again to format the lines.
+
+    Parameters
+    ----------
+    indexes : List[ConcordanceIndex]
+        The index of each shard, in the order of the shards.
+    label_scheme : LineLabelScheme
+        How lines are labeled. See LineLabelScheme.
+    word_filter : Optional[WordFilter]
+        Which words are written. Every word is written if None.
+
+    Returns
+    -------
+    Iterator[str]
+        lines of the concordance.
+
+    Raises
+    ------
+    ConcordanceEmpty
+        If none of the indexes hold a word that is written.
+    """
+
+    word_filter = word_filter or WordFilter()
+    label_count: int = 0
+    word_column_length: int = 0
+    picked_words: Iterable[Tuple[str, int]] = word_filter.select_word_frequencies(
+        iter_merged_word_frequencies(indexes=indexes, stopwords=word_filter.get_stopwords()))
+    for word, _ in picked_words:
+        label_count += 1
+        word_column_length = max(word_column_length, len(word))
+
+    if not label_count:
+        raise ConcordanceEmpty("The concordance indexes do not hold any words to output.")
+
+    return _iter_merged_concordance_lines(indexes=indexes, label_scheme=label_scheme, word_filter=word_filter,
+                                          label_count=label_count, word_column_length=word_column_length)
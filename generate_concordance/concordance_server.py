@@ -0,0 +1,827 @@
+# /!usr/bin/env python3
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor
+from typing import AbstractSet, Any, Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from generate_concordance.concordance_empty import ConcordanceEmpty
+from generate_concordance.concordance_generator import ConcordanceGenerator
+from generate_concordance.language_processor import DEFAULT_MAX_MODELS, DEFAULT_MODEL, PipelineMode, \
+    get_language_processor_pool
+from generate_concordance.line_label import LineLabelScheme
+from generate_concordance.regex_backend import RegexBackend
+from generate_concordance.spacy_backend import SpacyBackend
+from generate_concordance.tokenizer_backend import TokenizerBackend
+
+"""Concordance Server
+
+This script runs a long-lived HTTP service that generates concordances, so callers don't pay for starting Python and
+loading a spaCy pipeline on every request. Each worker process loads the pipeline once, before the first request.
+
+POST the text to /concordance and the concordance lines come back as text/plain, or as JSON with ?format=json. Lines
+are labeled with ?labelScheme= as in generateConcordance's --labelScheme. Text in another language can ask for one of
+the spaCy pipelines allowed with --models with ?model=. Each worker keeps the --maxModels most recently used pipelines
+loaded. GET /health reports how many requests are waiting, and how often workers found the pipeline a request asked
+for already loaded. Requests arriving together are processed together in one call to the backend -- nlp.pipe() for
+spaCy -- and once --maxQueue requests are waiting, further requests are turned away with 503 until the backlog clears.
+Texts longer than the backend can process at once get 413 before they are queued, so they never fail the requests
+batched with them.
+
+Usage: python3 -m generate_concordance.concordance_server --port 8080 --workers 2
+       python3 -m generate_concordance.concordance_server --socket /tmp/concordance.sock
+"""
+
+DEFAULT_HOST: str = "127.0.0.1"
+DEFAULT_PORT: int = 8080
+DEFAULT_MAX_QUEUE: int = 64
+DEFAULT_MAX_BATCH: int = 16
+
+# Seconds the first request of a batch waits for more requests to join it. Short enough not to be noticed, long enough
+#   for requests sent together to end up in the same batch.
+DEFAULT_BATCH_WAIT: float = 0.005
+DEFAULT_MAX_BODY_SIZE: int = 10 * (1 << 20)
+
+# UTF-8 takes at most 4 bytes a character, so a body this many times the backend's longest text is always too long.
+MAX_CHARACTER_BYTES: int = 4
+
+# Most header lines read before a request is rejected.
+MAX_HEADER_COUNT: int = 100
+
+OUTPUT_FORMATS: List[str] = ["text", "json"]
+
+HTTP_REASONS: Dict[int, str] = dict({200: "OK",
+                                     400: "Bad Request",
+                                     404: "Not Found",
+                                     405: "Method Not Allowed",
+                                     413: "Payload Too Large",
+                                     414: "URI Too Long",
+                                     431: "Request Header Fields Too Large",
+                                     500: "Internal Server Error",
+                                     503: "Service Unavailable"})
+
+# Text to generate a concordance for, its output format, its label scheme, and the spaCy pipeline package it asked
+#   for. None for the backend's own.
+ConcordanceRequest = Tuple[str, str, str, Optional[str]]
+
+# HTTP status, content type, and body of a response.
+ConcordanceResponse = Tuple[int, str, bytes]
+
+# The backend of a worker process, loaded when the worker started, and a generator using it.
+_worker_backend: Optional[TokenizerBackend] = None
+_worker_generator: Optional[ConcordanceGenerator] = None
+
+
+def _initialize_worker(backend: TokenizerBackend, max_models: int) -> None:
+    """Loads the backend when a worker process starts, so no request waits for it.
+
+    Parameters
+    ----------
+    backend : TokenizerBackend
+        Backend used to find tokens and sentences.
+    max_models : int
+        Most spaCy pipelines the worker keeps loaded.
+    """
+
+    global _worker_backend, _worker_generator
+    get_language_processor_pool().set_max_models(max_models)
+    backend.load()
+    _worker_backend = backend
+    _worker_generator = ConcordanceGenerator(backend=backend)
+
+
+def _get_model_generator(model_name: Optional[str]) -> ConcordanceGenerator:
+    """Gets a generator of the worker process using the spaCy pipeline a request asked for.
+
+    Parameters
+    ----------
+    model_name : Optional[str]
+        The spaCy pipeline package, or None for the backend the worker started with.
+
+    Returns
+    -------
+    ConcordanceGenerator
+        A generator whose pipeline comes from the worker's pool. See LanguageProcessorPool.
+    """
+
+    if model_name is None:
+        return _worker_generator
+
+    return ConcordanceGenerator(backend=SpacyBackend(pipeline_mode=_worker_backend.get_pipeline_mode(),
+                                                     model_name=model_name))
+
+
+def _get_text_response(status: int, message: str) -> ConcordanceResponse:
+    return status, "text/plain; charset=utf-8", f"{message}\n".encode("utf-8")
+
+
+def _format_concordance(generator: ConcordanceGenerator, output_format: str,
+                        label_scheme: LineLabelScheme) -> ConcordanceResponse:
+    """Formats the concordance of a request.
+
+    Parameters
+    ----------
+    generator : ConcordanceGenerator
+        Generator holding the concordance of the request's text.
+    output_format : str
+        'text' for the concordance lines, 'json' for the lines and every word's frequency and sentences.
+    label_scheme : LineLabelScheme
+        How lines are labeled.
+
+    Returns
+    -------
+    ConcordanceResponse
+        The formatted concordance, or 400 if the text has no words.
+    """
+
+    try:
+        lines: List[str] = generator.get_concordance_lines(label_scheme=label_scheme)
+    except ConcordanceEmpty:
+        return _get_text_response(400, "The request body does not contain any words.")
+
+    if "json" == output_format:
+        concordance: Dict[str, Any] = dict({
+            "sentence_count": generator.get_sentence_count(),
+            "words": dict((word, dict({"frequency": word_info.word_frequency,
+                                       "sentences": word_info.word_appearances}))
+                          for word, word_info in generator.iter_words()),
+            "lines": lines})
+        return 200, "application/json", json.dumps(concordance).encode("utf-8")
+
+    return 200, "text/plain; charset=utf-8", "".join(f"{line}\n" for line in lines).encode("utf-8")
+
+
+def _process_requests(model_name: Optional[str], requests: List[ConcordanceRequest]) -> List[ConcordanceResponse]:
+    """Generates the concordances of requests asking for the same spaCy pipeline together, in a worker process.
+
+    Parameters
+    ----------
+    model_name : Optional[str]
+        The spaCy pipeline package the requests asked for, or None for the backend the worker started with.
+    requests : List[ConcordanceRequest]
+        Requests to process together.
+
+    Returns
+    -------
+    List[ConcordanceResponse]
+        Response to every request, in order.
+
+    Raises
+    ------
+    OSError
+        If the spaCy pipeline package is not installed.
+    Exception
+        Whatever the backend raised for any of the texts.
+    """
+
+    generators = _get_model_generator(model_name=model_name).iter_concordances(
+        texts=[text for text, _, _, _ in requests], batch_size=len(requests))
+    return [_format_concordance(generator=generator, output_format=output_format,
+                                label_scheme=LineLabelScheme(label_scheme))
+            for generator, (_, output_format, label_scheme, _) in zip(generators, requests)]
+
+
+def _process_request_group(model_name: Optional[str], requests: List[ConcordanceRequest]) -> List[ConcordanceResponse]:
+    """Generates the concordances of requests asking for the same spaCy pipeline, answering each request that fails
+    with 500 without failing the others.
+
+    Parameters
+    ----------
+    model_name : Optional[str]
+        The spaCy pipeline package the requests asked for, or None for the backend the worker started with.
+    requests : List[ConcordanceRequest]
+        Requests to process together.
+
+    Returns
+    -------
+    List[ConcordanceResponse]
+        Response to every request, in order.
+    """
+
+    try:
+        return _process_requests(model_name=model_name, requests=requests)
+    except OSError:
+        return [_get_text_response(500, f"The model -- {model_name} -- could not be loaded.")] * len(requests)
+    except Exception as error:
+        if len(requests) > 1:
+            # Texts processed together fail together, so process them one at a time to only fail the one at fault.
+            return [response for request in requests
+                    for response in _process_request_group(model_name=model_name, requests=[request])]
+
+        print(f"A request could not be processed -- {error!r}.", file=sys.stderr)
+        return [_get_text_response(500, "The concordance could not be generated.")]
+
+
+def _process_batch(requests: List[ConcordanceRequest]) -> Tuple[List[ConcordanceResponse], int, Dict[str, int]]:
+    """Generates the concordances of a batch of requests in a worker process.
+
+    Requests asking for the same spaCy pipeline are processed together, so each pipeline is taken from the pool once
+    per batch. A request that fails only fails the requests it was processed with if they asked for a model that could
+    not be loaded.
+
+    Parameters
+    ----------
+    requests : List[ConcordanceRequest]
+        Requests to process together. An empty batch only starts the worker.
+
+    Returns
+    -------
+    Tuple[List[ConcordanceResponse], int, Dict[str, int]]
+        Response to every request, in order, then the worker's process ID and the counters of its pool of pipelines.
+    """
+
+    request_numbers_by_model: Dict[Optional[str], List[int]] = dict()
+    for request_number, (_, _, _, model_name) in enumerate(requests):
+        request_numbers_by_model.setdefault(model_name, list()).append(request_number)
+
+    responses: List[Optional[ConcordanceResponse]] = [None] * len(requests)
+    for model_name, request_numbers in request_numbers_by_model.items():
+        group_responses: List[ConcordanceResponse] = _process_request_group(
+            model_name=model_name, requests=[requests[request_number] for request_number in request_numbers])
+        for request_number, response in zip(request_numbers, group_responses):
+            responses[request_number] = response
+
+    return responses, os.getpid(), get_language_processor_pool().get_stats()
+
+
+class _BadRequest(Exception):
+    """Raised when a request can't be read. The connection is closed after responding."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.response: ConcordanceResponse = _get_text_response(status, message)
+
+
+class ConcordanceServer:
+    """
+    An asyncio HTTP service generating concordances on a pool of worker processes.
+
+    Requests waiting to be processed are gathered into batches of up to max_batch requests, each processed by one
+    worker with a single call to the backend. A new batch is only started once a worker is free, so while every
+    worker is busy requests pile up and are processed in larger batches.
+
+    Attributes
+    ----------
+    __backend : TokenizerBackend
+        Backend every worker process uses.
+    __default_model : Optional[str]
+        The spaCy pipeline package of the backend. None unless the backend is a SpacyBackend.
+    __models : AbstractSet[str]
+        Further spaCy pipeline packages requests may ask for.
+    __max_models : int
+        Most spaCy pipelines each worker keeps loaded.
+    __model_stats : Dict[int, Dict[str, int]]
+        The counters of the pool of pipelines of each worker, by process ID, as of its last batch.
+    __workers : int
+        Number of worker processes.
+    __max_queue : int
+        Most requests waiting or being processed before further requests are turned away.
+    __max_batch : int
+        Most requests processed together.
+    __batch_wait : float
+        Seconds a batch waits for more requests to join it.
+    __max_body_size : int
+        Largest request body accepted, in bytes.
+    __max_text_length : Optional[int]
+        Most characters of text the backend can process at once, or None if there is no limit.
+    __queue_depth : int
+        Number of requests waiting or being processed.
+    __pending : Optional[asyncio.Queue]
+        Requests waiting for a batch, with the future their response is set on.
+    __idle_workers : Optional[asyncio.Semaphore]
+        Counts workers not processing a batch.
+    __executor : Optional[ProcessPoolExecutor]
+        The worker processes.
+    __server : Optional[asyncio.AbstractServer]
+        The listening socket.
+    __tasks : Set[asyncio.Task]
+        The batching task and every batch being processed.
+    __connections : Dict[asyncio.Task, asyncio.StreamWriter]
+        The task answering each open connection, and the connection.
+
+    Methods
+    -------
+    start(host: str, port: int, socket_path: Optional[str])
+        Loads the backend in every worker and starts listening.
+    get_address()
+        Gets the address the server listens on.
+    get_queue_depth()
+        Gets the number of requests waiting or being processed.
+    get_model_stats()
+        Gets the counters of the pools of pipelines of every worker added together.
+    serve_forever()
+        Serves requests until cancelled.
+    close()
+        Stops listening and shuts down the workers.
+    """
+
+    def __init__(self, backend: TokenizerBackend, workers: int = 1, max_queue: int = DEFAULT_MAX_QUEUE,
+                 max_batch: int = DEFAULT_MAX_BATCH, batch_wait: float = DEFAULT_BATCH_WAIT,
+                 max_body_size: int = DEFAULT_MAX_BODY_SIZE, models: Optional[Iterable[str]] = None,
+                 max_models: int = DEFAULT_MAX_MODELS):
+        """
+        Parameters
+        ----------
+        backend : TokenizerBackend
+            Backend every worker process uses. Must be picklable.
+        workers : int
+            Number of worker processes, each with its own copy of the pipeline.
+        max_queue : int
+            Most requests waiting or being processed before further requests get 503.
+        max_batch : int
+            Most requests processed together.
+        batch_wait : float
+            Seconds a batch waits for more requests to join it.
+        max_body_size : int
+            Largest request body accepted, in bytes. Larger requests get 413. Lowered to what the backend could
+            process if that is less -- EX: spaCy takes at most 1,000,000 characters at once.
+        models : Optional[Iterable[str]]
+            Further spaCy pipeline packages requests may ask for with ?model=, for text in other languages. Other
+            models get 400.
+        max_models : int
+            Most spaCy pipelines each worker keeps loaded. Past it, the least recently used pipeline is dropped.
+
+        Raises
+        ------
+        ValueError
+            If models are given but the backend is not a SpacyBackend.
+        """
+
+        if models and not isinstance(backend, SpacyBackend):
+            raise ValueError("Only the spacy backend can use other models.")
+
+        self.__backend: TokenizerBackend = backend
+        self.__default_model: Optional[str] = backend.get_model_name() if isinstance(backend, SpacyBackend) else None
+        self.__models: AbstractSet[str] = frozenset(models or [])
+        self.__max_models: int = max_models
+        self.__model_stats: Dict[int, Dict[str, int]] = dict()
+        self.__workers: int = workers
+        self.__max_queue: int = max_queue
+        self.__max_batch: int = max_batch
+        self.__batch_wait: float = batch_wait
+        self.__max_text_length: Optional[int] = backend.get_max_length()
+        self.__max_body_size: int = max_body_size if self.__max_text_length is None else \
+            min(max_body_size, self.__max_text_length * MAX_CHARACTER_BYTES)
+        self.__queue_depth: int = 0
+        self.__pending: Optional[asyncio.Queue] = None
+        self.__idle_workers: Optional[asyncio.Semaphore] = None
+        self.__executor: Optional[ProcessPoolExecutor] = None
+        self.__server: Optional[asyncio.AbstractServer] = None
+        self.__tasks: Set[asyncio.Task] = set()
+        self.__connections: Dict[asyncio.Task, asyncio.StreamWriter] = dict()
+
+    async def start(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                    socket_path: Optional[str] = None) -> None:
+        """Loads the backend in every worker and starts listening.
+
+        Parameters
+        ----------
+        host : str
+            Host to listen on.
+        port : int
+            Port to listen on. 0 picks a free port. See get_address().
+        socket_path : Optional[str]
+            Unix socket to listen on instead of host and port.
+        """
+
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        self.__pending = asyncio.Queue()
+        self.__idle_workers = asyncio.Semaphore(self.__workers)
+        self.__executor = ProcessPoolExecutor(max_workers=self.__workers, initializer=_initialize_worker,
+                                              initargs=(self.__backend, self.__max_models))
+
+        # Workers are started as tasks are submitted, so submit one to each to load the pipeline before the first
+        #   request arrives.
+        for _, worker_pid, model_stats in await asyncio.gather(
+                *(loop.run_in_executor(self.__executor, _process_batch, list()) for _ in range(self.__workers))):
+            self.__model_stats[worker_pid] = model_stats
+
+        if socket_path:
+            self.__server = await asyncio.start_unix_server(self.__handle_connection, path=socket_path)
+        else:
+            self.__server = await asyncio.start_server(self.__handle_connection, host=host, port=port)
+        self.__start_task(self.__run_batches())
+
+    def get_address(self) -> Any:
+        return self.__server.sockets[0].getsockname()
+
+    def get_queue_depth(self) -> int:
+        return self.__queue_depth
+
+    def get_model_stats(self) -> Dict[str, int]:
+        """Gets the counters of the pools of pipelines of every worker added together.
+
+        Returns
+        -------
+        Dict[str, int]
+            hits, misses, evictions and loaded, as of the last batch of each worker. See
+            LanguageProcessorPool.get_stats().
+        """
+
+        model_stats: Dict[str, int] = dict({"hits": 0, "misses": 0, "evictions": 0, "loaded": 0})
+        for worker_model_stats in self.__model_stats.values():
+            for name, count in worker_model_stats.items():
+                model_stats[name] += count
+
+        return model_stats
+
+    async def serve_forever(self) -> None:
+        await self.__server.serve_forever()
+
+    async def close(self) -> None:
+        if self.__server:
+            self.__server.close()
+
+        # Closing a connection ends its task once any request in progress is answered.
+        for writer in self.__connections.values():
+            writer.close()
+        await asyncio.gather(*self.__connections.keys(), return_exceptions=True)
+
+        for task in list(self.__tasks):
+            task.cancel()
+        if self.__executor:
+            self.__executor.shutdown(wait=True)
+        if self.__server:
+            await self.__server.wait_closed()
+
+    def __start_task(self, coroutine) -> None:
+        # The event loop only keeps weak references to tasks.
+        task: asyncio.Task = asyncio.get_running_loop().create_task(coroutine)
+        self.__tasks.add(task)
+        task.add_done_callback(self.__tasks.discard)
+
+    async def __run_batches(self) -> None:
+        """Gathers waiting requests into batches and hands each batch to a free worker."""
+
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        while True:
+            await self.__idle_workers.acquire()
+            batch: List[Tuple[ConcordanceRequest, asyncio.Future]] = list([await self.__pending.get()])
+
+            deadline: float = loop.time() + self.__batch_wait
+            while len(batch) < self.__max_batch:
+                try:
+                    batch.append(self.__pending.get_nowait())
+                    continue
+                except asyncio.QueueEmpty:
+                    pass
+
+                remaining_wait: float = deadline - loop.time()
+                if remaining_wait <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.__pending.get(), timeout=remaining_wait))
+                except asyncio.TimeoutError:
+                    break
+
+            self.__start_task(self.__process_batch(batch))
+
+    async def __process_batch(self, batch: List[Tuple[ConcordanceRequest, asyncio.Future]]) -> None:
+        """Processes a batch on a worker and answers each of its requests.
+
+        Parameters
+        ----------
+        batch : List[Tuple[ConcordanceRequest, asyncio.Future]]
+            Requests to process together, with the future their response is set on.
+        """
+
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        try:
+            responses: List[ConcordanceResponse]
+            responses, worker_pid, model_stats = await loop.run_in_executor(
+                self.__executor, _process_batch, [request for request, _ in batch])
+            self.__model_stats[worker_pid] = model_stats
+        except Exception as error:
+            print(f"A batch of {len(batch)} requests could not be processed -- {error!r}.", file=sys.stderr)
+            responses = [_get_text_response(500, "The concordance could not be generated.")] * len(batch)
+        finally:
+            self.__idle_workers.release()
+
+        for (_, response_future), response in zip(batch, responses):
+            if not response_future.done():
+                response_future.set_result(response)
+
+    @staticmethod
+    async def __read_line(reader: asyncio.StreamReader, too_long: _BadRequest) -> bytes:
+        """Reads a line of a request.
+
+        Parameters
+        ----------
+        reader : asyncio.StreamReader
+            Connection to read from.
+        too_long : _BadRequest
+            Raised if the line is longer than the reader's limit.
+
+        Returns
+        -------
+        bytes
+            The line, or nothing if the connection was closed.
+
+        Raises
+        ------
+        _BadRequest
+            If the line is too long.
+        """
+
+        try:
+            return await reader.readline()
+        except (ValueError, asyncio.LimitOverrunError):
+            raise too_long
+
+    async def __read_request(self, reader: asyncio.StreamReader) -> Optional[Tuple[str, str, str, Dict[str, str],
+                                                                                   bytes]]:
+        """Reads a request from a connection.
+
+        Parameters
+        ----------
+        reader : asyncio.StreamReader
+            Connection to read from.
+
+        Returns
+        -------
+        Optional[Tuple[str, str, str, Dict[str, str], bytes]]
+            The method, target, HTTP version, lowercase headers, and body of the request, or None if the connection was
+            closed before another request.
+
+        Raises
+        ------
+        _BadRequest
+            If the request is malformed, or its request line, a header or its body is too large.
+        """
+
+        request_line: bytes = await self.__read_line(reader, _BadRequest(414, "The request line is too long."))
+        if not request_line:
+            return None
+
+        request_parts: List[str] = request_line.decode("latin-1").split()
+        if 3 != len(request_parts):
+            raise _BadRequest(400, "The request line is malformed.")
+        method, target, version = request_parts
+
+        headers: Dict[str, str] = dict()
+        while True:
+            header_line: str = (await self.__read_line(
+                reader, _BadRequest(431, "A request header is too long."))).decode("latin-1").strip()
+            if not header_line:
+                break
+            if len(headers) >= MAX_HEADER_COUNT or ":" not in header_line:
+                raise _BadRequest(400, "The request headers are malformed.")
+            name, value = header_line.split(":", 1)
+            headers[name.strip().lower()] = value.strip()
+
+        if "transfer-encoding" in headers:
+            raise _BadRequest(400, "Chunked request bodies are not supported. Send a Content-Length header.")
+        try:
+            content_length: int = int(headers.get("content-length", "0"))
+        except ValueError:
+            raise _BadRequest(400, "The Content-Length header is not a number.")
+        if content_length < 0:
+            raise _BadRequest(400, "The Content-Length header is negative.")
+        if content_length > self.__max_body_size:
+            raise _BadRequest(413, f"The request body is larger than {self.__max_body_size} bytes.")
+
+        return method, target, version, headers, await reader.readexactly(content_length)
+
+    async def __respond(self, method: str, target: str, body: bytes) -> ConcordanceResponse:
+        """Routes a request and waits for its response.
+
+        Parameters
+        ----------
+        method : str
+            HTTP method of the request.
+        target : str
+            Path and query string of the request.
+        body : bytes
+            Body of the request.
+
+        Returns
+        -------
+        ConcordanceResponse
+            Response to the request.
+        """
+
+        url = urlsplit(target)
+        if "/health" == url.path:
+            if "GET" != method:
+                return _get_text_response(405, "Use GET for /health.")
+            return 200, "application/json", json.dumps(dict({"queue_depth": self.__queue_depth,
+                                                             "max_queue": self.__max_queue,
+                                                             "models": self.get_model_stats()})).encode("utf-8")
+
+        if "/concordance" != url.path:
+            return _get_text_response(404, f"There is nothing at {url.path}. POST text to /concordance.")
+        if "POST" != method:
+            return _get_text_response(405, "Use POST for /concordance.")
+
+        query: Dict[str, List[str]] = parse_qs(url.query)
+        output_format: str = query.get("format", [OUTPUT_FORMATS[0]])[-1]
+        if output_format not in OUTPUT_FORMATS:
+            return _get_text_response(400, f"The format -- {output_format} -- is not one of {OUTPUT_FORMATS}.")
+        label_scheme: str = query.get("labelScheme", [LineLabelScheme.REPEATED.value])[-1]
+        label_schemes: List[str] = [scheme.value for scheme in LineLabelScheme]
+        if label_scheme not in label_schemes:
+            return _get_text_response(400, f"The labelScheme -- {label_scheme} -- is not one of {label_schemes}.")
+        model_name: Optional[str] = query.get("model", [None])[-1]
+        if model_name == self.__default_model:
+            model_name = None
+        elif model_name is not None and model_name not in self.__models:
+            models: List[str] = sorted(self.__models | {self.__default_model} if self.__default_model
+                                       else self.__models)
+            return _get_text_response(400, f"The model -- {model_name} -- is not one of {models}.")
+        try:
+            text: str = body.decode("utf-8")
+        except UnicodeDecodeError:
+            return _get_text_response(400, "The request body is not UTF-8 text.")
+        # The backend would fail on the text, and with it every request batched with it.
+        if self.__max_text_length is not None and len(text) > self.__max_text_length:
+            return _get_text_response(413, f"The request body is longer than {self.__max_text_length} characters, "
+                                           f"the most the backend can process at once.")
+
+        # Turn requests away rather than let latency grow without bound.
+        if self.__queue_depth >= self.__max_queue:
+            return _get_text_response(503, "Too many requests are waiting. Try again shortly.")
+
+        self.__queue_depth += 1
+        try:
+            response_future: asyncio.Future = asyncio.get_running_loop().create_future()
+            self.__pending.put_nowait(((text, output_format, label_scheme, model_name), response_future))
+            return await response_future
+        finally:
+            self.__queue_depth -= 1
+
+    @staticmethod
+    async def __write_response(writer: asyncio.StreamWriter, response: ConcordanceResponse, keep_alive: bool) -> None:
+        status, content_type, body = response
+        header_lines: List[str] = [f"HTTP/1.1 {status} {HTTP_REASONS[status]}",
+                                   f"Content-Type: {content_type}",
+                                   f"Content-Length: {len(body)}",
+                                   f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+        if 503 == status:
+            header_lines.append("Retry-After: 1")
+
+        writer.write("".join(f"{header_line}\r\n" for header_line in header_lines).encode("latin-1") + b"\r\n" + body)
+        await writer.drain()
+
+    async def __handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Answers the requests of a connection, one at a time, until it is closed."""
+
+        connection_task: asyncio.Task = asyncio.current_task()
+        self.__connections[connection_task] = writer
+        try:
+            while True:
+                try:
+                    request = await self.__read_request(reader)
+                except _BadRequest as bad_request:
+                    await self.__write_response(writer, bad_request.response, keep_alive=False)
+                    break
+                if request is None:
+                    break
+
+                method, target, version, headers, body = request
+                response: ConcordanceResponse = await self.__respond(method=method, target=target, body=body)
+                connection: str = headers.get("connection", "").lower()
+                keep_alive: bool = "keep-alive" == connection if "HTTP/1.0" == version else "close" != connection
+                await self.__write_response(writer, response, keep_alive=keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            del self.__connections[connection_task]
+            writer.close()
+
+
+def _build_argument_parser() -> ArgumentParser:
+    """Builds the parser for the command line options.
+
+    Returns
+    -------
+    ArgumentParser
+        The parser for the script's command line options.
+    """
+
+    arg_parser: ArgumentParser = argparse.ArgumentParser(description="Serves concordances over HTTP, keeping the "
+                                                                     "pipeline loaded between requests.")
+    arg_parser.add_argument("--host",
+                            default=DEFAULT_HOST,
+                            dest="host",
+                            help=f"Host to listen on. Defaults to {DEFAULT_HOST}.")
+    arg_parser.add_argument("--port",
+                            default=DEFAULT_PORT,
+                            dest="port",
+                            help=f"Port to listen on. Defaults to {DEFAULT_PORT}.",
+                            type=int)
+    arg_parser.add_argument("--socket",
+                            default=None,
+                            dest="socket_path",
+                            help="Unix socket to listen on instead of --host and --port.")
+    arg_parser.add_argument("--backend",
+                            choices=["spacy", "regex"],
+                            default="spacy",
+                            dest="backend",
+                            help="How tokens and sentences are found. See generateConcordance --help.")
+    arg_parser.add_argument("-p",
+                            "--pipelineMode",
+                            choices=[mode.value for mode in PipelineMode],
+                            default=PipelineMode.ACCURATE.value,
+                            dest="pipeline_mode",
+                            help="How much of the spaCy pipeline to run when finding sentences with the spacy backend.")
+    arg_parser.add_argument("--model",
+                            default=DEFAULT_MODEL,
+                            dest="model",
+                            help=f"spaCy pipeline package used by the spacy backend unless a request asks for another. "
+                                 f"Defaults to {DEFAULT_MODEL}.")
+    arg_parser.add_argument("--models",
+                            default=None,
+                            dest="models",
+                            help="Further spaCy pipeline packages requests may ask for with ?model=, for text in other "
+                                 "languages -- EX: de_core_news_sm fr_core_news_sm.",
+                            metavar="MODEL",
+                            nargs="+")
+    arg_parser.add_argument("--maxModels",
+                            default=DEFAULT_MAX_MODELS,
+                            dest="max_models",
+                            help="Most spaCy pipelines each worker keeps loaded. Past it, the least recently used "
+                                 f"pipeline is dropped. Defaults to {DEFAULT_MAX_MODELS}.",
+                            type=int)
+    arg_parser.add_argument("-w",
+                            "--workers",
+                            default=1,
+                            dest="workers",
+                            help="Number of worker processes, each loading its own copy of the pipeline.",
+                            type=int)
+    arg_parser.add_argument("--maxQueue",
+                            default=DEFAULT_MAX_QUEUE,
+                            dest="max_queue",
+                            help="Number of requests that may wait or be processed at once. Further requests get "
+                                 "503 Service Unavailable.",
+                            type=int)
+    arg_parser.add_argument("--maxBatch",
+                            default=DEFAULT_MAX_BATCH,
+                            dest="max_batch",
+                            help="Most requests a worker processes together.",
+                            type=int)
+    arg_parser.add_argument("--batchWait",
+                            default=DEFAULT_BATCH_WAIT * 1000,
+                            dest="batch_wait",
+                            help="Milliseconds a batch waits for more requests to join it.",
+                            type=float)
+    arg_parser.add_argument("--maxBodySize",
+                            default=DEFAULT_MAX_BODY_SIZE // (1 << 20),
+                            dest="max_body_size",
+                            help="Megabytes of text a request may send. Larger requests, and texts longer than the "
+                                 "backend can process at once, get 413 Payload Too Large.",
+                            type=int)
+
+    return arg_parser
+
+
+async def _serve(server: ConcordanceServer, options: argparse.Namespace) -> None:
+    await server.start(host=options.host, port=options.port, socket_path=options.socket_path)
+    print(f"Serving concordances on {options.socket_path or f'http://{options.host}:{options.port}'}",
+          file=sys.stderr)
+    try:
+        await server.serve_forever()
+    finally:
+        await server.close()
+
+
+def main() -> int:
+    arg_parser: ArgumentParser = _build_argument_parser()
+    options: argparse.Namespace = arg_parser.parse_args()
+
+    if options.workers < 1:
+        arg_parser.error("--workers must be at least 1")
+    if options.max_queue < 1 or options.max_batch < 1:
+        arg_parser.error("--maxQueue and --maxBatch must be at least 1")
+    if options.max_models < 1:
+        arg_parser.error("--maxModels must be at least 1")
+    if options.models and options.backend != "spacy":
+        arg_parser.error("--models can only be used with the spacy backend")
+
+    backend: TokenizerBackend
+    if options.backend == "regex":
+        backend = RegexBackend()
+    else:
+        backend = SpacyBackend(pipeline_mode=PipelineMode(options.pipeline_mode), model_name=options.model)
+
+    server: ConcordanceServer = ConcordanceServer(backend=backend, workers=options.workers,
+                                                  max_queue=options.max_queue, max_batch=options.max_batch,
+                                                  batch_wait=options.batch_wait / 1000,
+                                                  max_body_size=options.max_body_size * (1 << 20),
+                                                  models=options.models, max_models=options.max_models)
+    try:
+        asyncio.run(_serve(server=server, options=options))
+    except KeyboardInterrupt:
+        pass
+
+    return 0
+
+
+if "__main__" == __name__:
+    exit(main())
@@ -1,23 +1,47 @@
 # /!usr/bin/env python3
 
 import argparse
+import contextlib
+import itertools
+import json
+import os
+import sys
+import time
 from argparse import ArgumentParser
-from typing import Optional, List
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
 from generate_concordance import ConcordanceUtils
-from generate_concordance.concordance_generator import ConcordanceGenerator
+from generate_concordance.concordance_cache import DEFAULT_CACHE_DIRECTORY, DEFAULT_CACHE_SIZE, ConcordanceCache
+from generate_concordance.concordance_empty import ConcordanceEmpty
+from generate_concordance.concordance_generator import DEFAULT_BATCH_SIZE, ConcordanceGenerator
+from generate_concordance.concordance_index import ConcordanceIndex, open_concordance_index, write_concordance_index
+from generate_concordance.concordance_merge import get_merged_longest_word, get_merged_sentence_count, \
+    iter_merged_concordance_lines, iter_merged_words
+from generate_concordance.kwic import DEFAULT_CONTEXT_SIZE, KwicSource, open_kwic_source
+from generate_concordance.language_processor import DEFAULT_MODEL, PipelineMode
+from generate_concordance.line_label import LineLabelScheme
+from generate_concordance.profiler import Profiler
+from generate_concordance.regex_backend import RegexBackend
+from generate_concordance.spacy_backend import SpacyBackend
+from generate_concordance.tokenizer_backend import TokenizerBackend
+from generate_concordance.word_filter import WordFilter
+from generate_concordance.word_info import WordInfo
 
 """Concordance Generator
 
-This script reads in a user provided .txt file containing sentences in English. Then -- depending on user provided
-options -- writes the generated concordance to a file or stdout.
+This script reads in user provided .txt files containing sentences in English. Then -- depending on user provided
+options -- writes the generated concordance to a file, stdout, or a concordance index. Words can then be looked up in
+the index without processing the text again. Several input files are either merged into a single concordance or
+each given their own concordance in an output directory. Concordance indexes built for consecutive parts of a text --
+EX: on different machines -- can be merged into the concordance of the whole text. Every appearance of chosen words can
+also be shown in context, sliced out of the input file.
 
 This script requires that you use Python version 3.8 and have spaCy installed, as well as the English pipeline for
-spaCy -- en_core_web_sm.
+spaCy -- en_core_web_sm -- or the pipeline for the text's language given with --model.
 """
 
 
-def main() -> int:
+def _build_argument_parser() -> ArgumentParser:
     arg_parser: ArgumentParser = ArgumentParser(
         description="Creates a concordance from a provided text file then writes the concordance to a user specified "
                     "location or stdout.")
@@ -25,10 +49,18 @@ def main() -> int:
     arg_parser.add_argument("-i",
                             "--inputFile",
                             default=None,
-                            dest="input_file",
-                            help="Location of a text file -- written in English -- used to generate a concordance.",
-                            required=True)
-    output_location_group = arg_parser.add_mutually_exclusive_group(required=True)
+                            dest="input_files",
+                            help="Location of text files -- written in English -- used to generate a concordance. "
+                                 "Glob patterns such as 'texts/*.txt' are expanded. Several files are merged into a "
+                                 "single concordance unless --outputDirectory is used.",
+                            nargs="+")
+    arg_parser.add_argument("--fileList",
+                            default=None,
+                            dest="file_list",
+                            help="Location of a file listing more input files, one per line. A line can name the "
+                                 "spaCy pipeline package for its file after a tab -- EX: buch.txt<TAB>de_core_news_sm "
+                                 "-- in place of --model.")
+    output_location_group = arg_parser.add_mutually_exclusive_group()
     output_location_group.add_argument("-o",
                                        "--outputFile",
                                        default=None,
@@ -40,25 +72,809 @@ def main() -> int:
                                        default=False,
                                        dest="use_stdout",
                                        help="Print the generated concordance to Stdout.")
+    output_location_group.add_argument("-b",
+                                       "--buildIndex",
+                                       default=None,
+                                       dest="build_index",
+                                       help="Location a concordance index will be written to. Words can be looked up "
+                                            "in the index with --query.")
+    output_location_group.add_argument("--outputDirectory",
+                                       default=None,
+                                       dest="output_directory",
+                                       help="Directory a separate concordance for each input file will be written to, "
+                                            "named after the input file -- EX: book.txt -> book.concordance.txt. "
+                                            "Input files in different directories are written to matching "
+                                            "subdirectories.")
+    arg_parser.add_argument("-q",
+                            "--query",
+                            default=None,
+                            dest="query",
+                            help="Words to look up in the concordance index given by --index. Prints each word's "
+                                 "frequency and the sentences it appeared in, without processing any text.",
+                            metavar="WORD",
+                            nargs="+")
+    arg_parser.add_argument("-k",
+                            "--kwic",
+                            default=None,
+                            dest="kwic_words",
+                            help="Words to show every appearance of with the text around it in the input file, "
+                                 "labeled with its sentence number, instead of writing the concordance. Printed to "
+                                 "stdout unless -o/--outputFile is given.",
+                            metavar="WORD",
+                            nargs="+")
+    arg_parser.add_argument("--contextSize",
+                            default=DEFAULT_CONTEXT_SIZE,
+                            dest="context_size",
+                            help="Most characters of context shown on each side of a word with --kwic. Context does "
+                                 "not reach past the word's sentence.",
+                            type=int)
+    arg_parser.add_argument("--index",
+                            default=None,
+                            dest="index_file",
+                            help="Location of a concordance index written by --buildIndex.")
+    arg_parser.add_argument("-m",
+                            "--merge",
+                            default=None,
+                            dest="merge_indexes",
+                            help="Concordance indexes, built with --buildIndex for consecutive parts of a text, to "
+                                 "merge into the concordance of the whole text instead of processing any text. "
+                                 "Sentences are numbered in the order the indexes are given. Written as the options "
+                                 "-o/--outputFile, -s/--stdout and -b/--buildIndex say.",
+                            metavar="INDEX",
+                            nargs="+")
+    arg_parser.add_argument("-a",
+                            "--append",
+                            action="store_true",
+                            default=False,
+                            dest="append",
+                            help="Add the input file to the end of the concordance saved in the index given by "
+                                 "--index, continuing its sentence numbering. Only the input file is processed. The "
+                                 "updated index is written back to --index, or to --buildIndex if given.")
+    arg_parser.add_argument("--backend",
+                            choices=["spacy", "regex"],
+                            default="spacy",
+                            dest="backend",
+                            help="How tokens and sentences are found. 'spacy' uses a spaCy pipeline, 'regex' uses "
+                                 "regular expressions, which is much faster and needs no model but finds sentence "
+                                 "boundaries less accurately.")
+    arg_parser.add_argument("-p",
+                            "--pipelineMode",
+                            choices=[mode.value for mode in PipelineMode],
+                            default=PipelineMode.ACCURATE.value,
+                            dest="pipeline_mode",
+                            help="How much of the spaCy pipeline to run when finding sentences with the spacy backend. "
+                                 "'accurate' runs the full pipeline, 'fast' only runs the statistical sentence "
+                                 "recognizer and 'rule-based' splits sentences on punctuation.")
+    arg_parser.add_argument("--model",
+                            default=DEFAULT_MODEL,
+                            dest="model",
+                            help=f"spaCy pipeline package used by the spacy backend, for text in languages other "
+                                 f"than English -- EX: de_core_news_sm. Defaults to {DEFAULT_MODEL}.")
+    arg_parser.add_argument("--stream",
+                            action="store_true",
+                            default=False,
+                            dest="stream",
+                            help="Read the input file in chunks instead of all at once, keeping memory use flat for "
+                                 "very large input files.")
+    arg_parser.add_argument("--chunkSize",
+                            default=ConcordanceUtils.DEFAULT_CHUNK_SIZE,
+                            dest="chunk_size",
+                            help="Number of characters read before a chunk is cut at the next paragraph break when "
+                                 "--stream is used.",
+                            type=int)
+    arg_parser.add_argument("-w",
+                            "--workers",
+                            default=1,
+                            dest="workers",
+                            help="Number of processes used to generate the concordance. With more than one, the input "
+                                 "file is split into chunks of --chunkSize characters that are processed in parallel.",
+                            type=int)
+    arg_parser.add_argument("--memoryLimit",
+                            default=None,
+                            dest="memory_limit",
+                            help="Megabytes the concordance may take up in memory. Past it, the concordance is "
+                                 "written to sorted runs in the temporary directory, which are merged when it is "
+                                 "written, so the size of the input is only limited by disk space. Combine with "
+                                 "--stream for input files larger than memory.",
+                            metavar="MB",
+                            type=int)
+    arg_parser.add_argument("--batchSize",
+                            default=DEFAULT_BATCH_SIZE,
+                            dest="batch_size",
+                            help="Number of input files processed together when there are several. Larger batches "
+                                 "are faster for short files but hold more of them in memory.",
+                            type=int)
+    arg_parser.add_argument("--processes",
+                            default=1,
+                            dest="processes",
+                            help="Number of processes the spaCy pipeline uses when there are several input files.",
+                            type=int)
+    arg_parser.add_argument("-l",
+                            "--labelScheme",
+                            choices=[label_scheme.value for label_scheme in LineLabelScheme],
+                            default=LineLabelScheme.REPEATED.value,
+                            dest="label_scheme",
+                            help="How lines of the concordance are labeled. 'repeated' (a. to z., then aa. to zz.) "
+                                 "grows with the vocabulary, 'alphabetic' (a. to z., then aa., ab., ...) and "
+                                 "'numeric' (1., 2., ...) stay short for large vocabularies.")
+    arg_parser.add_argument("--top",
+                            default=None,
+                            dest="top",
+                            help="Only write this many of the most frequent words, in alphabetical order. Ties go to "
+                                 "the alphabetically first word.",
+                            metavar="N",
+                            type=int)
+    arg_parser.add_argument("--minFreq",
+                            default=None,
+                            dest="min_frequency",
+                            help="Only write words appearing at least this many times.",
+                            type=int)
+    arg_parser.add_argument("--maxFreq",
+                            default=None,
+                            dest="max_frequency",
+                            help="Only write words appearing at most this many times.",
+                            type=int)
+    arg_parser.add_argument("--stopwords",
+                            default=None,
+                            dest="stopwords_file",
+                            help="Location of a file of words, separated by whitespace, left out of the concordance "
+                                 "and any index built from it.",
+                            metavar="FILE")
+    arg_parser.add_argument("--noCache",
+                            action="store_false",
+                            default=True,
+                            dest="use_cache",
+                            help="Always process the input file, instead of reusing the concordance cached the last "
+                                 "time the same text was processed with the same pipeline.")
+    arg_parser.add_argument("--cacheDirectory",
+                            default=DEFAULT_CACHE_DIRECTORY,
+                            dest="cache_directory",
+                            help=f"Directory cached concordances are stored in. Defaults to {DEFAULT_CACHE_DIRECTORY}.")
+    arg_parser.add_argument("--cacheSize",
+                            default=DEFAULT_CACHE_SIZE // (1 << 20),
+                            dest="cache_size",
+                            help="Megabytes the cache may take up before the least recently used concordances are "
+                                 "deleted.",
+                            type=int)
+    arg_parser.add_argument("--profile",
+                            action="store_true",
+                            default=False,
+                            dest="profile",
+                            help="Print how long each stage took, with token, sentence and unique word counts and "
+                                 "throughput, to stderr.")
+    arg_parser.add_argument("--metricsJson",
+                            default=None,
+                            dest="metrics_json",
+                            help="Location the same metrics as --profile will be written to as JSON.")
 
-    options: argparse.Namespace = arg_parser.parse_args()
+    return arg_parser
+
+
+def _query_index(options: argparse.Namespace) -> int:
+    """Looks up words in a concordance index and prints their frequency and the sentences they appeared in.
+
+    Parameters
+    ----------
+    options : argparse.Namespace
+        Parsed command line options.
+
+    Returns
+    -------
+    int
+        0 if the index could be read, otherwise 1.
+    """
+
+    concordance_index: Optional[ConcordanceIndex] = open_concordance_index(index_file=options.index_file)
+    if not concordance_index:
+        return 1
+
+    with concordance_index:
+        words: List[str] = [word.lower() for word in options.query]
+        word_column_length: int = max(len(word) for word in words)
+        for word in words:
+            word_info: Optional[WordInfo] = concordance_index.lookup(word)
+            if word_info:
+                print(f"{word:<{word_column_length}} {{{word_info.word_frequency}:{word_info.format_appearances()}}}")
+            else:
+                print(f"The word -- {word} -- does not appear in the concordance index.")
+
+    return 0
+
+
+def _write_concordance(options: argparse.Namespace, generator: ConcordanceGenerator, profiler: Profiler) -> int:
+    """Writes the generated concordance to the locations given on the command line.
+
+    Parameters
+    ----------
+    options : argparse.Namespace
+        Parsed command line options.
+    generator : ConcordanceGenerator
+        Generator holding the concordance.
+    profiler : Profiler
+        Records how long writing takes.
+
+    Returns
+    -------
+    int
+        0 if the concordance was written everywhere it was supposed to be, otherwise 1.
+    """
+
+    ret_val: int = 0
+    if options.build_index:
+        with profiler.stage("write_index"):
+            if not write_concordance_index(index_file=options.build_index,
+                                           words=generator.iter_words(),
+                                           longest_word=generator.get_longest_word(),
+                                           sentence_count=generator.get_sentence_count()):
+                ret_val = 1
+
+    if options.output_file or options.use_stdout:
+        # Lines are sorted and formatted as they are written.
+        with profiler.stage("write_concordance"):
+            label_scheme: LineLabelScheme = LineLabelScheme(options.label_scheme)
+            lines: Iterator[str] = generator.iter_concordance_lines(label_scheme=label_scheme)
+            if options.use_stdout:
+                ConcordanceUtils.print_lines(lines=lines)
+            elif not ConcordanceUtils.write_lines_to_file(output_file=options.output_file, lines=lines):
+                ret_val = 1
+
+    return ret_val
+
+
+def _check_word_filter_options(arg_parser: ArgumentParser, options: argparse.Namespace) -> Optional[WordFilter]:
+    """Builds the word filter asked for on the command line.
+
+    Parameters
+    ----------
+    arg_parser : ArgumentParser
+        Parser the options came from, used to report invalid combinations of options.
+    options : argparse.Namespace
+        Parsed command line options.
+
+    Returns
+    -------
+    Optional[WordFilter]
+        The word filter, or None if the stopwords file could not be read.
+    """
+
+    if options.top is not None and options.top < 1:
+        arg_parser.error("--top must be at least 1")
+    if options.min_frequency is not None and options.max_frequency is not None and \
+            options.min_frequency > options.max_frequency:
+        arg_parser.error("--minFreq cannot be greater than --maxFreq")
+
+    stopwords: Optional[Set[str]] = None
+    if options.stopwords_file:
+        stopwords = ConcordanceUtils.get_stopwords(stopwords_file=options.stopwords_file)
+        if stopwords is None:
+            return None
+
+    return WordFilter(stopwords=stopwords, min_frequency=options.min_frequency, max_frequency=options.max_frequency,
+                      top=options.top)
+
+
+def _merge_indexes(arg_parser: ArgumentParser, options: argparse.Namespace, profiler: Profiler) -> int:
+    """Merges the concordance indexes of consecutive parts of a text and writes the concordance of the whole text.
+
+    Parameters
+    ----------
+    arg_parser : ArgumentParser
+        Parser the options came from, used to report invalid combinations of options.
+    options : argparse.Namespace
+        Parsed command line options.
+    profiler : Profiler
+        Records how long writing takes.
+
+    Returns
+    -------
+    int
+        0 if the merged concordance was written everywhere it was supposed to be, otherwise 1.
+    """
+
+    if options.input_files or options.file_list or options.append or options.kwic_words or options.output_directory:
+        arg_parser.error("--merge cannot be used with -i/--inputFile, --fileList, --append, --kwic or "
+                         "--outputDirectory")
+    if not (options.output_file or options.use_stdout or options.build_index):
+        arg_parser.error("one of the arguments -o/--outputFile -s/--stdout -b/--buildIndex is required")
+    # Writing over an index while it is mapped would pull the words out from under the merge.
+    if options.build_index and os.path.realpath(options.build_index) in map(os.path.realpath, options.merge_indexes):
+        arg_parser.error("--buildIndex cannot be one of the indexes given to --merge")
+
+    word_filter: Optional[WordFilter] = _check_word_filter_options(arg_parser=arg_parser, options=options)
+    if word_filter is None:
+        return 1
+
+    with contextlib.ExitStack() as exit_stack:
+        indexes: List[ConcordanceIndex] = list()
+        for index_file in options.merge_indexes:
+            concordance_index: Optional[ConcordanceIndex] = open_concordance_index(index_file=index_file)
+            if not concordance_index:
+                return 1
+            indexes.append(exit_stack.enter_context(concordance_index))
+        profiler.add_count("documents", len(indexes))
+        profiler.add_count("sentences", get_merged_sentence_count(indexes=indexes))
+
+        ret_val: int = 0
+        if options.build_index:
+            with profiler.stage("write_index"):
+                longest_word: int = get_merged_longest_word(indexes=indexes, stopwords=word_filter.get_stopwords())
+                if not write_concordance_index(index_file=options.build_index,
+                                               words=iter_merged_words(indexes=indexes,
+                                                                       stopwords=word_filter.get_stopwords()),
+                                               longest_word=longest_word,
+                                               sentence_count=get_merged_sentence_count(indexes=indexes)):
+                    ret_val = 1
+
+        if options.output_file or options.use_stdout:
+            with profiler.stage("write_concordance"):
+                try:
+                    lines: Iterator[str] = iter_merged_concordance_lines(
+                        indexes=indexes, label_scheme=LineLabelScheme(options.label_scheme), word_filter=word_filter)
+                except ConcordanceEmpty:
+                    print("The provided index files do not contain any words.")
+                    return 1
+
+                if options.use_stdout:
+                    ConcordanceUtils.print_lines(lines=lines)
+                elif not ConcordanceUtils.write_lines_to_file(output_file=options.output_file, lines=lines):
+                    ret_val = 1
+
+    return ret_val
+
+
+def _write_kwic(options: argparse.Namespace, kwic_source: KwicSource, generator: ConcordanceGenerator,
+                profiler: Profiler) -> int:
+    """Generates the concordance of the input file with offsets, then writes every appearance of the words given with
+    --kwic in context.
+
+    Parameters
+    ----------
+    options : argparse.Namespace
+        Parsed command line options.
+    kwic_source : KwicSource
+        The memory-mapped input file.
+    generator : ConcordanceGenerator
+        Generator the concordance is generated with.
+    profiler : Profiler
+        Records how long each stage takes and counts what was processed.
+
+    Returns
+    -------
+    int
+        0 if the lines were written, otherwise 1.
+    """
+
+    # The text is only held while it is tokenized. Lines are sliced out of the mapped file.
+    input_text: str = kwic_source.get_text()
+    profiler.add_count("characters", len(input_text))
+    generator.generate_concordance_with_offsets(text=input_text)
+    del input_text
+    _add_concordance_counts(profiler=profiler, generator=generator)
+
+    def iter_lines() -> Iterator[str]:
+        for word in options.kwic_words:
+            word_lines: Iterator[str] = generator.iter_kwic_lines(word=word, kwic_source=kwic_source,
+                                                                  context_size=options.context_size)
+            appeared: bool = False
+            for line in word_lines:
+                appeared = True
+                yield line
+            if not appeared:
+                print(f"The word -- {word.lower()} -- does not appear in the input file.", file=sys.stderr)
+
+    with profiler.stage("write_kwic"):
+        if not options.output_file:
+            ConcordanceUtils.print_lines(lines=iter_lines())
+        elif not ConcordanceUtils.write_lines_to_file(output_file=options.output_file, lines=iter_lines()):
+            return 1
+
+    return 0
+
+
+def _add_concordance_counts(profiler: Profiler, generator: ConcordanceGenerator, previous_token_count: int = 0,
+                            previous_sentence_count: int = 0) -> None:
+    """Counts the tokens, sentences and unique words processed into a concordance.
+
+    Parameters
+    ----------
+    profiler : Profiler
+        Profiler to add the counts to. Nothing is counted if it is disabled.
+    generator : ConcordanceGenerator
+        Generator holding the concordance.
+    previous_token_count : int
+        Number of tokens in the concordance before this run added to it.
+    previous_sentence_count : int
+        Number of sentences in the concordance before this run added to it.
+    """
+
+    # Counting tokens goes through the whole vocabulary, so skip it unless it is wanted.
+    if profiler.is_enabled():
+        profiler.add_count("tokens", (generator.get_token_count() or 0) - previous_token_count)
+        profiler.add_count("sentences", (generator.get_sentence_count() or 0) - previous_sentence_count)
+        profiler.add_count("unique_words", generator.get_word_count() or 0)
+        if generator.get_run_count():
+            profiler.add_count("runs", generator.get_run_count())
+
+
+def _report_metrics(options: argparse.Namespace, profiler: Profiler) -> int:
+    """Prints and writes the metrics recorded by the profiler, as asked for on the command line.
 
-    ret_val: int = 1
+    Parameters
+    ----------
+    options : argparse.Namespace
+        Parsed command line options.
+    profiler : Profiler
+        Profiler holding the metrics.
+
+    Returns
+    -------
+    int
+        0 if the metrics were written, otherwise 1.
+    """
+
+    if options.profile:
+        # Printed to stderr, so the report never ends up in a concordance printed to stdout.
+        for line in profiler.format_report():
+            print(line, file=sys.stderr)
+
+    if options.metrics_json:
+        metrics: Dict[str, Any] = profiler.get_metrics()
+        try:
+            with open(options.metrics_json, "w") as file:
+                json.dump(metrics, file, indent=2)
+        except IOError:
+            print(f"The provided metrics file -- {options.metrics_json} -- could not be written.")
+            return 1
+
+    return 0
+
+
+def _report_throughput(document_count: int, token_count: int, elapsed_seconds: float) -> None:
+    """Tells the user how quickly a batch of input files was processed.
+
+    Printed to stderr, so the report never ends up in a concordance printed to stdout.
+
+    Parameters
+    ----------
+    document_count : int
+        Number of input files processed.
+    token_count : int
+        Number of words found in the input files.
+    elapsed_seconds : float
+        Time taken to process the input files.
+    """
+
+    elapsed_seconds = max(elapsed_seconds, sys.float_info.min)
+    print(f"Processed {document_count} documents and {token_count} tokens in {elapsed_seconds:.2f} seconds: "
+          f"{document_count / elapsed_seconds:.1f} documents/sec, {token_count / elapsed_seconds:.0f} tokens/sec.",
+          file=sys.stderr)
+
+
+def _iter_backend_groups(input_texts: Iterable[str], input_backends: List[TokenizerBackend]) \
+        -> Iterator[Tuple[TokenizerBackend, Iterator[str]]]:
+    """Groups consecutive input files processed with the same backend, so each group is streamed through its backend
+    together.
+
+    Parameters
+    ----------
+    input_texts : Iterable[str]
+        Text of each input file. Consumed lazily.
+    input_backends : List[TokenizerBackend]
+        Backend of each input file, in the order of input_texts. Files with the same model share a backend.
+
+    Returns
+    -------
+    Iterator[Tuple[TokenizerBackend, Iterator[str]]]
+        Each backend with the texts of the consecutive input files processed with it. The texts of a group must be
+        consumed before the next group is.
+    """
+
+    for backend, group in itertools.groupby(zip(input_texts, input_backends),
+                                            key=lambda text_and_backend: text_and_backend[1]):
+        yield backend, (input_text for input_text, _ in group)
+
+
+def _write_concordance_per_file(options: argparse.Namespace, input_files: List[str], input_texts: Iterable[str],
+                                input_backends: List[TokenizerBackend], unreadable_files: Set[str],
+                                generator: ConcordanceGenerator, profiler: Profiler) -> int:
+    """Generates a separate concordance for each input file and writes it to the output directory.
+
+    Parameters
+    ----------
+    options : argparse.Namespace
+        Parsed command line options.
+    input_files : List[str]
+        Every input file, in the order of input_texts.
+    input_texts : Iterable[str]
+        Text of each input file. Files that could not be read have empty text.
+    input_backends : List[TokenizerBackend]
+        Backend used to process each input file, in the order of input_files.
+    unreadable_files : Set[str]
+        Input files that could not be read. Filled in as input_texts is consumed.
+    generator : ConcordanceGenerator
+        Generator used to process the input files.
+    profiler : Profiler
+        Records how long writing takes and counts what was processed.
+
+    Returns
+    -------
+    int
+        0 if every concordance was written, otherwise 1.
+    """
+
+    output_files: Optional[List[str]] = ConcordanceUtils.get_output_file_paths(
+        input_files=input_files, output_directory=options.output_directory)
+    if output_files is None:
+        return 1
+
+    try:
+        for output_directory in sorted(set(os.path.dirname(output_file) for output_file in output_files)):
+            os.makedirs(output_directory, exist_ok=True)
+    except OSError:
+        print(f"The provided output directory -- {options.output_directory} -- could not be created.")
+        return 1
+
+    ret_val: int = 0
+    token_count: int = 0
+    start_time: float = time.perf_counter()
+    label_scheme: LineLabelScheme = LineLabelScheme(options.label_scheme)
+
+    def iter_concordances() -> Iterator[ConcordanceGenerator]:
+        for backend, backend_texts in _iter_backend_groups(input_texts=input_texts, input_backends=input_backends):
+            generator.set_backend(backend)
+            yield from generator.iter_concordances(texts=backend_texts, batch_size=options.batch_size,
+                                                   processes=options.processes)
+
+    concordances: Iterator[ConcordanceGenerator] = iter_concordances()
+    for input_file, output_file, file_generator in zip(input_files, output_files, concordances):
+        if input_file in unreadable_files:
+            ret_val = 1
+            continue
+
+        token_count += file_generator.get_token_count()
+        _add_concordance_counts(profiler=profiler, generator=file_generator)
+        try:
+            lines: Iterator[str] = file_generator.iter_concordance_lines(label_scheme=label_scheme)
+        except ConcordanceEmpty:
+            print(f"The provided input file -- {input_file} -- does not contain any words.")
+            ret_val = 1
+            continue
+
+        with profiler.stage("write_concordance"):
+            if not ConcordanceUtils.write_lines_to_file(output_file=output_file, lines=lines):
+                ret_val = 1
+
+    _report_throughput(document_count=len(input_files) - len(unreadable_files), token_count=token_count,
+                       elapsed_seconds=time.perf_counter() - start_time)
+
+    return ret_val
+
+
+def _generate_batch(options: argparse.Namespace, input_files: List[str], input_backends: List[TokenizerBackend],
+                    generator: ConcordanceGenerator, profiler: Profiler) -> int:
+    """Generates concordances for several input files, streaming them all through the backend together.
+
+    Parameters
+    ----------
+    options : argparse.Namespace
+        Parsed command line options.
+    input_files : List[str]
+        Every input file.
+    input_backends : List[TokenizerBackend]
+        Backend used to process each input file, in the order of input_files.
+    generator : ConcordanceGenerator
+        Generator the merged concordance is added to, or used to generate the concordance of each file.
+    profiler : Profiler
+        Records how long each stage takes and counts what was processed.
+
+    Returns
+    -------
+    int
+        0 if every input file was read and every concordance was written, otherwise 1.
+    """
+
+    unreadable_files: Set[str] = set()
+
+    def read_input_file(input_file: str) -> str:
+        input_text: Optional[str] = ConcordanceUtils.get_input_file_text(input_file)
+        if input_text is None:
+            unreadable_files.add(input_file)
+            return ""
+        return input_text
+
+    input_texts: Iterable[str] = profiler.iter_counted("characters", (read_input_file(input_file)
+                                                                      for input_file in input_files))
+
+    if options.output_directory:
+        ret_val: int = _write_concordance_per_file(options=options, input_files=input_files, input_texts=input_texts,
+                                                   input_backends=input_backends, unreadable_files=unreadable_files,
+                                                   generator=generator, profiler=profiler)
+        profiler.add_count("documents", len(input_files) - len(unreadable_files))
+        return ret_val
+
+    start_time: float = time.perf_counter()
+    previous_token_count: int = generator.get_token_count() or 0
+    previous_sentence_count: int = generator.get_sentence_count() or 0
+    for backend, backend_texts in _iter_backend_groups(input_texts=input_texts, input_backends=input_backends):
+        generator.set_backend(backend)
+        generator.update_from_chunks(chunks=backend_texts, batch_size=options.batch_size, processes=options.processes)
+    _report_throughput(document_count=len(input_files) - len(unreadable_files),
+                       token_count=generator.get_token_count() - previous_token_count,
+                       elapsed_seconds=time.perf_counter() - start_time)
+    profiler.add_count("documents", len(input_files) - len(unreadable_files))
+    _add_concordance_counts(profiler=profiler, generator=generator, previous_token_count=previous_token_count,
+                            previous_sentence_count=previous_sentence_count)
+
+    # Leave out the whole concordance rather than write one silently missing some of the input files.
+    if unreadable_files:
+        return 1
+
+    return _write_concordance(options=options, generator=generator, profiler=profiler)
+
+
+def _generate(arg_parser: ArgumentParser, options: argparse.Namespace, profiler: Profiler) -> int:
+    """Generates the concordance asked for on the command line and writes it.
+
+    Parameters
+    ----------
+    arg_parser : ArgumentParser
+        Parser the options came from, used to report invalid combinations of options.
+    options : argparse.Namespace
+        Parsed command line options.
+    profiler : Profiler
+        Records how long each stage takes and counts what was processed.
+
+    Returns
+    -------
+    int
+        0 if the concordance was generated and written, otherwise 1.
+    """
+
+    if not (options.input_files or options.file_list):
+        arg_parser.error("one of the arguments -i/--inputFile --fileList is required")
+    if options.append and not options.index_file:
+        arg_parser.error("--append requires --index")
+    if options.append and options.output_directory:
+        arg_parser.error("--append cannot be used with --outputDirectory")
+    if options.kwic_words and (options.append or options.build_index or options.output_directory or options.stream or
+                               options.workers > 1):
+        arg_parser.error("--kwic cannot be used with --append, --buildIndex, --outputDirectory, --stream or --workers")
+    if options.memory_limit is not None and options.memory_limit < 1:
+        arg_parser.error("--memoryLimit must be at least 1")
+    if options.kwic_words and options.context_size < 0:
+        arg_parser.error("--contextSize cannot be negative")
+    if not (options.output_file or options.use_stdout or options.build_index or options.output_directory or
+            options.append or options.kwic_words):
+        arg_parser.error("one of the arguments -o/--outputFile -s/--stdout -b/--buildIndex --outputDirectory is "
+                         "required")
+
+    input_file_models: Optional[List[Tuple[str, Optional[str]]]] = ConcordanceUtils.get_input_file_models(
+        input_files=options.input_files or [], file_list=options.file_list)
+    if not input_file_models:
+        return 1
+    input_files: List[str] = [input_file for input_file, _ in input_file_models]
+    batch: bool = len(input_files) > 1 or bool(options.output_directory)
+    if batch and (options.stream or options.workers > 1):
+        arg_parser.error("--stream and --workers can only be used with a single input file")
+    if batch and options.kwic_words:
+        arg_parser.error("--kwic can only be used with a single input file")
+    word_filter: Optional[WordFilter] = _check_word_filter_options(arg_parser=arg_parser, options=options)
+    if word_filter is None:
+        return 1
 
     # To capture which file could not be accessed as needed, let the get_input_file_text() and write_lines_to_file()
     #   functions try and access the input/output files and report exactly what was wrong with them to the user.
-    input_text: Optional[str] = ConcordanceUtils.get_input_file_text(options.input_file)
-    if input_text:
-        generator = ConcordanceGenerator()
-        generator.generate_concordance(text=input_text)
-
-        lines: List[str] = generator.get_concordance_lines()
-        if options.use_stdout:
-            ConcordanceUtils.print_lines(lines=lines)
-            ret_val = 0
-        else:
-            if ConcordanceUtils.write_lines_to_file(output_file=options.output_file, lines=lines):
-                ret_val = 0
+    input_chunks: Optional[Iterator[str]] = None
+    input_text: Optional[str] = None
+    kwic_source: Optional[KwicSource] = None
+    if options.kwic_words:
+        # Mapped rather than read, so lines can be sliced out of it once the concordance is generated.
+        with profiler.stage("read_input"):
+            kwic_source = open_kwic_source(input_file=input_files[0])
+        if not kwic_source:
+            return 1
+        profiler.add_count("documents", 1)
+    elif options.stream or options.workers > 1:
+        input_chunks = ConcordanceUtils.get_input_file_chunks(input_files[0], chunk_size=options.chunk_size)
+        if not input_chunks:
+            return 1
+
+        # Chunks are read as they are processed, so reading is part of parsing.
+        input_chunks = profiler.iter_counted("characters", input_chunks)
+        profiler.add_count("documents", 1)
+    elif not batch:
+        # With several input files, each is read as it is processed. See _generate_batch().
+        with profiler.stage("read_input"):
+            input_text = ConcordanceUtils.get_input_file_text(input_files[0])
+        if not input_text:
+            return 1
+        profiler.add_count("documents", 1)
+        profiler.add_count("characters", len(input_text))
+
+    cache: Optional[ConcordanceCache] = None
+    if options.use_cache:
+        cache = ConcordanceCache(cache_directory=options.cache_directory, max_size=options.cache_size * (1 << 20))
+
+    # Files the file list names a model for are processed with it, the rest with --model. The regex backend needs no
+    #   model, so every file shares it.
+    model_backends: Dict[str, TokenizerBackend] = dict()
+    input_backends: List[TokenizerBackend] = list()
+    for _, model_name in input_file_models:
+        model_name = options.model if options.backend == "regex" else model_name or options.model
+        if model_name not in model_backends:
+            model_backends[model_name] = RegexBackend() if options.backend == "regex" else \
+                SpacyBackend(pipeline_mode=PipelineMode(options.pipeline_mode), model_name=model_name)
+        input_backends.append(model_backends[model_name])
+
+    # Every model is loaded up front, so a missing one is reported before any file is processed. A text that may be
+    #   cached only has its model looked up, so a cached text never waits for the model to load.
+    with profiler.stage("model_load"):
+        for model_name, model_backend in model_backends.items():
+            try:
+                if cache is not None and input_text is not None:
+                    model_backend.get_description()
+                else:
+                    model_backend.load()
+            except OSError:
+                print(f"The spaCy model -- {model_name} -- is not installed. Install it with: python3 -m spacy "
+                      f"download {model_name}")
+                return 1
+    backend: TokenizerBackend = input_backends[0]
+
+    memory_limit: Optional[int] = options.memory_limit * (1 << 20) if options.memory_limit is not None else None
+    generator: ConcordanceGenerator = ConcordanceGenerator(cache=cache, backend=backend, profiler=profiler,
+                                                           word_filter=word_filter, memory_limit=memory_limit)
+    if kwic_source:
+        with kwic_source:
+            return _write_kwic(options=options, kwic_source=kwic_source, generator=generator, profiler=profiler)
+
+    if options.append:
+        concordance_index: Optional[ConcordanceIndex] = open_concordance_index(index_file=options.index_file)
+        if not concordance_index:
+            return 1
+
+        with profiler.stage("restore_index"), concordance_index:
+            generator.restore(words=concordance_index.iter_words(),
+                              longest_word=concordance_index.get_longest_word(),
+                              sentence_count=concordance_index.get_sentence_count())
+
+        # Write the updated index back over the one it was read from.
+        if not options.build_index:
+            options.build_index = options.index_file
+
+    if batch:
+        return _generate_batch(options=options, input_files=input_files, input_backends=input_backends,
+                               generator=generator, profiler=profiler)
+
+    previous_token_count: int = generator.get_token_count() or 0
+    previous_sentence_count: int = generator.get_sentence_count() or 0
+    if input_chunks:
+        generator.update_from_chunks(chunks=input_chunks, workers=options.workers)
+    else:
+        generator.update(text=input_text)
+    _add_concordance_counts(profiler=profiler, generator=generator, previous_token_count=previous_token_count,
+                            previous_sentence_count=previous_sentence_count)
+
+    return _write_concordance(options=options, generator=generator, profiler=profiler)
+
+
+def main() -> int:
+    arg_parser: ArgumentParser = _build_argument_parser()
+    options: argparse.Namespace = arg_parser.parse_args()
+
+    if options.query:
+        if not options.index_file:
+            arg_parser.error("--query requires --index")
+        return _query_index(options=options)
+
+    profiler: Profiler = Profiler(enabled=options.profile or bool(options.metrics_json))
+    ret_val: int
+    if options.merge_indexes:
+        ret_val = _merge_indexes(arg_parser=arg_parser, options=options, profiler=profiler)
+    else:
+        ret_val = _generate(arg_parser=arg_parser, options=options, profiler=profiler)
+    if profiler.is_enabled() and _report_metrics(options=options, profiler=profiler):
+        ret_val = 1
 
     return ret_val
 
@@ -0,0 +1,179 @@
+import errno
+import mmap
+import re
+from typing import Iterable, Iterator, Optional
+
+from generate_concordance.tokenizer_backend import OffsetToken
+
+DEFAULT_CONTEXT_SIZE: int = 40
+
+# UTF-8 takes at most 4 bytes a character, so this many bytes per character always hold enough context.
+MAX_CHARACTER_BYTES: int = 4
+
+WHITESPACE_PATTERN: re.Pattern = re.compile(r"\s+")
+
+
+def iter_byte_offset_tokens(text: str, tokens: Iterable[OffsetToken]) -> Iterator[OffsetToken]:
+    """Turns the character offsets of tokens into byte offsets into the UTF-8 encoding of their text.
+
+    Parameters
+    ----------
+    text : str
+        Text the tokens were found in. Bytes that were not valid UTF-8 are expected to have been decoded with
+        surrogateescape, so encoding text again gives back the original bytes.
+    tokens : Iterable[OffsetToken]
+        Tokens in the order they appear in text.
+
+    Returns
+    -------
+    Iterator[OffsetToken]
+        The same tokens, with byte offsets instead of character offsets.
+    """
+
+    # Every ASCII character is one byte.
+    if text.isascii():
+        yield from tokens
+        return
+
+    # Tokens are in order, so only the text between one offset and the next is encoded.
+    character_offset: int = 0
+    byte_offset: int = 0
+    for sentence_number, token, start, end in tokens:
+        byte_offset += len(text[character_offset:start].encode("utf-8", "surrogateescape"))
+        start_byte: int = byte_offset
+        byte_offset += len(text[start:end].encode("utf-8", "surrogateescape"))
+        character_offset = end
+
+        yield sentence_number, token, start_byte, byte_offset
+
+
+class KwicSource:
+    """
+    A text file memory-mapped so keyword-in-context lines can be sliced straight out of it, without holding the text
+    in memory.
+
+    Attributes
+    ----------
+    __file : BinaryIO
+        The open text file.
+    __source : mmap.mmap
+        The memory-mapped text.
+
+    Methods
+    -------
+    get_text()
+        Decodes the whole text, to generate its concordance.
+    get_context(start: int, end: int, sentence_start: int, sentence_end: int, context_size: int)
+        Gets an appearance of a word with the text around it in its sentence.
+    close()
+        Unmaps and closes the text file.
+    """
+
+    def __init__(self, input_file: str):
+        """
+        Parameters
+        ----------
+        input_file : str
+            Text file to map.
+
+        Raises
+        ------
+        IOError
+            If the file can't be read.
+        ValueError
+            If the file is empty.
+        """
+
+        self.__file = open(input_file, "rb")
+        try:
+            self.__source: mmap.mmap = mmap.mmap(self.__file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (IOError, ValueError):
+            self.__file.close()
+            raise
+
+    def get_text(self) -> str:
+        """Decodes the whole text, to generate its concordance.
+
+        Unlike reading the file as text, line endings are kept as they are, so offsets into the returned text line up
+        with the file.
+
+        Returns
+        -------
+        str
+            The text. Bytes that are not valid UTF-8 are decoded with surrogateescape.
+        """
+        return str(self.__source, "utf-8", "surrogateescape")
+
+    def __decode(self, start: int, end: int) -> str:
+        # A context window can start or end part way through a character, so partial characters are left out.
+        return WHITESPACE_PATTERN.sub(" ", self.__source[start:end].decode("utf-8", "ignore"))
+
+    def get_context(self, start: int, end: int, sentence_start: int, sentence_end: int,
+                    context_size: int = DEFAULT_CONTEXT_SIZE) -> str:
+        """Gets an appearance of a word with the text around it in its sentence.
+
+        Parameters
+        ----------
+        start : int
+            Byte offset of the start of the appearance.
+        end : int
+            Byte offset just past the end of the appearance.
+        sentence_start : int
+            Byte offset of the start of the appearance's sentence. Context does not reach before it.
+        sentence_end : int
+            Byte offset just past the end of the appearance's sentence. Context does not reach past it.
+        context_size : int
+            Most characters of context on each side of the appearance.
+
+        Returns
+        -------
+        str
+            The appearance as written in the text, with the context before it right aligned to context_size
+            characters so appearances line up. Runs of whitespace are shown as single spaces.
+        """
+
+        left_context: str = self.__decode(max(sentence_start, start - context_size * MAX_CHARACTER_BYTES), start)
+        right_context: str = self.__decode(end, min(sentence_end, end + context_size * MAX_CHARACTER_BYTES))
+        left_context = left_context[-context_size:] if context_size else ""
+
+        return f"{left_context:>{context_size}}{self.__decode(start, end)}{right_context[:context_size]}"
+
+    def close(self) -> None:
+        self.__source.close()
+        self.__file.close()
+
+    def __enter__(self) -> "KwicSource":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+
+def open_kwic_source(input_file: str) -> Optional[KwicSource]:
+    """Memory-maps a text file for keyword-in-context lines, reporting to the user why it could not be mapped.
+
+    Parameters
+    ----------
+    input_file : str
+        Text file to map.
+
+    Returns
+    -------
+    Optional[KwicSource]
+        The mapped text file if it could be mapped, otherwise None is returned.
+    """
+
+    kwic_source: Optional[KwicSource] = None
+    try:
+        kwic_source = KwicSource(input_file=input_file)
+    except IOError as io_error:
+        if errno.ENOENT == io_error.errno:
+            print(f"The provided input file -- {input_file} -- does not exist.")
+        elif errno.EACCES == io_error.errno:
+            print(f"The provided input file -- {input_file} -- cannot be read.")
+        else:
+            print(f"An unknown IO error occurred while attempting to read the provided input file -- {input_file}.")
+    except ValueError:
+        print(f"The provided input file -- {input_file} -- does not contain any words.")
+
+    return kwic_source
@@ -0,0 +1,311 @@
+import importlib.metadata
+import json
+import os
+import threading
+from collections import OrderedDict
+from enum import Enum
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+# spaCy takes most of a second to import, so it is only imported once a pipeline is loaded. That keeps --help, option
+#   errors and missing input files fast.
+if TYPE_CHECKING:
+    import spacy
+
+DEFAULT_MODEL: str = "en_core_web_sm"
+
+# Pipelines kept loaded in a process. Each small pipeline takes tens of megabytes.
+DEFAULT_MAX_MODELS: int = 3
+
+# Components of the English pipelines that play no part in finding tokens or sentence boundaries.
+UNUSED_COMPONENTS: List[str] = ["tagger", "parser", "attribute_ruler", "lemmatizer", "ner"]
+
+
+class PipelineMode(Enum):
+    """
+    How much of the spaCy pipeline to run when finding sentences, trading accuracy for speed.
+
+    ACCURATE
+        The full pipeline. Sentence boundaries come from the dependency parser.
+    FAST
+        Only the tokenizer and the statistical sentence recognizer -- senter -- are run.
+    RULE_BASED
+        Only the tokenizer and the punctuation based sentencizer are run. No statistical model is used.
+    """
+
+    ACCURATE = "accurate"
+    FAST = "fast"
+    RULE_BASED = "rule-based"
+
+
+def get_excluded_components(pipeline_mode: PipelineMode) -> List[str]:
+    """Gets the components of a pipeline left out when it is loaded for a pipeline mode.
+
+    Parameters
+    ----------
+    pipeline_mode : PipelineMode
+        Which components of the pipeline should be run.
+
+    Returns
+    -------
+    List[str]
+        Components that are not loaded.
+    """
+
+    if PipelineMode.ACCURATE == pipeline_mode:
+        return list()
+    if PipelineMode.FAST == pipeline_mode:
+        return list(UNUSED_COMPONENTS)
+
+    return UNUSED_COMPONENTS + ["tok2vec", "senter"]
+
+
+def get_model_version(model_name: str) -> str:
+    """Gets the version of a spaCy pipeline package without loading it or importing spaCy.
+
+    Parameters
+    ----------
+    model_name : str
+        Name of the spaCy pipeline package, or the directory of a pipeline saved to disk.
+
+    Returns
+    -------
+    str
+        Version of the pipeline.
+
+    Raises
+    ------
+    OSError
+        If the spaCy pipeline package is not installed.
+    """
+
+    meta_file: str = os.path.join(model_name, "meta.json")
+    if os.path.isfile(meta_file):
+        with open(meta_file, encoding="utf-8") as file:
+            return str(json.load(file).get("version"))
+
+    try:
+        return importlib.metadata.version(model_name)
+    except (importlib.metadata.PackageNotFoundError, ValueError):
+        raise OSError(f"The spaCy pipeline package -- {model_name} -- is not installed.")
+
+
+def _load_language_processor(model_name: str, pipeline_mode: PipelineMode) -> "spacy.Language":
+    """Loads a spaCy pipeline trimmed down to what the pipeline mode requires.
+
+    Parameters
+    ----------
+    model_name : str
+        Name of the spaCy pipeline package to load.
+    pipeline_mode : PipelineMode
+        Which components of the pipeline should be run.
+
+    Returns
+    -------
+    spacy.Language
+        The loaded pipeline.
+    """
+
+    import spacy
+
+    if PipelineMode.ACCURATE == pipeline_mode:
+        return spacy.load(model_name)
+
+    if PipelineMode.FAST == pipeline_mode:
+        language_processor: "spacy.Language" = spacy.load(model_name, exclude=get_excluded_components(pipeline_mode))
+        if "senter" in language_processor.component_names:
+            language_processor.enable_pipe("senter")
+
+            # The senter of the small English pipeline has its own embedding layer, so the shared tok2vec only costs
+            #   time unless the senter listens to it.
+            if "tok2vec" in language_processor.pipe_names and \
+                    "senter" not in language_processor.get_pipe("tok2vec").listening_components:
+                language_processor.disable_pipe("tok2vec")
+        else:
+            language_processor.add_pipe("sentencizer")
+
+        return language_processor
+
+    language_processor = spacy.load(model_name, exclude=get_excluded_components(pipeline_mode))
+    language_processor.add_pipe("sentencizer")
+
+    return language_processor
+
+
+class LanguageProcessorPool:
+    """
+    Loaded spaCy pipelines, keyed by model and pipeline mode, so texts in several languages can reuse pipelines that
+    are already loaded without keeping every pipeline in memory. Once more than max_models pipelines are loaded, the
+    least recently used one is dropped.
+
+    Attributes
+    ----------
+    __max_models : int
+        Most pipelines kept loaded.
+    __language_processors : OrderedDict[Tuple[str, PipelineMode], spacy.Language]
+        The loaded pipelines, least recently used first.
+    __lock : threading.Lock
+        Guards the pipelines, the loading locks and the counters. Never held while a pipeline loads, so loading one
+        pipeline doesn't hold up getting the others.
+    __loading_locks : Dict[Tuple[str, PipelineMode], threading.Lock]
+        A lock for each pipeline being loaded, held while it loads so it isn't loaded twice at once.
+    __hits : int
+        Number of requests for a pipeline that was already loaded.
+    __misses : int
+        Number of requests that had to load a pipeline.
+    __evictions : int
+        Number of pipelines dropped to make room for another.
+
+    Methods
+    -------
+    get(model_name: str, pipeline_mode: PipelineMode)
+        Gets a pipeline, loading it if it isn't loaded.
+    set_max_models(max_models: int)
+        Changes the most pipelines kept loaded.
+    get_stats()
+        Gets the hit, miss and eviction counters and the number of pipelines loaded.
+    """
+
+    def __init__(self, max_models: int = DEFAULT_MAX_MODELS):
+        """
+        Parameters
+        ----------
+        max_models : int
+            Most pipelines kept loaded. Must be at least 1.
+        """
+
+        self.__max_models: int = max_models
+        self.__language_processors: "OrderedDict[Tuple[str, PipelineMode], spacy.Language]" = OrderedDict()
+        self.__lock: threading.Lock = threading.Lock()
+        self.__loading_locks: Dict[Tuple[str, PipelineMode], threading.Lock] = dict()
+        self.__hits: int = 0
+        self.__misses: int = 0
+        self.__evictions: int = 0
+
+    def __evict(self) -> None:
+        # Backends don't hold on to pipelines, so a dropped pipeline is freed once the texts using it are processed.
+        while len(self.__language_processors) > self.__max_models:
+            self.__language_processors.popitem(last=False)
+            self.__evictions += 1
+
+    def __get_loaded(self, key: Tuple[str, PipelineMode]) -> Optional["spacy.Language"]:
+        # Must be called holding the lock.
+        language_processor: Optional["spacy.Language"] = self.__language_processors.get(key)
+        if language_processor is not None:
+            self.__hits += 1
+            self.__language_processors.move_to_end(key)
+
+        return language_processor
+
+    def get(self, model_name: str = DEFAULT_MODEL,
+            pipeline_mode: PipelineMode = PipelineMode.ACCURATE) -> "spacy.Language":
+        """Gets a pipeline, loading it if it isn't loaded.
+
+        Parameters
+        ----------
+        model_name : str
+            Name of the spaCy pipeline package.
+        pipeline_mode : PipelineMode
+            Which components of the pipeline should be run.
+
+        Returns
+        -------
+        spacy.Language
+            The pipeline, shared with everything else getting the same model and pipeline mode from the pool.
+
+        Raises
+        ------
+        OSError
+            If the spaCy pipeline package is not installed.
+        """
+
+        key: Tuple[str, PipelineMode] = (model_name, pipeline_mode)
+        with self.__lock:
+            language_processor: Optional["spacy.Language"] = self.__get_loaded(key)
+            if language_processor is not None:
+                return language_processor
+            loading_lock: threading.Lock = self.__loading_locks.setdefault(key, threading.Lock())
+
+        with loading_lock:
+            # Another thread may have loaded the pipeline while this one waited for it.
+            with self.__lock:
+                language_processor = self.__get_loaded(key)
+                if language_processor is not None:
+                    return language_processor
+                self.__misses += 1
+
+            try:
+                language_processor = _load_language_processor(model_name=model_name, pipeline_mode=pipeline_mode)
+                with self.__lock:
+                    self.__language_processors[key] = language_processor
+                    self.__evict()
+            finally:
+                with self.__lock:
+                    if self.__loading_locks.get(key) is loading_lock:
+                        del self.__loading_locks[key]
+
+            return language_processor
+
+    def set_max_models(self, max_models: int) -> None:
+        """Changes the most pipelines kept loaded, dropping the least recently used pipelines past it.
+
+        Parameters
+        ----------
+        max_models : int
+            Most pipelines kept loaded. Must be at least 1.
+        """
+
+        with self.__lock:
+            self.__max_models = max_models
+            self.__evict()
+
+    def get_stats(self) -> Dict[str, int]:
+        """Gets the hit, miss and eviction counters and the number of pipelines loaded.
+
+        Returns
+        -------
+        Dict[str, int]
+            hits, misses, evictions and loaded.
+        """
+
+        with self.__lock:
+            return dict({"hits": self.__hits,
+                         "misses": self.__misses,
+                         "evictions": self.__evictions,
+                         "loaded": len(self.__language_processors)})
+
+
+_language_processor_pool: LanguageProcessorPool = LanguageProcessorPool()
+
+
+def get_language_processor_pool() -> LanguageProcessorPool:
+    """Gets the pool of pipelines shared by everything in the process.
+
+    Returns
+    -------
+    LanguageProcessorPool
+        The process-wide pool.
+    """
+    return _language_processor_pool
+
+
+def get_language_processor(pipeline_mode: PipelineMode = PipelineMode.ACCURATE,
+                           model_name: str = DEFAULT_MODEL) -> "spacy.Language":
+    """Gets a process-wide spaCy pipeline from the pool, loading it if it isn't loaded.
+
+    Loading a pipeline is far more expensive than running it over a short text, so every ConcordanceGenerator in a
+    process shares the same pipeline for a given model and pipeline mode while it stays in the pool. See
+    LanguageProcessorPool.
+
+    Parameters
+    ----------
+    pipeline_mode : PipelineMode
+        Which components of the pipeline should be run.
+    model_name : str
+        Name of the spaCy pipeline package to load.
+
+    Returns
+    -------
+    spacy.Language
+        The shared pipeline.
+    """
+    return _language_processor_pool.get(model_name=model_name, pipeline_mode=pipeline_mode)
@@ -0,0 +1,154 @@
+import itertools
+import math
+import string
+from enum import Enum
+from typing import Iterator
+
+from generate_concordance.word_info import WordInfo
+
+ASCII_TABLE_OFFSET: int = ord('a')
+CHARS_IN_ALPHABET: int = 26
+
+
+class LineLabelScheme(Enum):
+    """
+    How the lines of a concordance are labeled.
+
+    REPEATED
+        One letter repeated once more every 26 lines -- a. to z., then aa. to zz., then aaa. -- padded to
+        ceil(lines / 26) characters. The label column grows linearly with the vocabulary, so the output grows with its
+        square.
+    ALPHABETIC
+        Bijective base 26 -- a. to z., then aa., ab., ... zz., then aaa. -- padded to the longest label. The label
+        column grows with the logarithm of the vocabulary.
+    NUMERIC
+        Line numbers -- 1., 2., 3. -- padded to the longest label.
+    """
+
+    REPEATED = "repeated"
+    ALPHABETIC = "alphabetic"
+    NUMERIC = "numeric"
+
+
+def _iter_repeated_labels(label_count: int) -> Iterator[str]:
+    """Iterates through labels of the REPEATED scheme -- EX: bbbbb. -- each padded to the same length.
+
+    Parameters
+    ----------
+    label_count : int
+        Number of labels to generate.
+
+    Returns
+    -------
+    Iterator[str]
+        Padded labels.
+    """
+
+    label_column_length: int = math.ceil(label_count / CHARS_IN_ALPHABET)
+    for label_number in range(label_count):
+        label_length: int = (label_number // CHARS_IN_ALPHABET) + 1
+        letter: str = chr(ASCII_TABLE_OFFSET + label_number % CHARS_IN_ALPHABET)
+
+        # Pad the label to keep a consistent label column length when left aligning the word in the concordance line
+        yield f"{letter * label_length}.{' ' * (label_column_length - label_length)}"
+
+
+def _iter_alphabetic_labels(label_count: int) -> Iterator[str]:
+    """Iterates through labels of the ALPHABETIC scheme -- EX: ab. -- each padded to the same length.
+
+    Parameters
+    ----------
+    label_count : int
+        Number of labels to generate.
+
+    Returns
+    -------
+    Iterator[str]
+        Padded labels.
+    """
+
+    # Find the shortest label length that leaves room for every label: 26 one letter labels, 26^2 two letter
+    #   labels, and so on.
+    label_column_length: int = 1
+    labels_up_to_length: int = CHARS_IN_ALPHABET
+    while labels_up_to_length < label_count:
+        label_column_length += 1
+        labels_up_to_length += CHARS_IN_ALPHABET ** label_column_length
+
+    labels: Iterator[str] = itertools.chain.from_iterable(
+        ("".join(letters) for letters in itertools.product(string.ascii_lowercase, repeat=label_length))
+        for label_length in range(1, label_column_length + 1))
+
+    for label in itertools.islice(labels, label_count):
+        yield f"{label}.".ljust(label_column_length + 1)
+
+
+def _iter_numeric_labels(label_count: int) -> Iterator[str]:
+    """Iterates through labels of the NUMERIC scheme -- EX: 27. -- each padded to the same length.
+
+    Parameters
+    ----------
+    label_count : int
+        Number of labels to generate.
+
+    Returns
+    -------
+    Iterator[str]
+        Padded labels.
+    """
+
+    label_column_length: int = len(str(label_count)) + 1
+    for label_number in range(1, label_count + 1):
+        yield f"{label_number}.".ljust(label_column_length)
+
+
+def iter_line_labels(label_count: int, label_scheme: LineLabelScheme = LineLabelScheme.REPEATED) -> Iterator[str]:
+    """Iterates through the labels of the lines of a concordance.
+
+    Each label ends with a period and is padded with spaces to the width of the label column, so words line up when
+    the label is followed by a space.
+
+    Parameters
+    ----------
+    label_count : int
+        Number of lines in the concordance.
+    label_scheme : LineLabelScheme
+        How lines are labeled.
+
+    Returns
+    -------
+    Iterator[str]
+        Padded labels, generated as they are requested.
+    """
+
+    if LineLabelScheme.ALPHABETIC == label_scheme:
+        return _iter_alphabetic_labels(label_count=label_count)
+    elif LineLabelScheme.NUMERIC == label_scheme:
+        return _iter_numeric_labels(label_count=label_count)
+
+    return _iter_repeated_labels(label_count=label_count)
+
+
+def format_concordance_line(prefix: str, word: str, word_info: WordInfo, word_column_length: int) -> str:
+    """Formats the line of a word in a concordance.
+
+    Each line is separated into columns of prefix, word, and word info. Each column is left aligned and the word column
+    is as wide as the longest word written.
+
+    Parameters
+    ----------
+    prefix : str
+        Label of the line -- EX: bbbbb. -- already padded to the length of the prefix column.
+    word : str
+        Word the line is for.
+    word_info : WordInfo
+        The word's frequency and the sentences it appeared in.
+    word_column_length : int
+        Length of the longest word written.
+
+    Returns
+    -------
+    str
+        line for a word in the concordance.
+    """
+    return f"{prefix} {word:<{word_column_length}} {{{word_info.word_frequency}:{word_info.format_appearances()}}}"
@@ -0,0 +1,259 @@
+import contextlib
+import sys
+import time
+from typing import Any, ContextManager, Dict, Iterable, Iterator, List, Optional, Sized, TypeVar
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows, where peak memory isn't recorded.
+    resource = None
+
+Item = TypeVar("Item")
+
+# Returned by stage() when profiling is off. nullcontext can be entered any number of times, so one is shared.
+_NO_STAGE: ContextManager = contextlib.nullcontext()
+
+
+def get_peak_memory() -> Optional[int]:
+    """Gets the most memory the process has used so far.
+
+    Returns
+    -------
+    Optional[int]
+        Peak resident set size in bytes, or None if the platform can't report it.
+    """
+
+    if resource is None:
+        return None
+
+    peak_memory: int = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # Linux reports kilobytes, macOS reports bytes.
+    return peak_memory if "darwin" == sys.platform else peak_memory * 1024
+
+
+class Profiler:
+    """
+    Records how long each stage of generating a concordance took, the peak memory at the end of each stage, and
+    counts of what was processed.
+
+    A disabled profiler records nothing. Its stage() is a shared no-op context and its iter_stage() and
+    iter_counted() hand back the iterable they were given, so hooks can be left in place at almost no cost. Hooks
+    are only placed around whole texts or chunks, never around single tokens.
+
+    Attributes
+    ----------
+    __enabled : bool
+        Whether anything is recorded.
+    __start_time : float
+        When the profiler was created. Total time is measured from here.
+    __stages : Dict[str, Dict[str, Any]]
+        Seconds spent, number of times entered, and peak memory when last left, for every stage in the order the
+        stages were first entered.
+    __counts : Dict[str, int]
+        Counts of what was processed -- EX: tokens, sentences.
+
+    Methods
+    -------
+    is_enabled()
+        Whether anything is recorded.
+    stage(stage_name: str)
+        Times a stage.
+    iter_stage(stage_name: str, items: Iterable)
+        Times how long it takes to produce each item of an iterable.
+    add_count(count_name: str, count: int)
+        Adds to a count.
+    iter_counted(count_name: str, items: Iterable[Sized])
+        Adds the length of each item of an iterable to a count.
+    get_metrics()
+        Gets everything recorded.
+    format_report()
+        Gets a readable breakdown of everything recorded.
+    """
+
+    def __init__(self, enabled: bool = True):
+        """
+        Parameters
+        ----------
+        enabled : bool
+            Whether anything is recorded.
+        """
+
+        self.__enabled: bool = enabled
+        self.__start_time: float = time.perf_counter()
+        self.__stages: Dict[str, Dict[str, Any]] = dict()
+        self.__counts: Dict[str, int] = dict()
+
+    def is_enabled(self) -> bool:
+        return self.__enabled
+
+    def __end_stage(self, stage_name: str, seconds: float, calls: int = 1) -> None:
+        """Records time spent in a stage.
+
+        Parameters
+        ----------
+        stage_name : str
+            Stage the time was spent in.
+        seconds : float
+            Time spent.
+        calls : int
+            Number of times the stage was entered.
+        """
+
+        stage: Optional[Dict[str, Any]] = self.__stages.get(stage_name)
+        if stage is None:
+            stage = self.__stages[stage_name] = dict({"seconds": 0.0, "calls": 0})
+        stage["seconds"] += seconds
+        stage["calls"] += calls
+        stage["peak_memory_bytes"] = get_peak_memory()
+
+    @contextlib.contextmanager
+    def __timed_stage(self, stage_name: str) -> Iterator[None]:
+        start: float = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.__end_stage(stage_name=stage_name, seconds=time.perf_counter() - start)
+
+    def stage(self, stage_name: str) -> ContextManager:
+        """Times a stage. Entering the same stage again adds to its time.
+
+        Parameters
+        ----------
+        stage_name : str
+            Name of the stage.
+
+        Returns
+        -------
+        ContextManager
+            Context the stage runs in.
+        """
+        return self.__timed_stage(stage_name) if self.__enabled else _NO_STAGE
+
+    def iter_stage(self, stage_name: str, items: Iterable[Item]) -> Iterable[Item]:
+        """Times how long it takes to produce each item of an iterable, for stages that happen lazily -- EX: spaCy
+        parses each text as it is requested from nlp.pipe().
+
+        Parameters
+        ----------
+        stage_name : str
+            Name of the stage.
+        items : Iterable[Item]
+            Items whose production is timed.
+
+        Returns
+        -------
+        Iterable[Item]
+            The same items.
+        """
+
+        if not self.__enabled:
+            return items
+
+        return self.__iter_timed_items(stage_name=stage_name, items=items)
+
+    def __iter_timed_items(self, stage_name: str, items: Iterable[Item]) -> Iterator[Item]:
+        item_iterator: Iterator[Item] = iter(items)
+        while True:
+            start: float = time.perf_counter()
+            try:
+                item: Item = next(item_iterator)
+            except StopIteration:
+                # Finding out there are no more items can take time too -- EX: nlp.pipe() finishing its last batch.
+                self.__end_stage(stage_name=stage_name, seconds=time.perf_counter() - start, calls=0)
+                return
+            self.__end_stage(stage_name=stage_name, seconds=time.perf_counter() - start)
+            yield item
+
+    def add_count(self, count_name: str, count: int) -> None:
+        """Adds to a count.
+
+        Parameters
+        ----------
+        count_name : str
+            Name of the count.
+        count : int
+            Number to add.
+        """
+        if self.__enabled:
+            self.__counts[count_name] = self.__counts.get(count_name, 0) + count
+
+    def iter_counted(self, count_name: str, items: Iterable[Sized]) -> Iterable[Sized]:
+        """Adds the length of each item of an iterable to a count as the item is produced.
+
+        Parameters
+        ----------
+        count_name : str
+            Name of the count.
+        items : Iterable[Sized]
+            Items to count the lengths of -- EX: chunks of text.
+
+        Returns
+        -------
+        Iterable[Sized]
+            The same items.
+        """
+
+        if not self.__enabled:
+            return items
+
+        return self.__iter_counted_items(count_name=count_name, items=items)
+
+    def __iter_counted_items(self, count_name: str, items: Iterable[Sized]) -> Iterator[Sized]:
+        for item in items:
+            self.add_count(count_name=count_name, count=len(item))
+            yield item
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Gets everything recorded.
+
+        Returns
+        -------
+        Dict[str, Any]
+            Total seconds, the seconds, calls and peak memory of each stage, counts, throughput of each count per
+            second, and the peak memory of the process.
+        """
+
+        total_seconds: float = time.perf_counter() - self.__start_time
+        return dict({"total_seconds": total_seconds,
+                     "stages": dict((stage_name, dict(stage)) for stage_name, stage in self.__stages.items()),
+                     "counts": dict(self.__counts),
+                     "throughput": dict((f"{count_name}_per_second", count / total_seconds if total_seconds else 0.0)
+                                        for count_name, count in self.__counts.items()),
+                     "peak_memory_bytes": get_peak_memory()})
+
+    def format_report(self) -> List[str]:
+        """Gets a readable breakdown of everything recorded.
+
+        Returns
+        -------
+        List[str]
+            Lines of the report. Each line does not end with a newline character.
+        """
+
+        metrics: Dict[str, Any] = self.get_metrics()
+        total_seconds: float = metrics["total_seconds"]
+        name_column_length: int = max([len("other")] + [len(stage_name) for stage_name in metrics["stages"]] +
+                                      [len(count_name) for count_name in metrics["counts"]])
+
+        lines: List[str] = list([f"{'stage':<{name_column_length}} {'seconds':>9} {'share':>6} {'calls':>7} "
+                                 f"{'peak MiB':>9}"])
+        staged_seconds: float = 0.0
+        for stage_name, stage in metrics["stages"].items():
+            staged_seconds += stage["seconds"]
+            peak_memory: str = f"{stage['peak_memory_bytes'] / (1 << 20):>9.1f}" \
+                if stage["peak_memory_bytes"] is not None else f"{'-':>9}"
+            lines.append(f"{stage_name:<{name_column_length}} {stage['seconds']:>9.3f} "
+                         f"{stage['seconds'] / total_seconds if total_seconds else 0.0:>6.1%} {stage['calls']:>7} "
+                         f"{peak_memory}")
+        other_seconds: float = max(total_seconds - staged_seconds, 0.0)
+        lines.append(f"{'other':<{name_column_length}} {other_seconds:>9.3f} "
+                     f"{other_seconds / total_seconds if total_seconds else 0.0:>6.1%}")
+        lines.append(f"{'total':<{name_column_length}} {total_seconds:>9.3f}")
+
+        for count_name, count in metrics["counts"].items():
+            lines.append(f"{count_name:<{name_column_length}} {count:>12} "
+                         f"({metrics['throughput'][f'{count_name}_per_second']:.0f}/sec)")
+
+        return lines
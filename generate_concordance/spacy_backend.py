@@ -0,0 +1,197 @@
+import importlib.metadata
+import re
+from bisect import bisect_right
+from typing import TYPE_CHECKING, Iterable, Iterator, List, Optional, Tuple
+
+from generate_concordance import ConcordanceUtils
+from generate_concordance.language_processor import DEFAULT_MODEL, PipelineMode, get_excluded_components, \
+    get_language_processor, get_model_version
+from generate_concordance.tokenizer_backend import OffsetToken, SentenceToken, TokenArrays, TokenizerBackend
+
+# spaCy and NumPy are only imported once text is tokenized, so creating a backend costs nothing. See
+#   language_processor.py.
+if TYPE_CHECKING:
+    import numpy
+    import spacy
+    from spacy.tokens import Doc
+
+# Longest text a pipeline accepts -- spaCy's default nlp.max_length, which pipelines are loaded with.
+SPACY_MAX_LENGTH: int = 1000000
+
+
+class SpacyBackend(TokenizerBackend):
+    """
+    A tokenizer backend that finds tokens and sentences with a spaCy pipeline.
+
+    Attributes
+    ----------
+    __pipeline_mode : PipelineMode
+        How much of the spaCy pipeline to run when finding sentences.
+    __model_name : str
+        Name of the spaCy pipeline package.
+
+    Methods
+    -------
+    get_model_name()
+        Gets the name of the spaCy pipeline package.
+    get_pipeline_mode()
+        Gets how much of the spaCy pipeline is run.
+    get_language_processor()
+        Gets the pipeline from the process-wide pool, loading it if it isn't loaded.
+    load()
+        Loads the pipeline now rather than when the first text is tokenized.
+    get_max_length()
+        Gets the most characters of text the pipeline accepts at once.
+    """
+
+    def __init__(self, pipeline_mode: PipelineMode = PipelineMode.ACCURATE, model_name: str = DEFAULT_MODEL):
+        """
+        Parameters
+        ----------
+        pipeline_mode : PipelineMode
+            How much of the spaCy pipeline to run when finding sentences.
+        model_name : str
+            Name of the spaCy pipeline package to load.
+        """
+
+        self.__pipeline_mode: PipelineMode = pipeline_mode
+        self.__model_name: str = model_name
+
+    def __reduce__(self) -> Tuple[type, Tuple[PipelineMode, str]]:
+        # Worker processes load their own copy of the pipeline rather than unpickling this one.
+        return SpacyBackend, (self.__pipeline_mode, self.__model_name)
+
+    def get_model_name(self) -> str:
+        return self.__model_name
+
+    def get_pipeline_mode(self) -> PipelineMode:
+        return self.__pipeline_mode
+
+    def get_language_processor(self) -> "spacy.Language":
+        """Gets the pipeline from the process-wide pool, loading it if it isn't loaded.
+
+        The pipeline isn't kept by the backend, so backends for several models can share a pool limited to fewer
+        models. See LanguageProcessorPool.
+
+        Returns
+        -------
+        spacy.Language
+            The pipeline shared by every backend in the process with the same model and pipeline mode.
+
+        Raises
+        ------
+        OSError
+            If the spaCy pipeline package is not installed.
+        """
+        return get_language_processor(pipeline_mode=self.__pipeline_mode, model_name=self.__model_name)
+
+    def load(self) -> None:
+        self.get_language_processor()
+
+    def get_max_length(self) -> int:
+        return SPACY_MAX_LENGTH
+
+    def get_description(self) -> str:
+        """Describes the pipeline from the installed package metadata, without loading it, so a text found in the
+        cache is never run through -- or even waits for -- the pipeline.
+
+        Returns
+        -------
+        str
+            spaCy version, model name and version, pipeline mode, and the components left out of the pipeline.
+
+        Raises
+        ------
+        OSError
+            If the spaCy pipeline package is not installed.
+        """
+
+        return f"spacy-{importlib.metadata.version('spacy')}:" \
+               f"{self.__model_name}-{get_model_version(self.__model_name)}:{self.__pipeline_mode.value}:" \
+               f"-{','.join(get_excluded_components(self.__pipeline_mode))}"
+
+    @staticmethod
+    def __iter_document_tokens(text_document: "Doc") -> Iterator[SentenceToken]:
+        """Iterates through the tokens of a processed document.
+
+        Parameters
+        ----------
+        text_document : Doc
+            Document produced by the pipeline.
+
+        Returns
+        -------
+        Iterator[SentenceToken]
+            Every token of the document, with sentences numbered from 1.
+        """
+
+        for sentence_number, sentence in enumerate(text_document.sents, start=1):
+            for token in sentence:
+                yield sentence_number, token.text
+
+    def tokenize(self, text: str) -> Iterator[SentenceToken]:
+        text_document: "Doc" = self.get_language_processor()(ConcordanceUtils.normalize_whitespace(text))
+        return self.__iter_document_tokens(text_document)
+
+    def tokenize_texts(self, texts: Iterable[str], batch_size: int = 1,
+                       processes: int = 1) -> Iterator[Iterator[SentenceToken]]:
+        normalized_texts: Iterator[str] = (ConcordanceUtils.normalize_whitespace(text) for text in texts)
+
+        for text_document in self.get_language_processor().pipe(normalized_texts, batch_size=batch_size,
+                                                                 n_process=processes):
+            yield self.__iter_document_tokens(text_document)
+
+    def tokenize_offsets(self, text: str) -> Iterator[OffsetToken]:
+        # Whitespace is normalized before parsing, which moves tokens. No token spans whitespace, so each token is
+        #   moved back by finding the run of non-whitespace it is in, in both the normalized and original text.
+        original_starts: List[int] = list()
+        normalized_starts: List[int] = list()
+        words: List[str] = list()
+        normalized_length: int = 0
+        for word_match in re.finditer(r"\S+", text):
+            original_starts.append(word_match.start())
+            normalized_starts.append(normalized_length)
+            words.append(word_match.group())
+            normalized_length += len(words[-1]) + 1
+
+        text_document: "Doc" = self.get_language_processor()(" ".join(words))
+        for sentence_number, sentence in enumerate(text_document.sents, start=1):
+            for token in sentence:
+                word_number: int = bisect_right(normalized_starts, token.idx) - 1
+                start: int = original_starts[word_number] + token.idx - normalized_starts[word_number]
+                yield sentence_number, token.text, start, start + len(token.text)
+
+    @staticmethod
+    def __get_document_arrays(text_document: "Doc") -> TokenArrays:
+        """Gets the tokens of a processed document as arrays, without creating a Python object for each token.
+
+        Parameters
+        ----------
+        text_document : Doc
+            Document produced by the pipeline.
+
+        Returns
+        -------
+        TokenArrays
+            The hash of every token's lowercase text, and the sentence every token is in, numbered from 1.
+        """
+
+        import numpy
+        from spacy.attrs import LOWER, SENT_START
+
+        token_attributes: numpy.ndarray = text_document.to_array([LOWER, SENT_START])
+
+        # Doc.sents starts a new sentence at every token after the first with SENT_START set to 1.
+        sentence_starts: numpy.ndarray = token_attributes[:, 1] == 1
+        if len(sentence_starts):
+            sentence_starts[0] = True
+
+        return token_attributes[:, 0], numpy.cumsum(sentence_starts), text_document.vocab.strings.__getitem__
+
+    def tokenize_arrays(self, texts: Iterable[str], batch_size: int = 1,
+                        processes: int = 1) -> Optional[Iterator[TokenArrays]]:
+        normalized_texts: Iterator[str] = (ConcordanceUtils.normalize_whitespace(text) for text in texts)
+
+        return (self.__get_document_arrays(text_document)
+                for text_document in self.get_language_processor().pipe(normalized_texts, batch_size=batch_size,
+                                                                        n_process=processes))
@@ -0,0 +1,100 @@
+import string
+from array import array
+from typing import AbstractSet, Callable, Dict, List, Tuple
+
+import numpy
+
+from generate_concordance.tokenizer_backend import TokenArrays
+from generate_concordance.word_info import SENTENCE_TYPECODE, WordInfo
+
+# numpy's type code for the same C unsigned int WordInfo stores sentence numbers in, so the sentence numbers can be
+#   copied into WordInfo arrays as raw bytes.
+SENTENCE_DTYPE: numpy.dtype = numpy.dtype(SENTENCE_TYPECODE)
+
+# Number of tokens gathered from consecutive texts before they are grouped. Each distinct word of a group costs a
+#   little Python work, so grouping many small texts together is much faster than grouping them one at a time. Every
+#   gathered token takes up 16 bytes.
+TOKEN_ARRAY_BATCH_SIZE: int = 1 << 21
+
+
+def aggregate_token_arrays(texts_token_arrays: List[TokenArrays], sentence_offset: int = 0,
+                           stopwords: AbstractSet[str] = frozenset()) -> Tuple[Dict[str, WordInfo], int, int]:
+    """Groups the tokens of consecutive texts by word, without looping over the tokens in Python.
+
+    Tokens are sorted by word key -- keeping tokens of the same word in text order -- then every run of the same word
+    in the same sentence is found by comparing neighbouring tokens. Only the distinct words are looked at one at a
+    time, so the cost grows with the vocabulary of the texts, not their length.
+
+    Gives the same concordance as adding the tokens one at a time: a word is a lowercase token that is not part of
+    string.punctuation.
+
+    Parameters
+    ----------
+    texts_token_arrays : List[TokenArrays]
+        Tokens of each text produced by the same backend, with sentences numbered from 1 at the start of each text.
+    sentence_offset : int
+        Number added to every sentence number, so the texts' sentences continue on from text processed before them.
+    stopwords : AbstractSet[str]
+        Lowercase words left out of the concordance.
+
+    Returns
+    -------
+    Tuple[Dict[str, WordInfo], int, int]
+        Every word of the texts with its frequency and appearances, the length of the longest word, and the number of
+        sentences in the texts.
+    """
+
+    # Number the sentences of every text on from the text before it.
+    text_sentences: List[numpy.ndarray] = list()
+    sentence_count: int = 0
+    for _, sentences, _ in texts_token_arrays:
+        if len(sentences):
+            text_sentences.append(sentences.astype(SENTENCE_DTYPE) + (sentence_offset + sentence_count))
+            sentence_count += int(sentences[-1])
+
+    token_count: int = sum(len(sentences) for sentences in text_sentences)
+    if 0 == token_count:
+        return dict(), 0, 0
+
+    word_keys: numpy.ndarray = numpy.concatenate([word_keys for word_keys, _, _ in texts_token_arrays])
+    get_word: Callable[[int], str] = texts_token_arrays[-1][2]
+
+    token_order: numpy.ndarray = numpy.argsort(word_keys, kind="stable")
+    sorted_word_keys: numpy.ndarray = word_keys[token_order]
+    sorted_sentences: numpy.ndarray = numpy.concatenate(text_sentences)[token_order]
+
+    # A run is every appearance of a word in one sentence.
+    new_word: numpy.ndarray = numpy.empty(token_count, dtype=bool)
+    new_word[0] = True
+    numpy.not_equal(sorted_word_keys[1:], sorted_word_keys[:-1], out=new_word[1:])
+    new_run: numpy.ndarray = new_word.copy()
+    new_run[1:] |= sorted_sentences[1:] != sorted_sentences[:-1]
+
+    run_starts: numpy.ndarray = numpy.flatnonzero(new_run)
+    run_lengths: numpy.ndarray = numpy.diff(numpy.append(run_starts, token_count)).astype(SENTENCE_DTYPE)
+    word_run_starts: numpy.ndarray = numpy.flatnonzero(new_word[run_starts])
+    word_run_ends: numpy.ndarray = numpy.append(word_run_starts[1:], len(run_starts))
+    word_frequencies: numpy.ndarray = numpy.add.reduceat(run_lengths, word_run_starts)
+    word_repeats: numpy.ndarray = numpy.maximum.reduceat(run_lengths, word_run_starts) > 1
+
+    # Copy into arrays once, so each word only costs a slice.
+    run_sentence_array: array = array(SENTENCE_TYPECODE, sorted_sentences[run_starts].tobytes())
+    run_length_array: array = array(SENTENCE_TYPECODE, run_lengths.tobytes())
+
+    word_to_info: Dict[str, WordInfo] = dict()
+    longest_word: int = 0
+    for word_key, run_start, run_end, word_frequency, word_repeat in zip(
+            sorted_word_keys[run_starts[word_run_starts]].tolist(), word_run_starts.tolist(), word_run_ends.tolist(),
+            word_frequencies.tolist(), word_repeats.tolist()):
+        word: str = get_word(word_key)
+        if word in string.punctuation or word in stopwords:
+            continue
+
+        word_to_info[word] = WordInfo.from_sentence_runs(
+            sentences=run_sentence_array[run_start:run_end],
+            run_lengths=run_length_array[run_start:run_end] if word_repeat else None,
+            word_frequency=word_frequency)
+        if len(word) > longest_word:
+            longest_word = len(word)
+
+    return word_to_info, longest_word, sentence_count
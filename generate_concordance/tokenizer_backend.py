@@ -0,0 +1,158 @@
+from abc import ABC, abstractmethod
+from typing import Callable, Iterable, Iterator, Optional, Tuple
+
+# A token of text and the number of the sentence it is in, counting from 1 at the start of the text.
+SentenceToken = Tuple[int, str]
+
+# A sentence numbered token, and the character offsets of its start and just past its end in the text.
+OffsetToken = Tuple[int, str, int, int]
+
+# The tokens of a text as numpy arrays: an integer key for every token, equal for tokens that are the same word once
+#   lowercased, the number of the sentence every token is in, counting from 1, and a function giving the lowercase
+#   word of a key. Keys mean the same word in every text a backend produces.
+TokenArrays = Tuple["numpy.ndarray", "numpy.ndarray", Callable[[int], str]]
+
+
+class TokenizerBackend(ABC):
+    """
+    Turns text into a sequence of tokens, each labeled with the sentence it is in.
+
+    Backends yield every token, punctuation included. The ConcordanceGenerator decides which tokens are words.
+    Backends are pickled when they are sent to worker processes, so they should be cheap to pickle and load anything
+    expensive lazily.
+
+    Methods
+    -------
+    load()
+        Loads anything the backend needs before it can tokenize text.
+    get_description()
+        Describes everything about the backend that changes the tokens it produces.
+    tokenize(text: str)
+        Splits text into sentence numbered tokens.
+    tokenize_texts(texts: Iterable[str], batch_size: int = 1, processes: int = 1)
+        Splits several texts into sentence numbered tokens.
+    tokenize_arrays(texts: Iterable[str], batch_size: int = 1, processes: int = 1)
+        Splits several texts into sentence numbered tokens held in arrays, if the backend supports it.
+    tokenize_offsets(text: str)
+        Splits text into sentence numbered tokens along with where each token is, if the backend supports it.
+    get_max_length()
+        Gets the most characters of text the backend can tokenize at once, if it has a limit.
+    """
+
+    def load(self) -> None:
+        """Loads anything the backend needs before it can tokenize text.
+
+        Optional. Backends load lazily the first time they tokenize text anyway, this only lets the time spent
+        loading be measured on its own.
+        """
+        pass
+
+    @abstractmethod
+    def get_description(self) -> str:
+        """Describes everything about the backend that changes the tokens it produces.
+
+        Used to key cached concordances, so two backends with the same description must produce the same tokens.
+
+        Returns
+        -------
+        str
+            Description of the backend.
+        """
+        pass
+
+    @abstractmethod
+    def tokenize(self, text: str) -> Iterator[SentenceToken]:
+        """Splits text into tokens, labeling each with the sentence it is in.
+
+        Parameters
+        ----------
+        text : str
+            Text to split.
+
+        Returns
+        -------
+        Iterator[SentenceToken]
+            Every token of the text in order, with sentences numbered from 1. Every sentence number from 1 to the last
+            one has at least one token.
+        """
+        pass
+
+    def tokenize_texts(self, texts: Iterable[str], batch_size: int = 1,
+                       processes: int = 1) -> Iterator[Iterator[SentenceToken]]:
+        """Splits several texts into tokens, labeling each with the sentence it is in.
+
+        Backends that can process texts faster in batches or in several processes override this. Others ignore
+        batch_size and processes.
+
+        Parameters
+        ----------
+        texts : Iterable[str]
+            Texts to split. Consumed lazily.
+        batch_size : int
+            Number of texts to process together. Larger batches are faster for short texts, but every text in a
+            batch is held in memory at once.
+        processes : int
+            Number of processes to split the texts in.
+
+        Returns
+        -------
+        Iterator[Iterator[SentenceToken]]
+            The tokens of each text in order, with sentences numbered from 1 at the start of each text. Each text's
+            tokens must be consumed before moving on to the next text.
+        """
+        return (self.tokenize(text) for text in texts)
+
+    def tokenize_arrays(self, texts: Iterable[str], batch_size: int = 1,
+                        processes: int = 1) -> Optional[Iterator[TokenArrays]]:
+        """Splits several texts into tokens held in arrays, so they can be grouped without a Python loop per token.
+
+        Optional. Backends that can produce arrays without first producing every token as a Python object override
+        this, the others return None and are used through tokenize_texts() instead.
+
+        Parameters
+        ----------
+        texts : Iterable[str]
+            Texts to split. Consumed lazily.
+        batch_size : int
+            Number of texts to process together.
+        processes : int
+            Number of processes to split the texts in.
+
+        Returns
+        -------
+        Optional[Iterator[TokenArrays]]
+            The tokens of each text in order, with sentences numbered from 1 at the start of each text, or None if
+            the backend can't produce arrays.
+        """
+        return None
+
+    def tokenize_offsets(self, text: str) -> Optional[Iterator[OffsetToken]]:
+        """Splits text into tokens, labeling each with the sentence it is in and where it is in the text.
+
+        Optional. Backends that can't locate their tokens in the original text return None.
+
+        Parameters
+        ----------
+        text : str
+            Text to split.
+
+        Returns
+        -------
+        Optional[Iterator[OffsetToken]]
+            The same tokens as tokenize(), each with the character offsets of its start and end in text, or None if
+            the backend can't locate its tokens.
+        """
+        return None
+
+    def get_max_length(self) -> Optional[int]:
+        """Gets the most characters of text the backend can tokenize at once.
+
+        Optional. Backends that can tokenize text of any length return None. Must not load anything, so callers can
+        check texts before the backend is loaded.
+
+        Returns
+        -------
+        Optional[int]
+            Most characters of a text, or None if there is no limit.
+        """
+        return None
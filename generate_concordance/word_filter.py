@@ -0,0 +1,140 @@
+import heapq
+from typing import AbstractSet, Dict, Iterable, List, Optional, Tuple, Union
+
+from generate_concordance.word_info import WordInfo
+
+
+class WordFilter:
+    """
+    Which words of a concordance are kept and written out.
+
+    Stopwords are dropped while tokens are aggregated, so they never take up memory. Frequencies are only known once
+    every text has been aggregated, so the frequency range and the top words are picked when the concordance is
+    written, only sorting the words that are written rather than the whole vocabulary.
+
+    Attributes
+    ----------
+    __stopwords : AbstractSet[str]
+        Lowercase words left out of the concordance.
+    __min_frequency : Optional[int]
+        Words appearing fewer times are not written. None for no lower limit.
+    __max_frequency : Optional[int]
+        Words appearing more times are not written. None for no upper limit.
+    __top : Optional[int]
+        Only the most frequent this many words are written. None to write every word.
+
+    Methods
+    -------
+    get_stopwords()
+        Gets the words left out of the concordance.
+    is_selective()
+        Whether the filter leaves out words by frequency.
+    select_words(word_to_info: Dict[str, WordInfo])
+        Picks the words of a concordance that are written, in alphabetical order.
+    select_word_frequencies(word_frequencies: Iterable[Tuple[str, int]])
+        Picks the words that are written from words streamed in alphabetical order.
+    """
+
+    def __init__(self, stopwords: Optional[Iterable[str]] = None, min_frequency: Optional[int] = None,
+                 max_frequency: Optional[int] = None, top: Optional[int] = None):
+        """
+        Parameters
+        ----------
+        stopwords : Optional[Iterable[str]]
+            Words left out of the concordance, in any case.
+        min_frequency : Optional[int]
+            Words appearing fewer times are not written.
+        max_frequency : Optional[int]
+            Words appearing more times are not written.
+        top : Optional[int]
+            Only the most frequent this many words are written, ties going to the alphabetically first word. Applied
+            after the frequency range.
+        """
+
+        self.__stopwords: AbstractSet[str] = frozenset(stopword.lower() for stopword in stopwords or [])
+        self.__min_frequency: Optional[int] = min_frequency
+        self.__max_frequency: Optional[int] = max_frequency
+        self.__top: Optional[int] = top
+
+    def get_stopwords(self) -> AbstractSet[str]:
+        return self.__stopwords
+
+    def is_selective(self) -> bool:
+        return self.__min_frequency is not None or self.__max_frequency is not None or self.__top is not None
+
+    def __get_frequency_range(self) -> Tuple[int, Union[int, float]]:
+        return (self.__min_frequency if self.__min_frequency is not None else 0,
+                self.__max_frequency if self.__max_frequency is not None else float("inf"))
+
+    def __iter_in_range(self, word_to_info: Dict[str, WordInfo]) -> Iterable[Tuple[str, WordInfo]]:
+        """Iterates through the words whose frequency is within the frequency range.
+
+        Parameters
+        ----------
+        word_to_info : Dict[str, WordInfo]
+            Every word of the concordance.
+
+        Returns
+        -------
+        Iterable[Tuple[str, WordInfo]]
+            Words in the frequency range, in no particular order.
+        """
+
+        if self.__min_frequency is None and self.__max_frequency is None:
+            return word_to_info.items()
+
+        min_frequency, max_frequency = self.__get_frequency_range()
+        return ((word, word_info) for word, word_info in word_to_info.items()
+                if min_frequency <= word_info.word_frequency <= max_frequency)
+
+    def select_words(self, word_to_info: Dict[str, WordInfo]) -> List[str]:
+        """Picks the words of a concordance that are written.
+
+        The top words are picked with a heap of at most top words, so picking them takes O(V log top) time for a
+        vocabulary of V words and only the picked words are sorted.
+
+        Parameters
+        ----------
+        word_to_info : Dict[str, WordInfo]
+            Every word of the concordance.
+
+        Returns
+        -------
+        List[str]
+            Words to write, in alphabetical order.
+        """
+
+        if self.__top is None:
+            return sorted(word for word, _ in self.__iter_in_range(word_to_info))
+
+        top_words: List[Tuple[str, WordInfo]] = heapq.nsmallest(
+            self.__top, self.__iter_in_range(word_to_info), key=lambda item: (-item[1].word_frequency, item[0]))
+        return sorted(word for word, _ in top_words)
+
+    def select_word_frequencies(self, word_frequencies: Iterable[Tuple[str, int]]) -> Iterable[Tuple[str, int]]:
+        """Picks the words that are written from words streamed in alphabetical order, such as the merged words of
+        several concordance indexes.
+
+        Words are filtered as they stream past, so only the top words, if any, are held in memory.
+
+        Parameters
+        ----------
+        word_frequencies : Iterable[Tuple[str, int]]
+            Every word of the concordance with its frequency, in alphabetical order.
+
+        Returns
+        -------
+        Iterable[Tuple[str, int]]
+            Words to write with their frequencies, in alphabetical order.
+        """
+
+        in_range: Iterable[Tuple[str, int]] = word_frequencies
+        if self.__min_frequency is not None or self.__max_frequency is not None:
+            min_frequency, max_frequency = self.__get_frequency_range()
+            in_range = ((word, frequency) for word, frequency in word_frequencies
+                        if min_frequency <= frequency <= max_frequency)
+
+        if self.__top is None:
+            return in_range
+
+        return sorted(heapq.nsmallest(self.__top, in_range, key=lambda item: (-item[1], item[0])))
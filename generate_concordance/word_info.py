@@ -1,32 +1,297 @@
-from typing import List
+import itertools
+import operator
+import sys
+from array import array
+from typing import Iterable, Iterator, Optional, Tuple
+
+# Unsigned 32 bit sentence numbers. Allows for over four billion sentences while using a seventh of the memory of a
+#   list of str.
+SENTENCE_TYPECODE: str = "I"
+
+# Unsigned 64 bit byte offsets, so appearances can be located in input files larger than 4 GB.
+OFFSET_TYPECODE: str = "Q"
 
 
 class WordInfo:
     """
     A class to hold how many times a word has appeared in a text string, and in which sentences a word appeared.
 
+    A word occurs in tens of millions of places in a large corpus, so appearances are stored compactly: the sentence
+    numbers are kept in an unsigned int array with repeats of the same sentence run-length encoded, and are only turned
+    into strings when a line of the concordance is formatted.
+
     Attributes
     ----------
-    word_frequency : int
+    __frequency : int
         The number of times a word has appeared in user provided text.
-    word_appearances : List[str]
-        A list of sentences -- where each sentence is represented by its numerical order in the provided text's
-        sentences -- in which a word appeared.
+    __sentences : array
+        The sentences -- where each sentence is represented by its numerical order in the provided text's sentences --
+        in which a word appeared, in ascending order. A sentence the word appears in several times is only stored once.
+    __run_lengths : Optional[array]
+        How many times the word appeared in each sentence of __sentences. None until the word appears in the same
+        sentence twice, since most words appear once per sentence.
+    __offsets : Optional[array]
+        The start and end byte offset of every appearance in the text, one after the other. None unless offsets are
+        recorded. See ConcordanceGenerator.generate_concordance_with_offsets().
+
+    Methods
+    -------
+    from_appearances(appearances: Iterable[int])
+        Creates a WordInfo from the sentence of every appearance of a word.
+    from_sentence_runs(sentences: array, run_lengths: Optional[array], word_frequency: int)
+        Creates a WordInfo from already run-length encoded appearances.
+    add_appearance(sentence: int)
+        Records another appearance of the word.
+    iter_appearances()
+        Iterates through the sentence of every appearance of the word.
+    format_appearances()
+        Gets the sentences of every appearance as a comma separated string.
+    shift_appearances(sentence_offset: int)
+        Renumbers the sentences a word appeared in.
+    extend(other: WordInfo)
+        Adds the appearances of the same word in text following this word's text.
+    add_offsets(start: int, end: int)
+        Records where the word's latest appearance is in the text.
+    iter_offsets()
+        Iterates through where every appearance of the word is in the text.
+    drop_offsets()
+        Forgets where the word's appearances are.
     """
 
-    def __init__(self, word_frequency: int, word_first_appearance: str):
+    __slots__ = ("__frequency", "__sentences", "__run_lengths", "__offsets")
+
+    def __init__(self, word_first_appearance: int):
         """
         Parameters
         ----------
+        word_first_appearance : int
+            The first sentence in which a word occurred.
+        """
+
+        self.__frequency: int = 1
+        self.__sentences: array = array(SENTENCE_TYPECODE, [word_first_appearance])
+        self.__run_lengths: Optional[array] = None
+        self.__offsets: Optional[array] = None
+
+    @classmethod
+    def from_appearances(cls, appearances: Iterable[int]) -> "WordInfo":
+        """Creates a WordInfo from the sentence of every appearance of a word.
+
+        Parameters
+        ----------
+        appearances : Iterable[int]
+            Sentence numbers in ascending order, repeated once for every time the word appeared in a sentence. Must
+            not be empty.
+
+        Returns
+        -------
+        WordInfo
+            Information about the word.
+        """
+
+        if isinstance(appearances, array):
+            # Sentence numbers are sorted, so a word appearing in a sentence twice shows up as equal neighbours. Without
+            #   them there are no runs to encode and the array can be taken as is.
+            if not any(map(operator.eq, appearances, itertools.islice(appearances, 1, None))):
+                word_info: WordInfo = cls(word_first_appearance=appearances[0])
+                word_info.__sentences = array(SENTENCE_TYPECODE, appearances)
+                word_info.__frequency = len(appearances)
+                return word_info
+
+        appearance_iterator: Iterator[int] = iter(appearances)
+        word_info = cls(word_first_appearance=next(appearance_iterator))
+        for sentence in appearance_iterator:
+            word_info.add_appearance(sentence)
+
+        return word_info
+
+    @classmethod
+    def from_sentence_runs(cls, sentences: array, run_lengths: Optional[array], word_frequency: int) -> "WordInfo":
+        """Creates a WordInfo from already run-length encoded appearances. The arrays are taken as is, not copied.
+
+        Parameters
+        ----------
+        sentences : array
+            Sentences the word appeared in, in ascending order and without repeats. Must not be empty.
+        run_lengths : Optional[array]
+            How many times the word appeared in each sentence, or None if it appeared once in each.
         word_frequency : int
-            Times a word has appeared in text.
-        word_first_appearance : str
-            The first sentence in which a word occurred. Stored as a string so that it can easily be used in format
-            string when generating lines of the concordance.
+            The number of times the word appeared. Equal to the sum of run_lengths.
+
+        Returns
+        -------
+        WordInfo
+            Information about the word.
+        """
+
+        word_info: WordInfo = cls.__new__(cls)
+        word_info.__frequency = word_frequency
+        word_info.__sentences = sentences
+        word_info.__run_lengths = run_lengths
+        word_info.__offsets = None
+
+        return word_info
+
+    @property
+    def word_frequency(self) -> int:
+        """The number of times a word has appeared in user provided text."""
+        return self.__frequency
+
+    @property
+    def word_appearances(self) -> Tuple[int, ...]:
+        """The sentence of every appearance of the word, including repeats. Read-only, so it can't be appended to by
+        mistake: use add_appearance() to record an appearance, and iter_appearances() to avoid building a tuple."""
+        return tuple(self.iter_appearances())
+
+    def add_appearance(self, sentence: int) -> None:
+        """Records another appearance of the word.
+
+        Parameters
+        ----------
+        sentence : int
+            Sentence the word appeared in. Must not be lower than the sentence of the word's last appearance.
         """
 
-        self.word_frequency: int = word_frequency
-        self.word_appearances: List[str] = list([word_first_appearance])
+        self.__frequency += 1
+        if self.__sentences[-1] == sentence:
+            if self.__run_lengths is None:
+                self.__run_lengths = array(SENTENCE_TYPECODE, [1]) * len(self.__sentences)
+            self.__run_lengths[-1] += 1
+        else:
+            self.__sentences.append(sentence)
+            if self.__run_lengths is not None:
+                self.__run_lengths.append(1)
+
+    def iter_appearances(self) -> Iterator[int]:
+        """Iterates through the sentence of every appearance of the word.
+
+        Returns
+        -------
+        Iterator[int]
+            Sentence numbers in ascending order. A sentence is repeated once for every time the word appeared in it.
+        """
+
+        if self.__run_lengths is None:
+            return iter(self.__sentences)
+
+        return (sentence
+                for sentence, run_length in zip(self.__sentences, self.__run_lengths)
+                for _ in range(run_length))
+
+    def format_appearances(self) -> str:
+        """Gets the sentences of every appearance as a comma separated string.
+
+        Returns
+        -------
+        str
+            Sentence numbers joined by commas. EX: 1,1,4
+        """
+        return ",".join(map(str, self.iter_appearances()))
+
+    def shift_appearances(self, sentence_offset: int) -> None:
+        """Renumbers the sentences a word appeared in.
+
+        Used when a concordance for part of a text is merged into the concordance for the text before it.
+
+        Parameters
+        ----------
+        sentence_offset : int
+            Number to add to every sentence number.
+        """
+
+        if sentence_offset:
+            self.__sentences = array(SENTENCE_TYPECODE, [sentence + sentence_offset for sentence in self.__sentences])
+
+    def extend(self, other: "WordInfo") -> None:
+        """Adds the appearances of the same word in text following this word's text.
+
+        Parameters
+        ----------
+        other : WordInfo
+            Information about the word in the following text. Its sentence numbers must already continue on from
+            this object's, see shift_appearances().
+        """
+
+        other_sentences: array = other.__sentences
+        other_run_lengths: Optional[array] = other.__run_lengths
+        if self.__run_lengths is not None or other_run_lengths is not None or \
+                self.__sentences[-1] == other_sentences[0]:
+            if self.__run_lengths is None:
+                self.__run_lengths = array(SENTENCE_TYPECODE, [1]) * len(self.__sentences)
+            if other_run_lengths is None:
+                other_run_lengths = array(SENTENCE_TYPECODE, [1]) * len(other_sentences)
+
+            # The last sentence of this text and the first sentence of the following text can be the same sentence
+            #   when a sentence was split across the two.
+            if self.__sentences[-1] == other_sentences[0]:
+                self.__run_lengths[-1] += other_run_lengths[0]
+                other_sentences = other_sentences[1:]
+                other_run_lengths = other_run_lengths[1:]
+
+            self.__run_lengths.extend(other_run_lengths)
+
+        self.__sentences.extend(other_sentences)
+        self.__frequency += other.__frequency
+
+        # Offsets are only kept if every appearance has them.
+        if self.__offsets is not None and other.__offsets is not None:
+            self.__offsets.extend(other.__offsets)
+        else:
+            self.__offsets = None
+
+    def add_offsets(self, start: int, end: int) -> None:
+        """Records where the word's latest appearance is in the text. Must be called after every appearance is added,
+        starting with the first, or the offsets are incomplete.
+
+        Parameters
+        ----------
+        start : int
+            Byte offset of the start of the appearance.
+        end : int
+            Byte offset just past the end of the appearance.
+        """
+
+        if self.__offsets is None:
+            self.__offsets = array(OFFSET_TYPECODE, [start, end])
+        else:
+            self.__offsets.append(start)
+            self.__offsets.append(end)
+
+    def iter_offsets(self) -> Iterator[Tuple[int, int]]:
+        """Iterates through where every appearance of the word is in the text.
+
+        Returns
+        -------
+        Iterator[Tuple[int, int]]
+            Start and end byte offset of every appearance, in the order of iter_appearances(). Empty if offsets were
+            not recorded.
+        """
+
+        if self.__offsets is None:
+            return iter(())
+
+        offset_iterator: Iterator[int] = iter(self.__offsets)
+        return zip(offset_iterator, offset_iterator)
+
+    def drop_offsets(self) -> None:
+        """Forgets where the word's appearances are in the text.
+
+        Offsets become invalid as soon as an appearance is added without them -- EX: text added with update() after
+        generate_concordance_with_offsets() -- since iter_offsets() would no longer line up with iter_appearances().
+        Dropping them also frees their memory.
+        """
+        self.__offsets = None
+
+    def __sizeof__(self) -> int:
+        """Includes the arrays owned by the object, so sys.getsizeof() reports the full cost of a word's appearances."""
+
+        size: int = object.__sizeof__(self) + sys.getsizeof(self.__sentences)
+        if self.__run_lengths is not None:
+            size += sys.getsizeof(self.__run_lengths)
+        if self.__offsets is not None:
+            size += sys.getsizeof(self.__offsets)
+
+        return size
 
     # Only used in Unit Tests
     def __eq__(self, other):
@@ -34,7 +299,10 @@ class WordInfo:
 
         if isinstance(other, WordInfo):
             if self.word_frequency == other.word_frequency:
-                if self.word_appearances == other.word_appearances:
+                if self.word_appearances == other.word_appearances and self.__offsets == other.__offsets:
                     equal = True
 
         return equal
+
+    def __repr__(self) -> str:
+        return f"WordInfo({self.__frequency}:{self.format_appearances()})"
@@ -1,4 +1,6 @@
+import os
 import sys
+import tempfile
 import unittest
 import io
 
@@ -24,6 +26,92 @@ class TestConcordanceUtils(unittest.TestCase):
         self.assertTrue("The provided input file -- /this_file_should_not_exist.txt -- does not exist."
                         in stdout.getvalue())
 
+    def test_get_input_file_chunks(self):
+        stdout: io.StringIO = io.StringIO()
+        sys.stdout = stdout
+
+        self.assertIsNone(ConcordanceUtils.get_input_file_chunks(input_file="/this_file_should_not_exist.txt"))
+
+        # Reset stdout redirect
+        sys.stdout = sys.__stdout__
+
+        self.assertTrue("The provided input file -- /this_file_should_not_exist.txt -- does not exist."
+                        in stdout.getvalue())
+
+        for input_file in ["./test_files/LargeTextFile.txt", "./test_files/TestEdgeCases.txt"]:
+            chunks = list(ConcordanceUtils.get_input_file_chunks(input_file=input_file, chunk_size=200))
+            self.assertEqual(ConcordanceUtils.get_input_file_text(input_file), "".join(chunks))
+
+            # Chunks are never cut part way through a word.
+            for chunk in chunks[:-1]:
+                self.assertTrue(chunk[-1].isspace())
+
+        self.assertEqual(list(["This is a simple test.\nA two sentence test."]),
+                         list(ConcordanceUtils.get_input_file_chunks(input_file="./test_files/SimpleTest.txt")))
+
+    def test_get_input_file_chunks_long_paragraph(self):
+        # Without paragraph breaks, chunks are cut after the last complete sentence.
+        chunks = list(ConcordanceUtils.get_input_file_chunks(input_file="./test_files/SimpleTest.txt", chunk_size=15))
+        self.assertEqual(list(["This is a simple test.\n", "A two sentence test."]), chunks)
+
+    def test_get_input_file_paths(self):
+        self.assertEqual(list(["./test_files/SimpleTest.txt", "./test_files/TestEdgeCases.txt",
+                               "./test_files/TestWriteFile.txt", "./missing.txt"]),
+                         ConcordanceUtils.get_input_file_paths(["./test_files/SimpleTest.txt", "./test_files/T*.txt",
+                                                                "./missing.txt"]))
+
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            file_list: str = os.path.join(temporary_directory, "files.txt")
+            with open(file_list, "w") as file:
+                file.write("./test_files/SimpleTest.txt\n\n./test_files/ProvidedExample.txt\n")
+
+            self.assertEqual(list(["./test_files/LargeTextFile.txt", "./test_files/SimpleTest.txt",
+                                   "./test_files/ProvidedExample.txt"]),
+                             ConcordanceUtils.get_input_file_paths(["./test_files/L*.txt"], file_list=file_list))
+
+            # A file list can name the model of each file after a tab.
+            with open(file_list, "w") as file:
+                file.write("./test_files/SimpleTest.txt\tde_core_news_sm\n./test_files/ProvidedExample.txt\t\n")
+            self.assertEqual(list([("./test_files/LargeTextFile.txt", None),
+                                   ("./test_files/SimpleTest.txt", "de_core_news_sm"),
+                                   ("./test_files/ProvidedExample.txt", None)]),
+                             ConcordanceUtils.get_input_file_models(["./test_files/L*.txt"], file_list=file_list))
+            self.assertEqual(list(["./test_files/SimpleTest.txt", "./test_files/ProvidedExample.txt"]),
+                             ConcordanceUtils.get_input_file_paths([], file_list=file_list))
+
+        stdout: io.StringIO = io.StringIO()
+        sys.stdout = stdout
+
+        self.assertIsNone(ConcordanceUtils.get_input_file_paths(["./test_files/*.missing"]))
+
+        # Reset stdout redirect
+        sys.stdout = sys.__stdout__
+
+        self.assertTrue("The provided input file pattern -- ./test_files/*.missing -- does not match any files."
+                        in stdout.getvalue())
+
+    def test_get_output_file_paths(self):
+        self.assertEqual(list([os.path.join("out", "SimpleTest.concordance.txt"),
+                               os.path.join("out", "ProvidedExample.concordance.txt")]),
+                         ConcordanceUtils.get_output_file_paths(["./test_files/SimpleTest.txt",
+                                                                 "test_files/ProvidedExample.txt"], "out"))
+
+        # Files with the same name in different directories keep their directories.
+        self.assertEqual(list([os.path.join("out", "a", "doc.concordance.txt"),
+                               os.path.join("out", "b", "c", "doc.concordance.txt")]),
+                         ConcordanceUtils.get_output_file_paths(["texts/a/doc.txt", "texts/b/c/doc.txt"], "out"))
+
+        stdout: io.StringIO = io.StringIO()
+        sys.stdout = stdout
+
+        self.assertIsNone(ConcordanceUtils.get_output_file_paths(["a/doc.txt", "a/doc.md"], "out"))
+
+        # Reset stdout redirect
+        sys.stdout = sys.__stdout__
+
+        self.assertTrue(f"The provided input files -- a/doc.txt and a/doc.md -- would both be written to -- "
+                        f"{os.path.join('out', 'doc.concordance.txt')}." in stdout.getvalue())
+
     def test_print_lines(self):
         stdout: io.StringIO = io.StringIO()
         sys.stdout = stdout
@@ -35,6 +123,18 @@ class TestConcordanceUtils(unittest.TestCase):
 
         self.assertTrue("This is a test.\nA second sentence." in stdout.getvalue())
 
+    def test_print_lines_in_blocks(self):
+        stdout: io.StringIO = io.StringIO()
+        sys.stdout = stdout
+
+        # Lines are consumed lazily and written in several blocks.
+        ConcordanceUtils.print_lines(lines=(f"Line {line_number}" for line_number in range(100)), block_size=64)
+
+        # Reset stdout redirect
+        sys.stdout = sys.__stdout__
+
+        self.assertEqual("".join(f"Line {line_number}\n" for line_number in range(100)), stdout.getvalue())
+
     def test_write_lines_to_file(self):
         stdout: io.StringIO = io.StringIO()
         sys.stdout = stdout
@@ -46,8 +146,10 @@ class TestConcordanceUtils(unittest.TestCase):
         # Reset stdout redirect
         sys.stdout = sys.__stdout__
 
-        ConcordanceUtils.write_lines_to_file(lines=list(["Testing", "Testing"]),
-                                             output_file="./test_files/TestWriteFile.txt")
+        self.assertTrue(ConcordanceUtils.write_lines_to_file(lines=iter(["Testing", "Testing"]),
+                                                             output_file="./test_files/TestWriteFile.txt",
+                                                             block_size=1))
+        self.assertEqual("Testing\nTesting\n", ConcordanceUtils.get_input_file_text("./test_files/TestWriteFile.txt"))
 
 
 if __name__ == '__main__':
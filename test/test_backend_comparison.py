@@ -0,0 +1,45 @@
+import glob
+import unittest
+from typing import Dict, List, Tuple
+
+from generate_concordance import ConcordanceUtils
+from generate_concordance.backend_comparison import SentenceDisagreement, find_sentence_disagreements, \
+    find_word_disagreements, measure_throughput
+from generate_concordance.regex_backend import RegexBackend
+from generate_concordance.spacy_backend import SpacyBackend
+
+
+class TestBackendComparison(unittest.TestCase):
+    def setUp(self) -> None:
+        self.spacy_backend = SpacyBackend()
+        self.regex_backend = RegexBackend()
+
+    def test_find_word_disagreements(self):
+        self.assertDictEqual(dict(), find_word_disagreements("A simple test. A test.", self.regex_backend,
+                                                             self.regex_backend))
+
+    def test_find_sentence_disagreements(self):
+        self.assertEqual(list(), find_sentence_disagreements("A simple test. A test.", self.regex_backend,
+                                                             self.regex_backend))
+
+    def test_measure_throughput(self):
+        self.assertGreater(measure_throughput("A simple test. A test.", self.regex_backend, repeat=1), 0)
+
+    def test_backend_parity(self):
+        # Reports every disagreement between the backends on the demo files. The backends must agree on most words;
+        #   sentence boundaries are only reported since the regex backend is expected to be less accurate.
+        for input_file in sorted(glob.glob("./test_files/*.txt")):
+            input_text: str = ConcordanceUtils.get_input_file_text(input_file)
+            with self.subTest(input_file=input_file):
+                word_disagreements: Dict[str, Tuple[int, int]] = find_word_disagreements(
+                    input_text, self.spacy_backend, self.regex_backend)
+                sentence_disagreements: List[SentenceDisagreement] = find_sentence_disagreements(
+                    input_text, self.spacy_backend, self.regex_backend)
+
+                words: set = set(word.lower() for _, word in self.regex_backend.tokenize(input_text))
+                self.assertLessEqual(len(word_disagreements), max(1, len(words) // 50),
+                                     f"words: {word_disagreements}\nsentences: {sentence_disagreements}")
+
+
+if __name__ == '__main__':
+    unittest.main()
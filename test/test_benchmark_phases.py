@@ -0,0 +1,51 @@
+import os
+import tempfile
+import unittest
+from typing import Any, Dict
+
+import numpy
+
+from benchmarks.benchmark_phases import _ParsedBackend, build_corpus, find_regressions
+from generate_concordance import ConcordanceUtils
+
+
+def _make_results(aggregation_seconds: float, peak_memory_bytes: int) -> Dict[str, Any]:
+    return dict({"scales": dict({"10": dict({"phases": dict({"nlp_parse": dict({"seconds": 1.0}),
+                                                             "aggregation": dict({"seconds": aggregation_seconds})}),
+                                             "peak_memory_bytes": peak_memory_bytes})})})
+
+
+class TestBenchmarkPhases(unittest.TestCase):
+    def test_build_corpus(self):
+        with tempfile.TemporaryDirectory() as temporary_directory:
+            corpus_file: str = os.path.join(temporary_directory, "corpus.txt")
+            build_corpus(source_text="This is a simple test.\nA two sentence test.\n", scale=3, corpus_file=corpus_file)
+
+            self.assertEqual("This is a simple test.\nA two sentence test.\n\n" * 3,
+                             ConcordanceUtils.get_input_file_text(corpus_file))
+
+    def test_parsed_backend(self):
+        token_arrays = (numpy.array([0, 1, 0]), numpy.array([1, 1, 2]), ["a", "test"].__getitem__)
+        backend: _ParsedBackend = _ParsedBackend(texts=["A test. A"], texts_token_arrays=[token_arrays])
+
+        self.assertEqual(list([(1, "a"), (1, "test"), (2, "a")]), list(backend.tokenize("A test. A")))
+        self.assertEqual(list([token_arrays]), list(backend.tokenize_arrays(["A test. A"])))
+
+    def test_find_regressions(self):
+        baseline: Dict[str, Any] = _make_results(aggregation_seconds=1.0, peak_memory_bytes=100 << 20)
+
+        self.assertEqual(list(), find_regressions(_make_results(1.1, 110 << 20), baseline, tolerance=0.2))
+        self.assertEqual(list(["10x aggregation: 1.500s, baseline 1.000s",
+                               "10x peak memory: 150.0 MiB, baseline 100.0 MiB"]),
+                         find_regressions(_make_results(1.5, 150 << 20), baseline, tolerance=0.2))
+
+        # Slowing down by less than the minimum regression is timer noise.
+        self.assertEqual(list(), find_regressions(_make_results(1.5, 100 << 20), baseline, tolerance=0.2,
+                                                  minimum_regression=1.0))
+
+        # Scales missing from the baseline aren't compared.
+        self.assertEqual(list(), find_regressions(_make_results(1.5, 150 << 20), dict({"scales": dict()})))
+
+
+if __name__ == '__main__':
+    unittest.main()
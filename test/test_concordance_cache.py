@@ -0,0 +1,87 @@
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from generate_concordance.concordance_cache import ConcordanceCache
+from generate_concordance.concordance_index import ConcordanceIndex
+from generate_concordance.word_info import WordInfo
+
+
+class TestConcordanceCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.cache_directory: str = os.path.join(self.temporary_directory.name, "cache")
+
+    def tearDown(self) -> None:
+        self.temporary_directory.cleanup()
+
+    def test_get_key(self):
+        key: str = ConcordanceCache.get_key(text="This is a test.", pipeline_description="en_core_web_sm-3.3.0")
+        self.assertEqual(key, ConcordanceCache.get_key(text="This is a test.",
+                                                       pipeline_description="en_core_web_sm-3.3.0"))
+        self.assertNotEqual(key, ConcordanceCache.get_key(text="This is a test!",
+                                                          pipeline_description="en_core_web_sm-3.3.0"))
+        self.assertNotEqual(key, ConcordanceCache.get_key(text="This is a test.",
+                                                          pipeline_description="en_core_web_sm-3.4.0"))
+
+    def test_get_and_put(self):
+        cache: ConcordanceCache = ConcordanceCache(cache_directory=self.cache_directory)
+        self.assertIsNone(cache.get(key="missing"))
+
+        cache.put(key="test", words=[("a", WordInfo(1)), ("test", WordInfo(2))], longest_word=4, sentence_count=2)
+        with cache.get(key="test") as cached_index:
+            self.assertEqual(list([("a", WordInfo(1)), ("test", WordInfo(2))]), list(cached_index.iter_words()))
+            self.assertEqual(4, cached_index.get_longest_word())
+            self.assertEqual(2, cached_index.get_sentence_count())
+
+        # An entry that can't be marked as recently used is closed rather than leaked.
+        with mock.patch.object(os, "utime", side_effect=PermissionError), \
+                mock.patch.object(ConcordanceIndex, "close", autospec=True) as close:
+            self.assertIsNone(cache.get(key="test"))
+            close.assert_called_once()
+
+    def test_least_recently_used_eviction(self):
+        cache: ConcordanceCache = ConcordanceCache(cache_directory=self.cache_directory)
+        cache.put(key="first", words=[("a", WordInfo(1))], longest_word=1, sentence_count=1)
+        entry_size: int = os.path.getsize(os.path.join(self.cache_directory, "first.idx"))
+
+        # Room for two entries.
+        cache = ConcordanceCache(cache_directory=self.cache_directory, max_size=2 * entry_size)
+        time.sleep(0.01)
+        cache.put(key="second", words=[("b", WordInfo(1))], longest_word=1, sentence_count=1)
+        time.sleep(0.01)
+
+        # Reading the first entry makes the second the least recently used.
+        cache.get(key="first").close()
+        time.sleep(0.01)
+        cache.put(key="third", words=[("c", WordInfo(1))], longest_word=1, sentence_count=1)
+
+        self.assertIsNotNone(cache.get(key="first"))
+        self.assertIsNone(cache.get(key="second"))
+        self.assertIsNotNone(cache.get(key="third"))
+
+    def test_stale_temporary_files(self):
+        os.makedirs(self.cache_directory)
+        stale_path: str = os.path.join(self.cache_directory, "stale.idx.a1b2c3.tmp")
+        fresh_path: str = os.path.join(self.cache_directory, "fresh.idx.d4e5f6.tmp")
+        for temporary_path in [stale_path, fresh_path]:
+            with open(temporary_path, "wb") as temporary_file:
+                temporary_file.write(bytes(100))
+        stale_time: float = time.time() - 2 * 60 * 60
+        os.utime(stale_path, (stale_time, stale_time))
+
+        # A file that might still be being written is left alone.
+        cache: ConcordanceCache = ConcordanceCache(cache_directory=self.cache_directory)
+        cache.put(key="test", words=[("a", WordInfo(1))], longest_word=1, sentence_count=1)
+        self.assertEqual(["fresh.idx.d4e5f6.tmp", "test.idx"], sorted(os.listdir(self.cache_directory)))
+
+    def test_unwritable_cache(self):
+        cache: ConcordanceCache = ConcordanceCache(cache_directory="/proc/this_directory_cannot_be_created")
+        cache.put(key="test", words=[("a", WordInfo(1))], longest_word=1, sentence_count=1)
+        self.assertIsNone(cache.get(key="test"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,19 @@
+import glob
+import os
+import tempfile
 import unittest
 from typing import Dict, List
+from unittest import mock
 
+from generate_concordance import ConcordanceUtils, concordance_generator, language_processor
+from generate_concordance.concordance_cache import ConcordanceCache
+from generate_concordance.concordance_empty import ConcordanceEmpty
 from generate_concordance.concordance_generator import ConcordanceGenerator
+from generate_concordance.language_processor import LanguageProcessorPool, PipelineMode
+from generate_concordance.line_label import LineLabelScheme
+from generate_concordance.regex_backend import RegexBackend
+from generate_concordance.spacy_backend import SpacyBackend
+from generate_concordance.word_filter import WordFilter
 from generate_concordance.word_info import WordInfo
 
 
@@ -11,18 +23,18 @@ class TestConcordanceGenerator(unittest.TestCase):
 
         self.expected_longest_word: int = len("sentence")
 
-        a_word_info: WordInfo = WordInfo(2, "1")
-        a_word_info.word_appearances.append("2")
-        test_word_info: WordInfo = WordInfo(2, "1")
-        test_word_info.word_appearances.append("2")
+        a_word_info: WordInfo = WordInfo(1)
+        a_word_info.add_appearance(2)
+        test_word_info: WordInfo = WordInfo(1)
+        test_word_info.add_appearance(2)
 
-        self.expected_word_to_info: Dict[str, WordInfo] = dict({"this": WordInfo(1, "1"),
-                                                                "is": WordInfo(1, "1"),
+        self.expected_word_to_info: Dict[str, WordInfo] = dict({"this": WordInfo(1),
+                                                                "is": WordInfo(1),
                                                                 "a": a_word_info,
-                                                                "simple": WordInfo(1, "1"),
+                                                                "simple": WordInfo(1),
                                                                 "test": test_word_info,
-                                                                "two": WordInfo(1, "2"),
-                                                                "sentence": WordInfo(1, "2")})
+                                                                "two": WordInfo(2),
+                                                                "sentence": WordInfo(2)})
 
     def test_init(self):
         self.assertIsNone(self.concordance_generator.get_longest_word())
@@ -59,6 +71,233 @@ class TestConcordanceGenerator(unittest.TestCase):
 
         self.assertEqual(actual_lines, self.concordance_generator.get_concordance_lines())
 
+    def test_get_concordance_lines_label_schemes(self):
+        self.concordance_generator.generate_concordance("This is a simple test. A two sentence test.")
+        self.assertEqual(list(["a. a        {2:1,2}", "b. is       {1:1}"]),
+                         self.concordance_generator.get_concordance_lines(
+                             label_scheme=LineLabelScheme.ALPHABETIC)[:2])
+        self.assertEqual(list(["1. a        {2:1,2}", "2. is       {1:1}"]),
+                         self.concordance_generator.get_concordance_lines(label_scheme=LineLabelScheme.NUMERIC)[:2])
+
+    def test_iter_concordance_lines(self):
+        self.assertRaises(ConcordanceEmpty, self.concordance_generator.iter_concordance_lines)
+
+        self.concordance_generator.generate_concordance("This is a simple test. A two sentence test.")
+        lines = self.concordance_generator.iter_concordance_lines()
+        self.assertEqual("a. a        {2:1,2}", next(lines))
+        self.assertEqual(self.concordance_generator.get_concordance_lines()[1:], list(lines))
+
+    def test_pipeline_modes(self):
+        for pipeline_mode in PipelineMode:
+            concordance_generator: ConcordanceGenerator = ConcordanceGenerator(pipeline_mode=pipeline_mode)
+            concordance_generator.generate_concordance("This is a simple test. A two sentence test.")
+            self.assertDictEqual(self.expected_word_to_info, concordance_generator.get_word_to_info())
+
+    def test_get_token_count(self):
+        self.assertIsNone(self.concordance_generator.get_token_count())
+        self.concordance_generator.generate_concordance("This is a simple test. A two sentence test.")
+        self.assertEqual(9, self.concordance_generator.get_token_count())
+
+    def test_get_memory_usage(self):
+        self.assertIsNone(self.concordance_generator.get_memory_usage())
+        self.concordance_generator.generate_concordance("This is a simple test. A two sentence test.")
+        self.assertGreater(self.concordance_generator.get_memory_usage(), 0)
+
+    def test_update(self):
+        # Updating an empty generator starts a new concordance.
+        self.concordance_generator.update("This is a simple test.")
+        self.concordance_generator.update("A two sentence test.")
+        self.assertEqual(2, self.concordance_generator.get_sentence_count())
+        self.assertEqual(self.expected_longest_word, self.concordance_generator.get_longest_word())
+        self.assertDictEqual(self.expected_word_to_info, self.concordance_generator.get_word_to_info())
+
+        self.concordance_generator.update_from_chunks(["A third sentence. ", "And a fourth."])
+        self.assertEqual(4, self.concordance_generator.get_sentence_count())
+        self.assertEqual(tuple([1, 2, 3, 4]), self.concordance_generator.get_word_to_info()["a"].word_appearances)
+
+    def test_restore(self):
+        self.concordance_generator.generate_concordance("This is a simple test.")
+        saved_words = list(self.concordance_generator.iter_words())
+
+        restored_generator: ConcordanceGenerator = ConcordanceGenerator()
+        restored_generator.restore(words=saved_words,
+                                   longest_word=self.concordance_generator.get_longest_word(),
+                                   sentence_count=self.concordance_generator.get_sentence_count())
+        restored_generator.update("A two sentence test.")
+
+        self.assertEqual(self.expected_longest_word, restored_generator.get_longest_word())
+        self.assertDictEqual(self.expected_word_to_info, restored_generator.get_word_to_info())
+
+    def test_set_backend(self):
+        # Text processed after the backend changes is added to the same concordance.
+        generator: ConcordanceGenerator = ConcordanceGenerator(backend=RegexBackend())
+        generator.update("This is a simple test.")
+        generator.set_backend(SpacyBackend())
+        generator.update_from_chunks(["A two sentence test."])
+        self.assertEqual(2, generator.get_sentence_count())
+        self.assertDictEqual(self.expected_word_to_info, generator.get_word_to_info())
+
+        spacy_generator: ConcordanceGenerator = next(generator.iter_concordances(["Two. Sentences."]))
+        self.assertEqual(2, spacy_generator.get_sentence_count())
+
+    def test_cache(self):
+        with tempfile.TemporaryDirectory() as cache_directory:
+            cache: ConcordanceCache = ConcordanceCache(cache_directory=cache_directory)
+            for _ in range(2):
+                cached_generator: ConcordanceGenerator = ConcordanceGenerator(cache=cache)
+                cached_generator.generate_concordance("This is a simple test. A two sentence test.")
+                self.assertEqual(self.expected_longest_word, cached_generator.get_longest_word())
+                self.assertEqual(2, cached_generator.get_sentence_count())
+                self.assertDictEqual(self.expected_word_to_info, cached_generator.get_word_to_info())
+
+            # Cached concordances are renumbered when they are added to a concordance.
+            cached_generator.update("This is a simple test. A two sentence test.")
+            self.assertEqual(tuple([1, 2, 3, 4]), cached_generator.get_word_to_info()["a"].word_appearances)
+
+            # A cached text is never run through the pipeline, so the pipeline isn't even loaded.
+            with mock.patch.object(language_processor, "_language_processor_pool", LanguageProcessorPool()), \
+                    mock.patch.object(language_processor, "_load_language_processor") as load_language_processor:
+                cached_generator = ConcordanceGenerator(cache=cache)
+                cached_generator.generate_concordance("This is a simple test. A two sentence test.")
+                self.assertDictEqual(self.expected_word_to_info, cached_generator.get_word_to_info())
+                load_language_processor.assert_not_called()
+
+    def test_cache_memory_limit(self):
+        chunks: List[str] = list(ConcordanceUtils.get_input_file_chunks("./test_files/LargeTextFile.txt",
+                                                                        chunk_size=2000))
+        for word_filter in [WordFilter(), WordFilter(stopwords=["the", "a"])]:
+            unlimited_generator: ConcordanceGenerator = ConcordanceGenerator(backend=RegexBackend(),
+                                                                             word_filter=word_filter)
+            for chunk in chunks:
+                unlimited_generator.update(chunk)
+
+            # Cached concordances are written straight to runs rather than merged in memory, whether they were just
+            #   generated or found in the cache.
+            with tempfile.TemporaryDirectory() as cache_directory:
+                cache: ConcordanceCache = ConcordanceCache(cache_directory=cache_directory)
+                for _ in range(2):
+                    generator: ConcordanceGenerator = ConcordanceGenerator(backend=RegexBackend(), cache=cache,
+                                                                           word_filter=word_filter, memory_limit=10000)
+                    for chunk in chunks:
+                        generator.update(chunk)
+                    self.assertEqual(len(chunks), generator.get_run_count())
+                    self.assertEqual(unlimited_generator.get_sentence_count(), generator.get_sentence_count())
+                    self.assertEqual(unlimited_generator.get_token_count(), generator.get_token_count())
+                    self.assertEqual(unlimited_generator.get_concordance_lines(), generator.get_concordance_lines())
+                    self.assertEqual(list(unlimited_generator.iter_words()), list(generator.iter_words()))
+
+    def test_generate_concordance_from_chunks(self):
+        self.concordance_generator.generate_concordance_from_chunks(["This is a simple test. ", "A two sentence test."])
+        self.assertEqual(self.expected_longest_word, self.concordance_generator.get_longest_word())
+        self.assertDictEqual(self.expected_word_to_info, self.concordance_generator.get_word_to_info())
+
+        # Streaming a file must produce the same concordance as reading it all at once.
+        for input_file in ["./test_files/LargeTextFile.txt", "./test_files/ProvidedExample.txt"]:
+            self.concordance_generator.generate_concordance(ConcordanceUtils.get_input_file_text(input_file))
+            expected_lines: List[str] = self.concordance_generator.get_concordance_lines()
+
+            self.concordance_generator.generate_concordance_from_chunks(
+                ConcordanceUtils.get_input_file_chunks(input_file, chunk_size=2000))
+            self.assertEqual(expected_lines, self.concordance_generator.get_concordance_lines())
+
+    def test_generate_concordance_in_parallel(self):
+        # A parallel concordance must be identical to the serial concordance of the whole text, and to the serial
+        #   concordance for the same chunks.
+        for input_file in sorted(glob.glob("./test_files/*.txt")):
+            self.concordance_generator.generate_concordance(ConcordanceUtils.get_input_file_text(input_file))
+            expected_lines: List[str] = self.concordance_generator.get_concordance_lines()
+            expected_sentence_count: int = self.concordance_generator.get_sentence_count()
+
+            self.concordance_generator.generate_concordance_from_chunks(
+                ConcordanceUtils.get_input_file_chunks(input_file, chunk_size=500))
+            self.assertEqual(expected_lines, self.concordance_generator.get_concordance_lines(), input_file)
+            self.assertEqual(expected_sentence_count, self.concordance_generator.get_sentence_count(), input_file)
+
+            self.concordance_generator.generate_concordance_from_chunks(
+                ConcordanceUtils.get_input_file_chunks(input_file, chunk_size=500), workers=3)
+            self.assertEqual(expected_lines, self.concordance_generator.get_concordance_lines(), input_file)
+            self.assertEqual(expected_sentence_count, self.concordance_generator.get_sentence_count(), input_file)
+
+    def test_memory_limit(self):
+        input_file: str = "./test_files/LargeTextFile.txt"
+        unlimited_generator: ConcordanceGenerator = ConcordanceGenerator(backend=RegexBackend())
+        unlimited_generator.generate_concordance_from_chunks(
+            ConcordanceUtils.get_input_file_chunks(input_file, chunk_size=2000))
+        expected_lines: List[str] = unlimited_generator.get_concordance_lines()
+        expected_words = list(unlimited_generator.iter_words())
+
+        # A limit this small spills the concordance to a run after nearly every chunk.
+        generator: ConcordanceGenerator = ConcordanceGenerator(backend=RegexBackend(), memory_limit=10000)
+        for workers in [1, 2]:
+            generator.generate_concordance_from_chunks(
+                ConcordanceUtils.get_input_file_chunks(input_file, chunk_size=2000), workers=workers)
+            self.assertGreater(generator.get_run_count(), 1)
+            self.assertEqual(unlimited_generator.get_sentence_count(), generator.get_sentence_count())
+            self.assertEqual(unlimited_generator.get_token_count(), generator.get_token_count())
+            self.assertEqual(expected_lines, generator.get_concordance_lines())
+            self.assertEqual(expected_words, list(generator.iter_words()))
+            self.assertEqual(len(expected_words), generator.get_word_count())
+
+        # Text added after the runs have been merged carries on from them.
+        generator.update(text="Zymurgy is last.")
+        self.assertEqual(unlimited_generator.get_sentence_count() + 1, generator.get_sentence_count())
+        self.assertIn(["zymurgy", f"{{1:{generator.get_sentence_count()}}}"],
+                      [line.split()[1:] for line in generator.get_concordance_lines()])
+
+        # Starting a new concordance deletes the runs.
+        generator.generate_concordance(text="This is a simple test. A two sentence test.")
+        self.assertEqual(0, generator.get_run_count())
+        self.assertEqual(self.expected_word_to_info, generator.get_word_to_info())
+
+    def test_run_fan_in(self):
+        input_file: str = "./test_files/LargeTextFile.txt"
+        unlimited_generator: ConcordanceGenerator = ConcordanceGenerator(backend=RegexBackend())
+        unlimited_generator.generate_concordance_from_chunks(
+            ConcordanceUtils.get_input_file_chunks(input_file, chunk_size=500))
+
+        # Spilling after nearly every chunk makes many more runs than the fan-in, so they are merged as they are made.
+        with tempfile.TemporaryDirectory() as run_parent_directory, \
+                mock.patch.object(concordance_generator, "RUN_FAN_IN", 3), \
+                mock.patch.object(tempfile, "tempdir", run_parent_directory):
+            generator: ConcordanceGenerator = ConcordanceGenerator(backend=RegexBackend(), memory_limit=2000)
+            generator.generate_concordance_from_chunks(
+                ConcordanceUtils.get_input_file_chunks(input_file, chunk_size=500))
+            self.assertGreater(generator.get_run_count(), 3 * 3)
+
+            # No run is left open once it has been written.
+            open_files: List[str] = [os.path.realpath(os.path.join("/proc/self/fd", fd))
+                                     for fd in os.listdir("/proc/self/fd")] if os.path.isdir("/proc/self/fd") else []
+            self.assertFalse([open_file for open_file in open_files
+                              if open_file.startswith(os.path.realpath(run_parent_directory))])
+
+            self.assertEqual(unlimited_generator.get_sentence_count(), generator.get_sentence_count())
+            self.assertEqual(unlimited_generator.get_token_count(), generator.get_token_count())
+            self.assertEqual(unlimited_generator.get_concordance_lines(), generator.get_concordance_lines())
+            self.assertEqual(list(unlimited_generator.iter_words()), list(generator.iter_words()))
+            self.assertEqual(unlimited_generator.get_word_count(), generator.get_word_count())
+
+            # Merging runs into fewer runs leaves no more run files than the fan-in.
+            run_files: List[str] = glob.glob(os.path.join(run_parent_directory, "concordance-runs-*", "*"))
+            self.assertLessEqual(len(run_files), 3)
+
+            generator.generate_concordance(text="This is a simple test.")
+            self.assertFalse(os.listdir(run_parent_directory))
+
+    def test_iter_concordances(self):
+        input_files: List[str] = sorted(glob.glob("./test_files/*.txt"))
+        input_texts: List[str] = [ConcordanceUtils.get_input_file_text(input_file) for input_file in input_files]
+
+        # Each text gets the same concordance it would get on its own.
+        generators: List[ConcordanceGenerator] = list(self.concordance_generator.iter_concordances(input_texts,
+                                                                                                   batch_size=2))
+        self.assertEqual(len(input_texts), len(generators))
+        for input_text, generator in zip(input_texts, generators):
+            self.concordance_generator.generate_concordance(input_text)
+            self.assertEqual(self.concordance_generator.get_concordance_lines(), generator.get_concordance_lines())
+            self.assertEqual(self.concordance_generator.get_sentence_count(), generator.get_sentence_count())
+
+        self.assertDictEqual(dict(), next(self.concordance_generator.iter_concordances([""])).get_word_to_info())
+
 
 if __name__ == '__main__':
     unittest.main()
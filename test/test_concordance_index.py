@@ -0,0 +1,124 @@
+import errno
+import io
+import os
+import sys
+import tempfile
+import unittest
+from typing import Dict, List, Tuple
+
+from generate_concordance.concordance_index import INDEX_HEADER, RECORD_HEADER, ConcordanceIndex, \
+    open_concordance_index, write_concordance_index
+from generate_concordance.word_info import WordInfo
+
+
+class TestConcordanceIndex(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.index_file: str = os.path.join(self.temporary_directory.name, "concordance.idx")
+
+        a_word_info: WordInfo = WordInfo(1)
+        a_word_info.add_appearance(2)
+        a_word_info.add_appearance(2)
+
+        self.word_to_info: Dict[str, WordInfo] = dict({"a": a_word_info,
+                                                       "café": WordInfo(2),
+                                                       "is": WordInfo(1),
+                                                       "sentence": WordInfo(2),
+                                                       "simple": WordInfo(1)})
+        self.words: List[Tuple[str, WordInfo]] = sorted(self.word_to_info.items())
+
+        self.assertTrue(write_concordance_index(index_file=self.index_file, words=iter(self.words), longest_word=8,
+                                                sentence_count=2))
+
+    def tearDown(self) -> None:
+        self.temporary_directory.cleanup()
+
+    def test_header(self):
+        with ConcordanceIndex(self.index_file) as concordance_index:
+            self.assertEqual(8, concordance_index.get_longest_word())
+            self.assertEqual(5, concordance_index.get_word_count())
+            self.assertEqual(2, concordance_index.get_sentence_count())
+
+    def test_lookup(self):
+        with ConcordanceIndex(self.index_file) as concordance_index:
+            for word, word_info in self.word_to_info.items():
+                self.assertEqual(word_info, concordance_index.lookup(word))
+
+            for word in ["", "aa", "b", "zzz", "cafe"]:
+                self.assertIsNone(concordance_index.lookup(word))
+
+    def test_iter_words(self):
+        with ConcordanceIndex(self.index_file) as concordance_index:
+            self.assertEqual(self.words, list(concordance_index.iter_words()))
+
+    def test_iter_word_frequencies(self):
+        with ConcordanceIndex(self.index_file) as concordance_index:
+            self.assertEqual([(word, word_info.word_frequency) for word, word_info in self.words],
+                             list(concordance_index.iter_word_frequencies()))
+
+    def test_empty_index(self):
+        self.assertTrue(write_concordance_index(index_file=self.index_file, words=list(), longest_word=0,
+                                                sentence_count=0))
+        with ConcordanceIndex(self.index_file) as concordance_index:
+            self.assertIsNone(concordance_index.lookup("a"))
+            self.assertEqual(list(), list(concordance_index.iter_words()))
+
+    def test_truncated_index(self):
+        with open(self.index_file, "rb") as file:
+            index_bytes: bytes = file.read()
+
+        for truncated_length in [INDEX_HEADER.size, len(index_bytes) // 2, len(index_bytes) - 1]:
+            with open(self.index_file, "wb") as file:
+                file.write(index_bytes[:truncated_length])
+            with self.assertRaises(ValueError):
+                ConcordanceIndex(self.index_file)
+
+        # A record running into the record table is caught when it is read.
+        corrupt_bytes: bytearray = bytearray(index_bytes)
+        RECORD_HEADER.pack_into(corrupt_bytes, INDEX_HEADER.size, 1000, 1)
+        with open(self.index_file, "wb") as file:
+            file.write(corrupt_bytes)
+        with ConcordanceIndex(self.index_file) as concordance_index:
+            with self.assertRaises(ValueError):
+                list(concordance_index.iter_words())
+            with self.assertRaises(ValueError):
+                concordance_index.lookup("a")
+
+    def test_failed_write_keeps_index(self):
+        def iter_failing_words():
+            yield self.words[0]
+            raise IOError(errno.ENOSPC, "No space left on device")
+
+        stdout: io.StringIO = io.StringIO()
+        sys.stdout = stdout
+        self.assertFalse(write_concordance_index(index_file=self.index_file, words=iter_failing_words(),
+                                                 longest_word=1, sentence_count=2))
+        sys.stdout = sys.__stdout__
+
+        with ConcordanceIndex(self.index_file) as concordance_index:
+            self.assertEqual(self.words, list(concordance_index.iter_words()))
+        self.assertEqual(["concordance.idx"], os.listdir(self.temporary_directory.name))
+
+    def test_open_concordance_index(self):
+        stdout: io.StringIO = io.StringIO()
+        sys.stdout = stdout
+
+        self.assertIsNone(open_concordance_index(index_file="/this_file_should_not_exist.idx"))
+        self.assertIsNone(open_concordance_index(index_file="./test_files/SimpleTest.txt"))
+        self.assertFalse(write_concordance_index(index_file="/tmp/", words=list(), longest_word=0, sentence_count=0))
+
+        # Reset stdout redirect
+        sys.stdout = sys.__stdout__
+
+        self.assertTrue("The provided index file -- /this_file_should_not_exist.idx -- does not exist."
+                        in stdout.getvalue())
+        self.assertTrue("The provided index file -- ./test_files/SimpleTest.txt -- is not a concordance index."
+                        in stdout.getvalue())
+
+        concordance_index = open_concordance_index(index_file=self.index_file)
+        self.assertIsNotNone(concordance_index)
+        concordance_index.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
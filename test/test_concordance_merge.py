@@ -0,0 +1,62 @@
+import os
+import tempfile
+import unittest
+from typing import List
+
+from generate_concordance.concordance_empty import ConcordanceEmpty
+from generate_concordance.concordance_generator import ConcordanceGenerator
+from generate_concordance.concordance_index import ConcordanceIndex, write_concordance_index
+from generate_concordance.concordance_merge import get_merged_longest_word, get_merged_sentence_count, \
+    iter_merged_concordance_lines, iter_merged_word_frequencies, iter_merged_words
+from generate_concordance.line_label import LineLabelScheme
+from generate_concordance.regex_backend import RegexBackend
+from generate_concordance.word_filter import WordFilter
+
+
+class TestConcordanceMerge(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temporary_directory.cleanup)
+
+        self.shards: List[str] = ["The cat sat. A dog ran.", "The dog sat! A zebra.", "Cat, cat and cat."]
+        self.generator: ConcordanceGenerator = ConcordanceGenerator(backend=RegexBackend())
+        self.indexes: List[ConcordanceIndex] = list()
+        for shard_number, shard in enumerate(self.shards):
+            self.generator.generate_concordance(shard)
+            index_file: str = os.path.join(self.temporary_directory.name, f"shard{shard_number}.idx")
+            self.assertTrue(write_concordance_index(index_file=index_file, words=self.generator.iter_words(),
+                                                    longest_word=self.generator.get_longest_word(),
+                                                    sentence_count=self.generator.get_sentence_count()))
+            self.indexes.append(ConcordanceIndex(index_file))
+            self.addCleanup(self.indexes[-1].close)
+
+        # The concordance of the whole text, which merging the shards should give.
+        self.generator.generate_concordance(" ".join(self.shards))
+
+    def test_iter_merged_words(self):
+        self.assertEqual(5, get_merged_sentence_count(self.indexes))
+        self.assertEqual(list(self.generator.iter_words()), list(iter_merged_words(self.indexes)))
+        self.assertEqual([(word, word_info.word_frequency) for word, word_info in self.generator.iter_words()],
+                         list(iter_merged_word_frequencies(self.indexes)))
+
+        self.assertNotIn("the", dict(iter_merged_words(self.indexes, stopwords=frozenset(["the"]))))
+        self.assertEqual(len("zebra"), get_merged_longest_word(self.indexes))
+        self.assertEqual(len("cat"), get_merged_longest_word(self.indexes, stopwords=frozenset(["zebra"])))
+
+    def test_iter_merged_concordance_lines(self):
+        for label_scheme in LineLabelScheme:
+            self.assertEqual(self.generator.get_concordance_lines(label_scheme=label_scheme),
+                             list(iter_merged_concordance_lines(self.indexes, label_scheme=label_scheme)))
+
+        word_filter: WordFilter = WordFilter(stopwords=["the"], min_frequency=2, top=2)
+        self.assertEqual(["a. a   {2:2,4}", "b. cat {4:1,5,5,5}"],
+                         list(iter_merged_concordance_lines(self.indexes, word_filter=word_filter)))
+
+        with self.assertRaises(ConcordanceEmpty):
+            iter_merged_concordance_lines(self.indexes, word_filter=WordFilter(min_frequency=100))
+        with self.assertRaises(ConcordanceEmpty):
+            iter_merged_concordance_lines(list())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,209 @@
+import asyncio
+import json
+import os
+import tempfile
+import time
+import unittest
+from typing import Dict, Tuple
+
+from generate_concordance.concordance_server import ConcordanceServer
+from generate_concordance.regex_backend import RegexBackend
+from generate_concordance.spacy_backend import SpacyBackend
+
+
+class SlowRegexBackend(RegexBackend):
+    """A RegexBackend that takes a while per batch, so requests can be made to wait."""
+
+    def tokenize_texts(self, texts, batch_size=1, processes=1):
+        time.sleep(0.5)
+        return super().tokenize_texts(texts, batch_size=batch_size, processes=processes)
+
+
+class LimitedRegexBackend(RegexBackend):
+    """A RegexBackend that takes short texts only, and fails on texts mentioning failure."""
+
+    def get_max_length(self):
+        return 20
+
+    def tokenize(self, text):
+        if "fail" in text:
+            raise ValueError("The text failed.")
+        return super().tokenize(text)
+
+
+async def send_request(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, method: str, target: str,
+                       body: bytes = b"") -> Tuple[int, Dict[str, str], bytes]:
+    writer.write(f"{method} {target} HTTP/1.1\r\nContent-Length: {len(body)}\r\n\r\n".encode("latin-1") + body)
+    await writer.drain()
+
+    return await read_response(reader)
+
+
+async def read_response(reader: asyncio.StreamReader) -> Tuple[int, Dict[str, str], bytes]:
+    status: int = int((await reader.readline()).split()[1])
+    headers: Dict[str, str] = dict()
+    while True:
+        header_line: str = (await reader.readline()).decode("latin-1").strip()
+        if not header_line:
+            break
+        name, value = header_line.split(":", 1)
+        headers[name.lower()] = value.strip()
+
+    return status, headers, await reader.readexactly(int(headers["content-length"]))
+
+
+class TestConcordanceServer(unittest.IsolatedAsyncioTestCase):
+    async def start_server(self, server: ConcordanceServer) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        await server.start(host="127.0.0.1", port=0)
+        self.addAsyncCleanup(server.close)
+        reader, writer = await asyncio.open_connection(*server.get_address())
+        self.addCleanup(writer.close)
+
+        return reader, writer
+
+    async def test_concordance(self):
+        reader, writer = await self.start_server(ConcordanceServer(backend=RegexBackend()))
+        text: bytes = "This is a simple test. A two sentence test.".encode("utf-8")
+
+        status, headers, body = await send_request(reader, writer, "POST", "/concordance", text)
+        self.assertEqual(200, status)
+        self.assertTrue(headers["content-type"].startswith("text/plain"))
+        self.assertEqual("a. a        {2:1,2}", body.decode("utf-8").splitlines()[0])
+
+        # The same connection is kept alive for the next request.
+        status, headers, body = await send_request(reader, writer, "POST",
+                                                   "/concordance?format=json&labelScheme=numeric", text)
+        self.assertEqual(200, status)
+        concordance = json.loads(body)
+        self.assertEqual(2, concordance["sentence_count"])
+        self.assertEqual(dict({"frequency": 2, "sentences": [1, 2]}), concordance["words"]["test"])
+        self.assertEqual("1. a        {2:1,2}", concordance["lines"][0])
+
+    async def test_errors(self):
+        reader, writer = await self.start_server(ConcordanceServer(backend=RegexBackend(), max_body_size=100))
+
+        self.assertEqual(400, (await send_request(reader, writer, "POST", "/concordance", b"!"))[0])
+        self.assertEqual(400, (await send_request(reader, writer, "POST", "/concordance?format=xml", b"a"))[0])
+        self.assertEqual(400, (await send_request(reader, writer, "POST", "/concordance?labelScheme=x", b"a"))[0])
+        self.assertEqual(400, (await send_request(reader, writer, "POST", "/concordance?model=x", b"a"))[0])
+        self.assertEqual(404, (await send_request(reader, writer, "POST", "/words", b"a"))[0])
+        self.assertEqual(405, (await send_request(reader, writer, "GET", "/concordance"))[0])
+
+        status, headers, _ = await send_request(reader, writer, "POST", "/concordance", b"a" * 101)
+        self.assertEqual(413, status)
+        self.assertEqual("close", headers["connection"])
+
+    async def test_oversized_lines(self):
+        server: ConcordanceServer = ConcordanceServer(backend=RegexBackend())
+        await self.start_server(server)
+
+        # Lines longer than the stream's 64 KiB limit are rejected rather than ending the connection unanswered.
+        large: bytes = b"a" * 70000
+        for request, expected_status in [(b"POST /" + large + b" HTTP/1.1\r\n\r\n", 414),
+                                         (b"POST /concordance HTTP/1.1\r\nX-Large: " + large + b"\r\n\r\n", 431)]:
+            reader, writer = await asyncio.open_connection(*server.get_address())
+            try:
+                writer.write(request)
+                await writer.drain()
+                status, headers, _ = await read_response(reader)
+                self.assertEqual(expected_status, status)
+                self.assertEqual("close", headers["connection"])
+            finally:
+                writer.close()
+
+    async def test_failing_requests(self):
+        server: ConcordanceServer = ConcordanceServer(backend=LimitedRegexBackend(), batch_wait=0.05)
+        await self.start_server(server)
+
+        async def request_concordance(text: str) -> Tuple[int, Dict[str, str], bytes]:
+            reader, writer = await asyncio.open_connection(*server.get_address())
+            try:
+                return await send_request(reader, writer, "POST", "/concordance", text.encode("utf-8"))
+            finally:
+                writer.close()
+
+        # Texts sent together are batched, but only the text at fault fails.
+        responses = await asyncio.gather(*(request_concordance(text) for text in
+                                           ["The cat sat.", "This one is far too long.", "It will fail.", "A dog."]))
+        self.assertEqual([200, 413, 500, 200], [status for status, _, _ in responses])
+        self.assertEqual(b"a. cat {1:1}\n", responses[0][2].splitlines(keepends=True)[0])
+        self.assertEqual(b"a. a   {1:1}\n", responses[3][2].splitlines(keepends=True)[0])
+
+    async def test_models(self):
+        with self.assertRaises(ValueError):
+            ConcordanceServer(backend=RegexBackend(), models=["de_core_news_sm"])
+
+        server: ConcordanceServer = ConcordanceServer(backend=SpacyBackend(), workers=1,
+                                                      models=["xx_not_installed_sm"])
+        reader, writer = await self.start_server(server)
+        text: bytes = b"This is a simple test. A two sentence test."
+        started_model_stats: Dict[str, int] = server.get_model_stats()
+
+        status, _, body = await send_request(reader, writer, "POST", "/concordance?model=en_core_web_sm", text)
+        self.assertEqual(200, status)
+        self.assertEqual("a. a        {2:1,2}", body.decode("utf-8").splitlines()[0])
+
+        status, _, body = await send_request(reader, writer, "POST", "/concordance?model=xx_not_installed_sm", text)
+        self.assertEqual(500, status)
+        self.assertEqual(b"The model -- xx_not_installed_sm -- could not be loaded.\n", body)
+
+        status, _, body = await send_request(reader, writer, "POST", "/concordance?model=de_core_news_sm", text)
+        self.assertEqual(400, status)
+        self.assertIn(b"['en_core_web_sm', 'xx_not_installed_sm']", body)
+
+        # The request for the backend's own model found its pipeline loaded when the worker started.
+        model_stats: Dict[str, int] = server.get_model_stats()
+        self.assertGreater(model_stats["hits"], started_model_stats["hits"])
+        self.assertEqual(started_model_stats["misses"] + 1, model_stats["misses"])
+        self.assertEqual(started_model_stats["loaded"], model_stats["loaded"])
+
+    async def test_batching_and_queue_limit(self):
+        server: ConcordanceServer = ConcordanceServer(backend=SlowRegexBackend(), max_queue=3, batch_wait=0.05)
+        await self.start_server(server)
+
+        async def request_concordance(text: str) -> Tuple[int, Dict[str, str], bytes]:
+            reader, writer = await asyncio.open_connection(*server.get_address())
+            try:
+                return await send_request(reader, writer, "POST", "/concordance", text.encode("utf-8"))
+            finally:
+                writer.close()
+
+        # Three requests sent together are batched, so they only wait for the slow backend once.
+        start: float = time.perf_counter()
+        requests = [asyncio.ensure_future(request_concordance(text)) for text in ["One.", "Two.", "Three."]]
+        while server.get_queue_depth() < 3 and time.perf_counter() - start < 0.4:
+            await asyncio.sleep(0.01)
+        self.assertEqual(3, server.get_queue_depth())
+
+        # The queue is full.
+        status, headers, _ = await request_concordance("Four.")
+        self.assertEqual(503, status)
+        self.assertEqual("1", headers["retry-after"])
+
+        responses = await asyncio.gather(*requests)
+        self.assertLess(time.perf_counter() - start, 1.0)
+        self.assertEqual([b"a. one {1:1}\n", b"a. two {1:1}\n", b"a. three {1:1}\n"],
+                         [body for _, _, body in responses])
+        self.assertEqual(0, server.get_queue_depth())
+
+    async def test_unix_socket(self):
+        server: ConcordanceServer = ConcordanceServer(backend=RegexBackend())
+        with tempfile.TemporaryDirectory() as socket_directory:
+            socket_path: str = os.path.join(socket_directory, "concordance.sock")
+            await server.start(socket_path=socket_path)
+            try:
+                reader, writer = await asyncio.open_unix_connection(path=socket_path)
+                status, _, body = await send_request(reader, writer, "GET", "/health")
+                writer.close()
+            finally:
+                await server.close()
+
+        self.assertEqual(200, status)
+        health = json.loads(body)
+        self.assertEqual(0, health["queue_depth"])
+        self.assertEqual(64, health["max_queue"])
+        self.assertEqual(["hits", "misses", "evictions", "loaded"], list(health["models"].keys()))
+
+
+if __name__ == '__main__':
+    unittest.main()
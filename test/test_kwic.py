@@ -0,0 +1,83 @@
+import os
+import tempfile
+import unittest
+from typing import List
+
+from generate_concordance.concordance_empty import ConcordanceEmpty
+from generate_concordance.concordance_generator import ConcordanceGenerator
+from generate_concordance.kwic import KwicSource, iter_byte_offset_tokens, open_kwic_source
+from generate_concordance.regex_backend import RegexBackend
+
+
+class TestKwic(unittest.TestCase):
+    def setUp(self):
+        self.text: str = "Ünïcode is tested here.\r\nThe test is a test!  Another\n  test sentence."
+        with tempfile.NamedTemporaryFile(suffix=".txt", delete=False) as file:
+            file.write(self.text.encode("utf-8"))
+        self.input_file: str = file.name
+        self.addCleanup(os.remove, self.input_file)
+
+    def test_iter_byte_offset_tokens(self):
+        text: str = "Ünï test"
+        tokens = list(iter_byte_offset_tokens(text=text, tokens=[(1, "Ünï", 0, 3), (1, "test", 4, 8)]))
+        self.assertEqual(list([(1, "Ünï", 0, 5), (1, "test", 6, 10)]), tokens)
+
+        encoded_text: bytes = text.encode("utf-8")
+        for _, token, start, end in tokens:
+            self.assertEqual(token, encoded_text[start:end].decode("utf-8"))
+
+        # ASCII text is passed through as it is.
+        self.assertEqual(list([(1, "a", 0, 1)]), list(iter_byte_offset_tokens(text="a", tokens=[(1, "a", 0, 1)])))
+
+    def test_get_context(self):
+        with KwicSource(input_file=self.input_file) as kwic_source:
+            self.assertEqual(self.text, kwic_source.get_text())
+
+            encoded_text: bytes = self.text.encode("utf-8")
+            start: int = encoded_text.index(b"is")
+            sentence_end: int = encoded_text.index(b".") + 1
+            self.assertEqual("  Ünïcode is tested he",
+                             kwic_source.get_context(start=start, end=start + 2, sentence_start=0,
+                                                     sentence_end=sentence_end, context_size=10))
+
+            # Context stops at the sentence, and whitespace is shown as single spaces.
+            start = encoded_text.index(b"test ")
+            sentence_start: int = encoded_text.index(b"The")
+            self.assertEqual(f"{'The ':>20}test is a test! Another ",
+                             kwic_source.get_context(start=start, end=start + 4, sentence_start=sentence_start,
+                                                     sentence_end=len(encoded_text), context_size=20))
+            self.assertEqual("test", kwic_source.get_context(start=start, end=start + 4, sentence_start=sentence_start,
+                                                             sentence_end=len(encoded_text), context_size=0))
+
+    def test_open_kwic_source(self):
+        self.assertIsNone(open_kwic_source(input_file="./test_files/DoesNotExist.txt"))
+
+        with tempfile.NamedTemporaryFile(suffix=".txt") as empty_file:
+            self.assertIsNone(open_kwic_source(input_file=empty_file.name))
+
+    def test_iter_kwic_lines(self):
+        generator: ConcordanceGenerator = ConcordanceGenerator(backend=RegexBackend())
+        with KwicSource(input_file=self.input_file) as kwic_source:
+            with self.assertRaises(ConcordanceEmpty):
+                generator.iter_kwic_lines(word="test", kwic_source=kwic_source)
+
+            generator.generate_concordance_with_offsets(text=kwic_source.get_text())
+            self.assertEqual(3, generator.get_sentence_count())
+            self.assertEqual(3, generator.get_word_to_info()["test"].word_frequency)
+
+            lines: List[str] = list(generator.iter_kwic_lines(word="TEST", kwic_source=kwic_source, context_size=8))
+            self.assertEqual(list(["2     The test is a te",
+                                   "2 st is a test!",
+                                   "3 Another test sentenc"]),
+                             lines)
+            self.assertEqual(list(), list(generator.iter_kwic_lines(word="missing", kwic_source=kwic_source)))
+
+            # Text added afterwards has no offsets.
+            generator.update(text="One more test.")
+            self.assertEqual(4, generator.get_word_to_info()["test"].word_frequency)
+            with self.assertRaises(ValueError):
+                generator.iter_kwic_lines(word="test", kwic_source=kwic_source)
+
+
+if __name__ == '__main__':
+    unittest.main()
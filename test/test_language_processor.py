@@ -0,0 +1,98 @@
+import json
+import os
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+from generate_concordance import language_processor
+from generate_concordance.language_processor import LanguageProcessorPool, PipelineMode, get_language_processor, \
+    get_model_version
+
+
+class TestLanguageProcessor(unittest.TestCase):
+    def test_get_language_processor_is_shared(self):
+        for pipeline_mode in PipelineMode:
+            self.assertIs(get_language_processor(pipeline_mode=pipeline_mode),
+                          get_language_processor(pipeline_mode=pipeline_mode))
+
+    def test_segmentation_only_pipelines(self):
+        for pipeline_mode in [PipelineMode.FAST, PipelineMode.RULE_BASED]:
+            language_processor = get_language_processor(pipeline_mode=pipeline_mode)
+            for component in ["tagger", "parser", "lemmatizer", "ner"]:
+                self.assertNotIn(component, language_processor.pipe_names)
+
+            sentences = list(language_processor("This is a simple test. A two sentence test.").sents)
+            self.assertEqual(2, len(sentences))
+
+    def test_rule_based_pipeline(self):
+        self.assertEqual(["sentencizer"], get_language_processor(pipeline_mode=PipelineMode.RULE_BASED).pipe_names)
+
+    def test_pool_evicts_least_recently_used(self):
+        pool = LanguageProcessorPool(max_models=2)
+        accurate = pool.get(pipeline_mode=PipelineMode.ACCURATE)
+        pool.get(pipeline_mode=PipelineMode.FAST)
+        self.assertIs(accurate, pool.get(pipeline_mode=PipelineMode.ACCURATE))
+
+        # FAST was used least recently, so it is dropped to make room.
+        pool.get(pipeline_mode=PipelineMode.RULE_BASED)
+        self.assertIs(accurate, pool.get(pipeline_mode=PipelineMode.ACCURATE))
+        self.assertEqual(dict({"hits": 2, "misses": 3, "evictions": 1, "loaded": 2}), pool.get_stats())
+
+        pool.get(pipeline_mode=PipelineMode.FAST)
+        self.assertEqual(dict({"hits": 2, "misses": 4, "evictions": 2, "loaded": 2}), pool.get_stats())
+
+        pool.set_max_models(1)
+        self.assertEqual(dict({"hits": 2, "misses": 4, "evictions": 3, "loaded": 1}), pool.get_stats())
+
+    def test_pool_missing_model(self):
+        pool = LanguageProcessorPool()
+        with self.assertRaises(OSError):
+            pool.get(model_name="xx_not_installed_sm")
+        self.assertEqual(dict({"hits": 0, "misses": 1, "evictions": 0, "loaded": 0}), pool.get_stats())
+
+    def test_get_model_version(self):
+        with self.assertRaises(OSError):
+            get_model_version("xx_not_installed_sm")
+
+        with tempfile.TemporaryDirectory() as model_directory:
+            with open(os.path.join(model_directory, "meta.json"), "w") as file:
+                json.dump(dict({"lang": "en", "name": "test", "version": "1.2.3"}), file)
+            self.assertEqual("1.2.3", get_model_version(model_directory))
+
+    def test_pool_loads_outside_lock(self):
+        loading: threading.Event = threading.Event()
+        loaded: threading.Event = threading.Event()
+        load_language_processor = language_processor._load_language_processor
+
+        def slow_load(model_name, pipeline_mode):
+            if PipelineMode.ACCURATE == pipeline_mode:
+                loading.set()
+                loaded.wait(timeout=10)
+            return load_language_processor(model_name=model_name, pipeline_mode=pipeline_mode)
+
+        pool = LanguageProcessorPool()
+        with mock.patch.object(language_processor, "_load_language_processor", side_effect=slow_load):
+            accurate = []
+            threads = [threading.Thread(target=lambda: accurate.append(pool.get(pipeline_mode=PipelineMode.ACCURATE)))
+                       for _ in range(2)]
+            for thread in threads:
+                thread.start()
+            self.assertTrue(loading.wait(timeout=10))
+
+            # Another pipeline can be got while one is loading.
+            pool.get(pipeline_mode=PipelineMode.RULE_BASED)
+            self.assertFalse(loaded.is_set())
+
+            loaded.set()
+            for thread in threads:
+                thread.join(timeout=10)
+
+        # The pipeline both threads waited for was only loaded once.
+        self.assertEqual(2, len(accurate))
+        self.assertIs(accurate[0], accurate[1])
+        self.assertEqual(dict({"hits": 1, "misses": 2, "evictions": 0, "loaded": 2}), pool.get_stats())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,39 @@
+import unittest
+from typing import List
+
+from generate_concordance.line_label import LineLabelScheme, iter_line_labels
+
+
+class TestLineLabel(unittest.TestCase):
+    def test_repeated_labels(self):
+        labels: List[str] = list(iter_line_labels(label_count=53))
+        self.assertEqual("a.  ", labels[0])
+        self.assertEqual("z.  ", labels[25])
+        self.assertEqual("aa. ", labels[26])
+        self.assertEqual("aaa.", labels[52])
+
+        self.assertEqual(list(["a.", "b."]), list(iter_line_labels(label_count=2)))
+
+    def test_alphabetic_labels(self):
+        labels: List[str] = list(iter_line_labels(label_count=26 + 26 ** 2 + 1,
+                                                  label_scheme=LineLabelScheme.ALPHABETIC))
+        self.assertEqual("a.  ", labels[0])
+        self.assertEqual("z.  ", labels[25])
+        self.assertEqual("aa. ", labels[26])
+        self.assertEqual("ab. ", labels[27])
+        self.assertEqual("zz. ", labels[26 + 26 ** 2 - 1])
+        self.assertEqual("aaa.", labels[-1])
+
+        # Labels stay short for a large vocabulary.
+        labels = list(iter_line_labels(label_count=200000, label_scheme=LineLabelScheme.ALPHABETIC))
+        self.assertEqual(200000, len(set(labels)))
+        self.assertEqual(5, max(len(label) for label in labels))
+
+    def test_numeric_labels(self):
+        labels: List[str] = list(iter_line_labels(label_count=10, label_scheme=LineLabelScheme.NUMERIC))
+        self.assertEqual("1. ", labels[0])
+        self.assertEqual("10.", labels[-1])
+
+
+if __name__ == '__main__':
+    unittest.main()
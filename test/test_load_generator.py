@@ -0,0 +1,74 @@
+import asyncio
+import unittest
+from typing import Any, Dict
+
+from benchmarks.load_generator import get_percentile, run_load
+from generate_concordance.concordance_server import ConcordanceServer
+from generate_concordance.regex_backend import RegexBackend
+
+
+class TestLoadGenerator(unittest.IsolatedAsyncioTestCase):
+    def test_get_percentile(self):
+        values = [1.0, 2.0, 3.0, 4.0]
+        self.assertEqual(2.0, get_percentile(values, 50))
+        self.assertEqual(4.0, get_percentile(values, 99))
+        self.assertEqual(1.0, get_percentile(values, 0))
+        self.assertEqual(0.0, get_percentile([], 50))
+
+    async def test_run_load(self):
+        server: ConcordanceServer = ConcordanceServer(backend=RegexBackend())
+        await server.start(host="127.0.0.1", port=0)
+        try:
+            host, port = server.get_address()
+            results: Dict[str, Any] = await run_load(text="A test. A second test.", requests=20, concurrency=4,
+                                                     host=host, port=port)
+        finally:
+            await server.close()
+
+        self.assertEqual(20, results["requests"])
+        self.assertEqual(dict({200: 20}), results["statuses"])
+        self.assertEqual(["p50", "p90", "p99", "max"], list(results["latency_milliseconds"].keys()))
+        self.assertLessEqual(results["latency_milliseconds"]["p50"], results["latency_milliseconds"]["max"])
+
+        self.assertEqual(0, results["connection_errors"])
+
+    async def test_closed_connections(self):
+        # A server answering one request per connection, then closing the connection at the next request.
+        async def answer_once(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+            while (await reader.readline()).strip():
+                pass
+            await reader.readexactly(len(text))
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 0\r\n\r\n")
+            await writer.drain()
+            while (await reader.readline()).strip():
+                pass
+            writer.close()
+
+        text: str = "A test."
+        server: asyncio.AbstractServer = await asyncio.start_server(answer_once, host="127.0.0.1", port=0)
+        try:
+            host, port = server.sockets[0].getsockname()[:2]
+            results: Dict[str, Any] = await run_load(text=text, requests=6, concurrency=1, host=host, port=port)
+        finally:
+            server.close()
+            await server.wait_closed()
+
+        # The closed connections are counted and opened again rather than ending the run.
+        self.assertEqual(dict({200: 3}), results["statuses"])
+        self.assertEqual(3, results["connection_errors"])
+
+        # Connections the server closes after responding are opened again without counting an error.
+        server: ConcordanceServer = ConcordanceServer(backend=RegexBackend(), max_body_size=4)
+        await server.start(host="127.0.0.1", port=0)
+        try:
+            host, port = server.get_address()
+            results = await run_load(text=text, requests=4, concurrency=2, host=host, port=port)
+        finally:
+            await server.close()
+
+        self.assertEqual(dict({413: 4}), results["statuses"])
+        self.assertEqual(0, results["connection_errors"])
+
+
+if __name__ == '__main__':
+    unittest.main()
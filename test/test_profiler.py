@@ -0,0 +1,83 @@
+import unittest
+from typing import Any, Dict, List
+
+from generate_concordance.concordance_generator import ConcordanceGenerator
+from generate_concordance.profiler import Profiler
+from generate_concordance.regex_backend import RegexBackend
+
+
+class TestProfiler(unittest.TestCase):
+    def test_disabled(self):
+        profiler: Profiler = Profiler(enabled=False)
+        items: List[str] = list(["a", "bc"])
+
+        self.assertFalse(profiler.is_enabled())
+        self.assertIs(items, profiler.iter_stage("parse", items))
+        self.assertIs(items, profiler.iter_counted("characters", items))
+        self.assertIs(profiler.stage("parse"), profiler.stage("write"))
+
+        with profiler.stage("parse"):
+            pass
+        profiler.add_count("tokens", 3)
+
+        metrics: Dict[str, Any] = profiler.get_metrics()
+        self.assertEqual(dict(), metrics["stages"])
+        self.assertEqual(dict(), metrics["counts"])
+
+    def test_stage(self):
+        profiler: Profiler = Profiler()
+        with profiler.stage("parse"):
+            pass
+        with profiler.stage("parse"):
+            pass
+        with profiler.stage("write"):
+            pass
+
+        stages: Dict[str, Dict[str, Any]] = profiler.get_metrics()["stages"]
+        self.assertEqual(["parse", "write"], list(stages.keys()))
+        self.assertEqual(2, stages["parse"]["calls"])
+        self.assertEqual(1, stages["write"]["calls"])
+        self.assertGreaterEqual(stages["parse"]["seconds"], 0.0)
+
+    def test_iter_stage(self):
+        profiler: Profiler = Profiler()
+
+        self.assertEqual(["a", "bc"], list(profiler.iter_stage("parse", ["a", "bc"])))
+        self.assertEqual(2, profiler.get_metrics()["stages"]["parse"]["calls"])
+
+    def test_counts(self):
+        profiler: Profiler = Profiler()
+        profiler.add_count("tokens", 3)
+        profiler.add_count("tokens", 4)
+
+        self.assertEqual(["a", "bc"], list(profiler.iter_counted("characters", ["a", "bc"])))
+
+        metrics: Dict[str, Any] = profiler.get_metrics()
+        self.assertEqual(dict({"tokens": 7, "characters": 3}), metrics["counts"])
+        self.assertEqual(set(["tokens_per_second", "characters_per_second"]), set(metrics["throughput"].keys()))
+
+    def test_format_report(self):
+        profiler: Profiler = Profiler()
+        with profiler.stage("parse"):
+            pass
+        profiler.add_count("tokens", 3)
+
+        lines: List[str] = profiler.format_report()
+        self.assertTrue(lines[0].startswith("stage"))
+        self.assertTrue(lines[1].startswith("parse"))
+        self.assertTrue(any(line.startswith("other") for line in lines))
+        self.assertTrue(any(line.startswith("total") for line in lines))
+        self.assertTrue(lines[-1].startswith("tokens"))
+
+    def test_concordance_generator(self):
+        profiler: Profiler = Profiler()
+        generator: ConcordanceGenerator = ConcordanceGenerator(backend=RegexBackend(), profiler=profiler)
+        generator.generate_concordance("This is a simple test. A two sentence test.")
+
+        stages: Dict[str, Dict[str, Any]] = profiler.get_metrics()["stages"]
+        self.assertIn("nlp_parse", stages)
+        self.assertIn("aggregation", stages)
+
+
+if __name__ == '__main__':
+    unittest.main()
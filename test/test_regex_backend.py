@@ -0,0 +1,59 @@
+import unittest
+from typing import List
+
+from generate_concordance import ConcordanceUtils
+from generate_concordance.concordance_generator import ConcordanceGenerator
+from generate_concordance.regex_backend import RegexBackend
+from generate_concordance.tokenizer_backend import SentenceToken
+
+
+class TestRegexBackend(unittest.TestCase):
+    def setUp(self) -> None:
+        self.backend = RegexBackend()
+
+    def test_tokenize(self):
+        actual_tokens: List[SentenceToken] = list(self.backend.tokenize("This is a simple test. A two sentence test."))
+        self.assertEqual(list([(1, "This"), (1, "is"), (1, "a"), (1, "simple"), (1, "test"), (1, "."),
+                               (2, "A"), (2, "two"), (2, "sentence"), (2, "test"), (2, ".")]),
+                         actual_tokens)
+
+    def test_tokenize_abbreviations(self):
+        tokens: List[str] = [token for _, token in self.backend.tokenize("It broke on u.s.a, e.g. and Mr. Smith.")]
+        self.assertEqual(list(["It", "broke", "on", "u.s.a", ",", "e.g.", "and", "Mr.", "Smith", "."]), tokens)
+
+        # Abbreviations don't end sentences.
+        self.assertEqual(1, max(sentence for sentence, _ in self.backend.tokenize("See e.g. Mr. Smith.")))
+
+    def test_tokenize_contractions(self):
+        tokens: List[str] = [token for _, token in self.backend.tokenize("I don't know, it's Sam’s.")]
+        self.assertEqual(list(["I", "do", "n't", "know", ",", "it", "'s", "Sam", "’s", "."]), tokens)
+
+        tokens = [token for _, token in self.backend.tokenize("I cannot read _campagne_ in snake_case.")]
+        self.assertEqual(list(["I", "can", "not", "read", "_", "campagne", "_", "in", "snake_case", "."]), tokens)
+
+    def test_tokenize_sentence_boundaries(self):
+        actual_tokens: List[SentenceToken] = list(self.backend.tokenize("“Stop!” he said... Then 1,000.5 left?"))
+        self.assertEqual(list([(1, "“"), (1, "Stop"), (1, "!"), (1, "”"),
+                               (2, "he"), (2, "said"), (2, "..."),
+                               (3, "Then"), (3, "1,000.5"), (3, "left"), (3, "?")]),
+                         actual_tokens)
+
+    def test_tokenize_offsets(self):
+        text: str = "“Stop!” he said...\n\nThen left?"
+        actual_tokens = list(self.backend.tokenize_offsets(text))
+        self.assertEqual(list(self.backend.tokenize(text)),
+                         [(sentence, token) for sentence, token, _, _ in actual_tokens])
+        for _, token, start, end in actual_tokens:
+            self.assertEqual(token, text[start:end])
+
+    def test_edge_cases(self):
+        generator: ConcordanceGenerator = ConcordanceGenerator(backend=self.backend)
+        generator.generate_concordance(ConcordanceUtils.get_input_file_text("./test_files/TestEdgeCases.txt"))
+
+        self.assertEqual(4, generator.get_sentence_count())
+        self.assertIn("u.s.a", generator.get_word_to_info())
+        self.assertEqual(2, generator.get_word_to_info()["e.g."].word_frequency)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import os
+import subprocess
+import sys
+import time
+import unittest
+from typing import List
+
+# Seconds the command line may take to print help or report an input error. Importing spaCy alone takes longer.
+STARTUP_BUDGET_SECONDS: float = 0.75
+
+# Wall clock budgets fail on busy machines, so they are only checked when asked for. test_heavy_modules_not_imported
+#   checks what keeps startup fast on every run.
+RUN_TIMING_TESTS: bool = "1" == os.environ.get("CONCORDANCE_TIMING_TESTS")
+
+REPOSITORY_DIRECTORY: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class TestStartup(unittest.TestCase):
+    def run_command_line(self, arguments: List[str]) -> float:
+        """Runs the command line in a new process, returning the fastest of a few runs so a busy machine doesn't fail
+        the test."""
+
+        fastest_run: float = float("inf")
+        for _ in range(3):
+            start: float = time.perf_counter()
+            subprocess.run([sys.executable, "-m", "generate_concordance.generateConcordance"] + arguments,
+                           cwd=REPOSITORY_DIRECTORY, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            fastest_run = min(fastest_run, time.perf_counter() - start)
+
+        return fastest_run
+
+    def test_heavy_modules_not_imported(self):
+        imported_modules: str = subprocess.run(
+            [sys.executable, "-c", "import sys, generate_concordance.generateConcordance; "
+                                   "print(' '.join(module for module in ('spacy', 'numpy') if module in sys.modules))"],
+            cwd=REPOSITORY_DIRECTORY, stdout=subprocess.PIPE, universal_newlines=True, check=True).stdout
+        self.assertEqual("", imported_modules.strip())
+
+    @unittest.skipUnless(RUN_TIMING_TESTS, "set CONCORDANCE_TIMING_TESTS=1 to check startup time")
+    def test_help(self):
+        self.assertLess(self.run_command_line(["--help"]), STARTUP_BUDGET_SECONDS)
+
+    @unittest.skipUnless(RUN_TIMING_TESTS, "set CONCORDANCE_TIMING_TESTS=1 to check startup time")
+    def test_option_error(self):
+        self.assertLess(self.run_command_line(["--stdout"]), STARTUP_BUDGET_SECONDS)
+
+    @unittest.skipUnless(RUN_TIMING_TESTS, "set CONCORDANCE_TIMING_TESTS=1 to check startup time")
+    def test_missing_input_file(self):
+        self.assertLess(self.run_command_line(["--inputFile", "does_not_exist.txt", "--stdout"]),
+                        STARTUP_BUDGET_SECONDS)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import glob
+import unittest
+from typing import Dict, List
+
+import numpy
+
+from generate_concordance import ConcordanceUtils
+from generate_concordance.concordance_generator import ConcordanceGenerator
+from generate_concordance.spacy_backend import SpacyBackend
+from generate_concordance.token_arrays import aggregate_token_arrays
+from generate_concordance.word_info import WordInfo
+
+
+class TokenOnlySpacyBackend(SpacyBackend):
+    """A SpacyBackend that doesn't produce token arrays, so its tokens are added one at a time."""
+
+    def tokenize_arrays(self, texts, batch_size=1, processes=1):
+        return None
+
+
+class TestTokenArrays(unittest.TestCase):
+    def setUp(self) -> None:
+        self.words: Dict[int, str] = dict({1: "a", 2: "test", 3: ".", 4: "sentence", 5: "..."})
+
+    def test_aggregate_token_arrays(self):
+        # a test a a. sentence... | test. a
+        texts_token_arrays = list([(numpy.array([1, 2, 1, 1, 3, 4, 5]), numpy.array([1, 1, 1, 1, 1, 2, 2]),
+                                    self.words.__getitem__),
+                                   (numpy.array([], dtype=numpy.int64), numpy.array([], dtype=numpy.int64),
+                                    self.words.__getitem__),
+                                   (numpy.array([2, 3, 1]), numpy.array([1, 1, 2]), self.words.__getitem__)])
+        word_to_info, longest_word, sentence_count = aggregate_token_arrays(texts_token_arrays, sentence_offset=10)
+
+        # Punctuation is left out the same way it is when tokens are added one at a time, so ... is a word.
+        self.assertDictEqual(dict({"a": WordInfo.from_appearances([11, 11, 11, 14]),
+                                   "test": WordInfo.from_appearances([11, 13]),
+                                   "sentence": WordInfo.from_appearances([12]),
+                                   "...": WordInfo.from_appearances([12])}),
+                             word_to_info)
+        self.assertEqual(len("sentence"), longest_word)
+        self.assertEqual(4, sentence_count)
+
+        self.assertEqual((dict(), 0, 0), aggregate_token_arrays(texts_token_arrays[1:2]))
+
+        word_to_info, longest_word, sentence_count = aggregate_token_arrays(texts_token_arrays,
+                                                                            stopwords=frozenset(["a", "sentence"]))
+        self.assertEqual(["test", "..."], list(word_to_info.keys()))
+        self.assertEqual(len("test"), longest_word)
+        self.assertEqual(4, sentence_count)
+
+    def test_token_array_parity(self):
+        # Grouping token arrays must give exactly the concordance adding tokens one at a time does.
+        token_generator: ConcordanceGenerator = ConcordanceGenerator(backend=TokenOnlySpacyBackend())
+        array_generator: ConcordanceGenerator = ConcordanceGenerator(backend=SpacyBackend())
+        for input_file in sorted(glob.glob("./test_files/*.txt")):
+            input_text: str = ConcordanceUtils.get_input_file_text(input_file)
+            token_generator.generate_concordance(input_text)
+            array_generator.generate_concordance(input_text)
+            self.assertDictEqual(token_generator.get_word_to_info(), array_generator.get_word_to_info(), input_file)
+            self.assertEqual(token_generator.get_longest_word(), array_generator.get_longest_word(), input_file)
+            self.assertEqual(token_generator.get_sentence_count(), array_generator.get_sentence_count(), input_file)
+
+            chunks: List[str] = list(ConcordanceUtils.get_input_file_chunks(input_file, chunk_size=500))
+            token_generator.generate_concordance_from_chunks(chunks)
+            array_generator.generate_concordance_from_chunks(chunks)
+            self.assertEqual(token_generator.get_concordance_lines(), array_generator.get_concordance_lines(),
+                             input_file)
+
+
+if __name__ == '__main__':
+    unittest.main()
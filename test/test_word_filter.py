@@ -0,0 +1,79 @@
+import unittest
+from typing import Dict
+
+from generate_concordance.concordance_generator import ConcordanceGenerator
+from generate_concordance.regex_backend import RegexBackend
+from generate_concordance.word_filter import WordFilter
+from generate_concordance.word_info import WordInfo
+
+
+class TestWordFilter(unittest.TestCase):
+    def setUp(self) -> None:
+        self.word_to_info: Dict[str, WordInfo] = dict({"the": WordInfo.from_appearances([1, 1, 2, 3]),
+                                                       "cat": WordInfo.from_appearances([1, 2]),
+                                                       "sat": WordInfo.from_appearances([1]),
+                                                       "mat": WordInfo.from_appearances([2, 3]),
+                                                       "on": WordInfo.from_appearances([1])})
+
+    def test_no_filter(self):
+        word_filter: WordFilter = WordFilter()
+        self.assertFalse(word_filter.is_selective())
+        self.assertEqual(frozenset(), word_filter.get_stopwords())
+        self.assertEqual(["cat", "mat", "on", "sat", "the"], word_filter.select_words(self.word_to_info))
+
+    def test_stopwords(self):
+        self.assertEqual(frozenset(["the", "on"]), WordFilter(stopwords=["The", "on"]).get_stopwords())
+
+    def test_frequency_range(self):
+        self.assertEqual(["cat", "mat", "the"], WordFilter(min_frequency=2).select_words(self.word_to_info))
+        self.assertEqual(["cat", "mat", "on", "sat"], WordFilter(max_frequency=2).select_words(self.word_to_info))
+        self.assertEqual(["cat", "mat"],
+                         WordFilter(min_frequency=2, max_frequency=3).select_words(self.word_to_info))
+        self.assertEqual([], WordFilter(min_frequency=5).select_words(self.word_to_info))
+
+    def test_top(self):
+        self.assertTrue(WordFilter(top=1).is_selective())
+        self.assertEqual(["the"], WordFilter(top=1).select_words(self.word_to_info))
+
+        # Ties go to the alphabetically first word.
+        self.assertEqual(["cat", "the"], WordFilter(top=2).select_words(self.word_to_info))
+        self.assertEqual(["cat", "mat", "on", "the"], WordFilter(top=4).select_words(self.word_to_info))
+        self.assertEqual(["cat", "mat", "on", "sat", "the"], WordFilter(top=10).select_words(self.word_to_info))
+
+        # The frequency range is applied first.
+        self.assertEqual(["on"], WordFilter(max_frequency=1, top=1).select_words(self.word_to_info))
+
+    def test_select_word_frequencies(self):
+        word_frequencies = [(word, word_info.word_frequency) for word, word_info in sorted(self.word_to_info.items())]
+        self.assertEqual(word_frequencies, list(WordFilter().select_word_frequencies(word_frequencies)))
+
+        # The same words are picked as from a concordance.
+        for word_filter in [WordFilter(min_frequency=2), WordFilter(max_frequency=2),
+                            WordFilter(min_frequency=2, max_frequency=3), WordFilter(top=2),
+                            WordFilter(max_frequency=1, top=1)]:
+            self.assertEqual(word_filter.select_words(self.word_to_info),
+                             [word for word, _ in word_filter.select_word_frequencies(word_frequencies)])
+
+    def test_concordance_generator(self):
+        text: str = "The cat sat on the mat. The cat ate. A mat."
+        word_filter: WordFilter = WordFilter(stopwords=["the", "a"], top=2)
+        generator: ConcordanceGenerator = ConcordanceGenerator(backend=RegexBackend(), word_filter=word_filter)
+        generator.generate_concordance(text)
+
+        # Stopwords are never aggregated, other words are only left out when written.
+        self.assertEqual(set(["cat", "sat", "on", "mat", "ate"]), set(generator.get_word_to_info().keys()))
+        self.assertEqual(len("cat"), generator.get_longest_word())
+        self.assertEqual(["a. cat {2:1,2}", "b. mat {2:1,3}"], generator.get_concordance_lines())
+
+        # Concordances merged from chunks drop stopwords the same way.
+        generator.generate_concordance_from_chunks(["The cat sat on the mat.", "The cat ate. A mat."])
+        self.assertEqual(["a. cat {2:1,2}", "b. mat {2:1,3}"], generator.get_concordance_lines())
+
+        generator.restore(words=dict({"the": WordInfo.from_appearances([1]),
+                                      "dog": WordInfo.from_appearances([1])}).items(),
+                          longest_word=len("dog"), sentence_count=1)
+        self.assertEqual(["dog"], list(generator.get_word_to_info().keys()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,18 +1,107 @@
+import sys
 import unittest
+from array import array
+
 from generate_concordance.word_info import WordInfo
 
 
 class TestWordInfo(unittest.TestCase):
     def test_init(self):
-        actual_word_info: WordInfo = WordInfo(word_frequency=2, word_first_appearance="3")
-        self.assertEqual(2, actual_word_info.word_frequency)
-        self.assertEqual(list(["3"]), actual_word_info.word_appearances)
+        actual_word_info: WordInfo = WordInfo(word_first_appearance=3)
+        self.assertEqual(1, actual_word_info.word_frequency)
+        self.assertEqual(tuple([3]), actual_word_info.word_appearances)
 
     def test_eq(self):
-        word_info_left: WordInfo = WordInfo(word_frequency=2, word_first_appearance="3")
-        word_info_right: WordInfo = WordInfo(word_frequency=2, word_first_appearance="3")
+        word_info_left: WordInfo = WordInfo(word_first_appearance=3)
+        word_info_right: WordInfo = WordInfo(word_first_appearance=3)
         self.assertEqual(word_info_left, word_info_right)
 
+        word_info_right.add_appearance(3)
+        self.assertNotEqual(word_info_left, word_info_right)
+
+    def test_add_appearance(self):
+        word_info: WordInfo = WordInfo(word_first_appearance=1)
+        word_info.add_appearance(2)
+        self.assertEqual(tuple([1, 2]), word_info.word_appearances)
+
+        # Repeats within one sentence are run-length encoded but still reported once per appearance.
+        word_info.add_appearance(2)
+        word_info.add_appearance(2)
+        word_info.add_appearance(5)
+        self.assertEqual(5, word_info.word_frequency)
+        self.assertEqual(tuple([1, 2, 2, 2, 5]), word_info.word_appearances)
+        self.assertEqual("1,2,2,2,5", word_info.format_appearances())
+
+    def test_from_appearances(self):
+        self.assertEqual(tuple([1, 2, 2, 5]), WordInfo.from_appearances([1, 2, 2, 5]).word_appearances)
+        self.assertEqual(tuple([1, 2, 2, 5]), WordInfo.from_appearances(array("I", [1, 2, 2, 5])).word_appearances)
+
+        word_info: WordInfo = WordInfo.from_appearances(array("I", [1, 2, 5]))
+        self.assertEqual(3, word_info.word_frequency)
+        word_info.add_appearance(5)
+        self.assertEqual(tuple([1, 2, 5, 5]), word_info.word_appearances)
+
+    def test_from_sentence_runs(self):
+        word_info: WordInfo = WordInfo.from_sentence_runs(sentences=array("I", [1, 4]), run_lengths=array("I", [2, 1]),
+                                                          word_frequency=3)
+        self.assertEqual(WordInfo.from_appearances([1, 1, 4]), word_info)
+        self.assertEqual("1,1,4", word_info.format_appearances())
+
+        word_info = WordInfo.from_sentence_runs(sentences=array("I", [2, 5]), run_lengths=None, word_frequency=2)
+        self.assertEqual(WordInfo.from_appearances([2, 5]), word_info)
+        word_info.add_appearance(5)
+        self.assertEqual(tuple([2, 5, 5]), word_info.word_appearances)
+
+    def test_shift_appearances(self):
+        word_info: WordInfo = WordInfo(word_first_appearance=3)
+        word_info.add_appearance(5)
+        word_info.add_appearance(5)
+        word_info.shift_appearances(sentence_offset=10)
+        self.assertEqual(tuple([13, 15, 15]), word_info.word_appearances)
+
+    def test_extend(self):
+        word_info: WordInfo = WordInfo(word_first_appearance=3)
+        word_info.extend(WordInfo(word_first_appearance=7))
+        self.assertEqual(2, word_info.word_frequency)
+        self.assertEqual(tuple([3, 7]), word_info.word_appearances)
+
+        other_word_info: WordInfo = WordInfo(word_first_appearance=7)
+        other_word_info.add_appearance(7)
+        other_word_info.add_appearance(8)
+        word_info.extend(other_word_info)
+        self.assertEqual(5, word_info.word_frequency)
+        self.assertEqual(tuple([3, 7, 7, 7, 8]), word_info.word_appearances)
+
+    def test_offsets(self):
+        word_info: WordInfo = WordInfo(word_first_appearance=1)
+        self.assertEqual(list(), list(word_info.iter_offsets()))
+
+        word_info.add_offsets(start=0, end=4)
+        word_info.add_appearance(2)
+        word_info.add_offsets(start=20, end=24)
+        self.assertEqual(list([(0, 4), (20, 24)]), list(word_info.iter_offsets()))
+
+        # Offsets are only kept while every appearance has them.
+        other_word_info: WordInfo = WordInfo(word_first_appearance=3)
+        other_word_info.add_offsets(start=40, end=44)
+        word_info.extend(other_word_info)
+        self.assertEqual(list([(0, 4), (20, 24), (40, 44)]), list(word_info.iter_offsets()))
+        word_info.extend(WordInfo(word_first_appearance=4))
+        self.assertEqual(list(), list(word_info.iter_offsets()))
+        self.assertEqual(tuple([1, 2, 3, 4]), word_info.word_appearances)
+
+        other_word_info.drop_offsets()
+        self.assertEqual(list(), list(other_word_info.iter_offsets()))
+
+    def test_sizeof(self):
+        word_info: WordInfo = WordInfo(word_first_appearance=1)
+        size: int = sys.getsizeof(word_info)
+        for sentence in range(2, 1002):
+            word_info.add_appearance(sentence)
+
+        # Roughly four bytes per appearance, plus spare capacity in the array.
+        self.assertLess(sys.getsizeof(word_info) - size, 8 * 1000)
+
 
 if __name__ == '__main__':
     unittest.main()